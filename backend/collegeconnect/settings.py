@@ -99,6 +99,32 @@ DATABASES = {
 }
 
 
+# Cache
+# https://docs.djangoproject.com/en/4.2/topics/cache/
+# Shared by every worker and process (web, scheduler, management commands).
+# 'default' holds the cached events API responses and is culled when full;
+# 'versions' holds only the events and letter template version counters, in
+# a table of their own so culling never evicts them. Create both tables with
+# `python manage.py createcachetable`.
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+        'LOCATION': 'django_cache',
+        'OPTIONS': {
+            'MAX_ENTRIES': 5000,
+            # Drop a quarter of the entries when full
+            'CULL_FREQUENCY': 4,
+        },
+    },
+    'versions': {
+        'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+        'LOCATION': 'django_cache_versions',
+        'TIMEOUT': None,
+    },
+}
+
+
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
 
@@ -1,4 +1,13 @@
 from django.contrib import admin
-from .models import Event
+from .models import ArchivedEvent, Event, ScrapeSource, Tag
 
 admin.site.register(Event)
+admin.site.register(ArchivedEvent)
+admin.site.register(Tag)
+
+
+@admin.register(ScrapeSource)
+class ScrapeSourceAdmin(admin.ModelAdmin):
+    list_display = ('name', 'url', 'parser', 'fetch_interval', 'priority', 'max_pages', 'enabled', 'last_scraped_at')
+    list_filter = ('enabled', 'declared_in_code')
+    readonly_fields = ('declared_in_code', 'last_scraped_at')
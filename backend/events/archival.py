@@ -0,0 +1,79 @@
+"""Move events whose registration has closed out of the hot Event table.
+
+The list views only ever scan Event; closed hackathons pile up in
+ArchivedEvent instead, which is read only for ``?include=archived``.
+Runs as a scheduler job in small batches so no single transaction holds
+locks on a large slice of the table.
+"""
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from .cache import batch_version_bump
+from .models import ArchivedEvent, Event, EventTag
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_GRACE_DAYS = 1
+DEFAULT_BATCH_SIZE = 500
+
+ARCHIVED_FIELDS = (
+    "id", "title", "description", "image_url", "link", "registration_start", "registration_end",
+    "event_url", "button_text", "created_at", "updated_at",
+)
+
+
+def archive_cutoff(now=None):
+    """Events whose registration ended before this are archived."""
+    grace = timedelta(days=getattr(settings, "EVENTS_ARCHIVE_GRACE_DAYS", DEFAULT_GRACE_DAYS))
+    return (now or timezone.now()) - grace
+
+
+def archive_batch(cutoff, batch_size=DEFAULT_BATCH_SIZE):
+    """Archive up to ``batch_size`` expired events in one transaction; returns how many moved."""
+    with transaction.atomic():
+        events = list(
+            Event.objects.filter(registration_end__lt=cutoff)
+            .order_by("registration_end", "id")
+            .prefetch_related("sources", "event_tags__tag")
+            .select_for_update()[:batch_size]
+        )
+        if not events:
+            return 0
+        archived = [
+            ArchivedEvent(
+                **{field: getattr(event, field) for field in ARCHIVED_FIELDS},
+                sources=[{"source": s.source, "title": s.title, "url": s.url} for s in event.sources.all()],
+                tags=sorted(event_tag.tag.name for event_tag in event.event_tags.all()),
+            )
+            for event in events
+        ]
+        # An event that was scraped again after being archived supersedes its older copy
+        superseded = ArchivedEvent.objects.filter(title__in=[event.title for event in events])
+        # EventTag rows are keyed by event id and would otherwise outlive the old copy
+        EventTag.objects.filter(event_id__in=superseded.values("id")).delete()
+        superseded.delete()
+        ArchivedEvent.objects.bulk_create(archived)
+        # EventTag rows are not cascaded, so the archived copy keeps its tags
+        Event.objects.filter(pk__in=[event.pk for event in events]).delete()
+    return len(events)
+
+
+def archive_expired_events(now=None, batch_size=None):
+    """Move every event past the cutoff into ArchivedEvent. Returns the number moved."""
+    batch_size = batch_size or getattr(settings, "EVENTS_ARCHIVE_BATCH_SIZE", DEFAULT_BATCH_SIZE)
+    cutoff = archive_cutoff(now)
+    total = 0
+    # One events-version bump for the whole pass
+    with batch_version_bump():
+        while True:
+            moved = archive_batch(cutoff, batch_size)
+            total += moved
+            if moved < batch_size:
+                break
+    if total:
+        logger.info(f"Archived {total} expired events")
+    return total
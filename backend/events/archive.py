@@ -0,0 +1,94 @@
+"""Compressed, content-addressed archive of the raw pages the scraper fetched.
+
+Each fetched page is gzipped and stored once under its SHA-256, so a page
+that has not changed between runs costs no extra disk. ScrapeSourceRun
+records the digest of the page it parsed, which keeps the markup available
+for debugging a parser without shipping snippets in API responses.
+
+Pages referenced only by runs older than ``EVENTS_RAW_ARCHIVE_RETENTION_DAYS``
+are deleted by ``prune()``.
+"""
+import gzip
+import hashlib
+import logging
+import os
+import tempfile
+from datetime import timedelta
+from pathlib import Path
+
+from django.conf import settings
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_RETENTION_DAYS = 14
+
+
+def archive_dir():
+    return Path(getattr(settings, "EVENTS_RAW_ARCHIVE_DIR", settings.BASE_DIR / "media" / "scrape_archive"))
+
+
+def retention():
+    return timedelta(days=getattr(settings, "EVENTS_RAW_ARCHIVE_RETENTION_DAYS", DEFAULT_RETENTION_DAYS))
+
+
+def page_path(digest):
+    return archive_dir() / digest[:2] / f"{digest}.html.gz"
+
+
+def store(content):
+    """Archive raw page bytes and return their SHA-256 hex digest."""
+    digest = hashlib.sha256(content).hexdigest()
+    path = page_path(digest)
+    if path.exists():
+        # Refresh the mtime so prune() sees the page as recently used
+        os.utime(path)
+        return digest
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=".tmp-")
+    try:
+        with os.fdopen(fd, "wb") as raw, gzip.GzipFile(fileobj=raw, mode="wb", mtime=0) as compressed:
+            compressed.write(content)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+    return digest
+
+
+def load(digest):
+    """Return the archived page for ``digest``, or None if it was pruned."""
+    try:
+        with gzip.open(page_path(digest), "rb") as f:
+            return f.read()
+    except FileNotFoundError:
+        return None
+
+
+def prune(now=None):
+    """Delete pages no run inside the retention window refers to.
+
+    Returns the number of pages removed.
+    """
+    from .models import ScrapeSourceRun
+
+    root = archive_dir()
+    if not root.exists():
+        return 0
+    cutoff = (now or timezone.now()) - retention()
+    keep = set(
+        ScrapeSourceRun.objects.filter(started_at__gte=cutoff)
+        .exclude(raw_page_sha256="")
+        .values_list("raw_page_sha256", flat=True)
+    )
+    removed = 0
+    for path in root.glob("*/*.html.gz"):
+        digest = path.name[:-len(".html.gz")]
+        # Pages written after the cutoff may belong to a run that is still saving
+        if digest in keep or path.stat().st_mtime >= cutoff.timestamp():
+            continue
+        path.unlink(missing_ok=True)
+        removed += 1
+    if removed:
+        logger.info(f"Pruned {removed} archived pages")
+    return removed
@@ -0,0 +1,140 @@
+"""Versioned response cache for the read-only events API.
+
+Events only change when a scrape (or an admin edit) commits, so every
+cached payload is keyed by an events *version* that is bumped once per
+commit. Readers look the version up in the cache, never in the events
+tables.
+
+When the version moves on, the first reader of a key is served the previous
+payload straight away and the new one is built in a background thread
+(stale-while-revalidate), so no read waits on the database while a scrape
+is busy writing.
+
+The version lives in the "versions" cache, which settings point at its own
+shared database table: scrapes run by the scheduler process or the
+management commands bump it for every web worker, and culling of the
+response entries in the default cache can never evict it.
+"""
+import hashlib
+import logging
+import threading
+from contextlib import contextmanager
+
+from django.core.cache import cache, caches
+from django.db import close_old_connections, transaction
+from django.utils import timezone
+from django.utils.http import parse_etags, quote_etag
+
+logger = logging.getLogger(__name__)
+
+VERSION_KEY = "events:version"
+REFRESH_LOCK_TTL = 30
+STALE_TTL = 24 * 60 * 60
+CACHE_CONTROL = "public, max-age=30, stale-while-revalidate=300"
+
+_local = threading.local()
+
+
+def get_events_version():
+    version = caches["versions"].get(VERSION_KEY)
+    if version is None:
+        # Cold cache: any fresh value works, it only has to differ from older ones
+        caches["versions"].add(VERSION_KEY, str(timezone.now().timestamp()), None)
+        version = caches["versions"].get(VERSION_KEY)
+    return version
+
+
+def bump_events_version():
+    caches["versions"].set(VERSION_KEY, str(timezone.now().timestamp()), None)
+
+
+def bump_on_commit():
+    if getattr(_local, "deferred", None) is not None:
+        # Inside batch_version_bump(): remember the change, bump once at the end
+        _local.deferred = True
+        return
+    transaction.on_commit(bump_events_version)
+
+
+@contextmanager
+def batch_version_bump():
+    """Collapse every bump requested inside the block into one at the end.
+
+    The scraper saves events one by one; wrapping it in this keeps the
+    version (and so every cached page) stable until the scrape is done.
+    """
+    if getattr(_local, "deferred", None) is not None:
+        yield
+        return
+    _local.deferred = False
+    try:
+        yield
+    finally:
+        changed = _local.deferred
+        _local.deferred = None
+        if changed:
+            bump_on_commit()
+
+
+def _spawn(func, *args):
+    threading.Thread(target=func, args=args, daemon=True).start()
+
+
+def _refresh(key, build):
+    close_old_connections()
+    try:
+        version = get_events_version()
+        entry = _store(key, version, build())
+        logger.debug(f"Revalidated {key} at version {entry['version']}")
+    except Exception as e:
+        logger.error(f"Revalidating {key} failed: {e}", exc_info=True)
+    finally:
+        cache.delete(f"{key}:refreshing")
+        close_old_connections()
+
+
+def _store(key, version, result):
+    data, status = result
+    entry = {
+        "version": version,
+        "data": data,
+        "status": status,
+        "etag": quote_etag(hashlib.sha1(f"{version}:{key}".encode()).hexdigest()),
+    }
+    if status == 200:
+        cache.set(key, entry, STALE_TTL)
+    return entry
+
+
+def get_cached(key, build):
+    """Return a cache entry for ``key``, building it with ``build()`` on a miss.
+
+    ``build`` returns ``(data, status)``. The entry has ``data``, ``status``,
+    ``etag`` and ``stale`` (True when an older version is being served
+    while a refresh runs in the background).
+    """
+    version = get_events_version()
+    entry = cache.get(key)
+    if entry is not None:
+        if entry["version"] == version:
+            return dict(entry, stale=False)
+        if cache.add(f"{key}:refreshing", True, REFRESH_LOCK_TTL):
+            _spawn(_refresh, key, build)
+        return dict(entry, stale=True)
+    return dict(_store(key, version, build()), stale=False)
+
+
+def request_key(prefix, request):
+    return f"events:{prefix}:{hashlib.sha1(request.get_full_path().encode()).hexdigest()}"
+
+
+def conditional_response(request, entry, response_class):
+    """Build a response for a cache entry, honouring If-None-Match."""
+    if entry["status"] == 200 and entry["etag"] in parse_etags(request.headers.get("If-None-Match", "")):
+        response = response_class(status=304)
+    else:
+        response = response_class(entry["data"], status=entry["status"])
+    if entry["status"] == 200:
+        response["ETag"] = entry["etag"]
+        response["Cache-Control"] = CACHE_CONTROL
+    return response
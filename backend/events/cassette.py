@@ -0,0 +1,119 @@
+"""Record/replay cassettes for offline scraping.
+
+``Recorder`` fetches for real and keeps every response; ``save()`` writes
+them to a gzipped JSON cassette. ``Player`` serves a scrape from that file
+with a fixed simulated latency per request, which makes the whole
+pipeline repeatable and benchmarkable without reaching the live sites::
+
+    with use_fetcher(Player("reskilll.json.gz", latency_ms=150)):
+        scrape_events()
+
+Interactions are keyed by URL; the scraper only issues GETs.
+"""
+import base64
+import gzip
+import json
+import threading
+import time
+
+import requests
+
+CASSETTE_VERSION = 1
+# Response headers worth replaying; the rest is noise in the cassette
+KEPT_HEADERS = ("content-type", "content-encoding", "etag", "last-modified")
+
+
+class CassetteMiss(requests.ConnectionError):
+    """The URL is not in the cassette. Retrying cannot help."""
+
+
+class CassetteResponse:
+    """The parts of ``requests.Response`` the scraper uses."""
+
+    def __init__(self, url, status_code, headers, content):
+        self.url = url
+        self.status_code = status_code
+        self.headers = requests.structures.CaseInsensitiveDict(headers)
+        self.content = content
+
+    @property
+    def encoding(self):
+        content_type = self.headers.get("content-type", "")
+        for part in content_type.split(";"):
+            key, _, value = part.strip().partition("=")
+            if key.lower() == "charset" and value:
+                return value.strip('"')
+        return "utf-8"
+
+    @property
+    def text(self):
+        return self.content.decode(self.encoding, errors="replace")
+
+    def json(self):
+        return json.loads(self.text)
+
+    def iter_content(self, chunk_size=1):
+        for start in range(0, len(self.content), chunk_size):
+            yield self.content[start:start + chunk_size]
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"{self.status_code} Error for url: {self.url}", response=self)
+
+
+def load(path):
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        data = json.load(f)
+    if data.get("version") != CASSETTE_VERSION:
+        raise ValueError(f"{path} is not a version {CASSETTE_VERSION} cassette")
+    return data["interactions"]
+
+
+class Recorder:
+    """Fetch with requests and remember each response for the cassette."""
+
+    def __init__(self, path):
+        self.path = path
+        self.interactions = {}
+        self._lock = threading.Lock()
+
+    def get(self, url, **kwargs):
+        response = requests.get(url, **kwargs)
+        interaction = {
+            "status": response.status_code,
+            "headers": {k: v for k, v in response.headers.items() if k.lower() in KEPT_HEADERS},
+            # Reading .content also buffers streamed responses for the caller
+            "body": base64.b64encode(response.content).decode("ascii"),
+        }
+        with self._lock:
+            self.interactions[url] = interaction
+        return response
+
+    def save(self):
+        with self._lock:
+            payload = {"version": CASSETTE_VERSION, "interactions": self.interactions}
+        with gzip.open(self.path, "wt", encoding="utf-8") as f:
+            json.dump(payload, f)
+        return len(payload["interactions"])
+
+
+class Player:
+    """Serve recorded responses, sleeping ``latency_ms`` per request like a real round trip."""
+
+    def __init__(self, path, latency_ms=0):
+        self.latency = latency_ms / 1000
+        self.requests = 0
+        self._responses = {
+            url: (interaction["status"], interaction["headers"], base64.b64decode(interaction["body"]))
+            for url, interaction in load(path).items()
+        }
+
+    def get(self, url, **kwargs):
+        self.requests += 1
+        if self.latency:
+            time.sleep(self.latency)
+        try:
+            status_code, headers, content = self._responses[url]
+        except KeyError:
+            raise CassetteMiss(f"{url} is not in the cassette")
+        return CassetteResponse(url, status_code, headers, content)
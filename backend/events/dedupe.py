@@ -0,0 +1,193 @@
+"""Cross-source duplicate detection with MinHash signatures and LSH buckets.
+
+The same hackathon often shows up on several listing sites with slightly
+different titles. Every event gets two MinHash signatures, one over the
+character shingles of its title and one over word pairs of its description.
+Signatures are split into bands; events sharing any band bucket become
+candidates, so finding a match costs a handful of dict lookups instead of a
+comparison with every stored event. Candidates are confirmed on the
+estimated Jaccard similarity before an incoming event is merged into the
+existing (canonical) one.
+"""
+import hashlib
+import random
+import re
+import struct
+from collections import defaultdict
+
+NUM_PERM = 64
+BANDS = 16
+ROWS = NUM_PERM // BANDS
+
+# A candidate is a duplicate when its titles are this similar...
+TITLE_THRESHOLD = 0.7
+# ...or when titles are loosely similar and the descriptions agree
+LOOSE_TITLE_THRESHOLD = 0.4
+DESCRIPTION_THRESHOLD = 0.6
+
+_PRIME = (1 << 61) - 1
+_rng = random.Random(20250301)  # fixed seed: stored signatures must stay comparable
+_PERMUTATIONS = [(_rng.randrange(1, _PRIME), _rng.randrange(0, _PRIME)) for _ in range(NUM_PERM)]
+_EMPTY = (_PRIME,) * NUM_PERM
+
+_NON_WORD_RE = re.compile(r"[^a-z0-9]+")
+_NUMBER_RE = re.compile(r"\d+")
+_SIGNATURE_FORMAT = f"<{2 * NUM_PERM}Q"
+
+
+def normalize(text):
+    return _NON_WORD_RE.sub(" ", (text or "").lower()).strip()
+
+
+def title_shingles(title, k=3):
+    text = normalize(title)
+    if len(text) <= k:
+        return {text} if text else set()
+    return {text[i:i + k] for i in range(len(text) - k + 1)}
+
+
+def description_shingles(description, max_words=80):
+    words = normalize(description).split()[:max_words]
+    if len(words) < 2:
+        return set(words)
+    return {f"{a} {b}" for a, b in zip(words, words[1:])}
+
+
+def _hash(shingle):
+    return int.from_bytes(hashlib.blake2b(shingle.encode(), digest_size=8).digest(), "little")
+
+
+def minhash(shingles):
+    if not shingles:
+        return _EMPTY
+    hashes = [_hash(s) for s in shingles]
+    return tuple(min((a * h + b) % _PRIME for h in hashes) for a, b in _PERMUTATIONS)
+
+
+def signature(title, description):
+    """Title signature followed by description signature."""
+    return minhash(title_shingles(title)) + minhash(description_shingles(description))
+
+
+def pack(sig):
+    return struct.pack(_SIGNATURE_FORMAT, *sig)
+
+
+def unpack(data):
+    return struct.unpack(_SIGNATURE_FORMAT, bytes(data))
+
+
+def similarity(a, b):
+    """Estimated Jaccard similarity of two single (NUM_PERM long) signatures."""
+    if a == _EMPTY or b == _EMPTY:
+        return 0.0
+    return sum(1 for x, y in zip(a, b) if x == y) / NUM_PERM
+
+
+def _numbers(title):
+    return set(_NUMBER_RE.findall(title or ""))
+
+
+class LSHIndex:
+    """Band buckets over title and description signatures."""
+
+    def __init__(self):
+        self._buckets = defaultdict(set)
+        self._signatures = {}
+
+    def _keys(self, sig):
+        for part, offset in (("t", 0), ("d", NUM_PERM)):
+            half = sig[offset:offset + NUM_PERM]
+            if half == _EMPTY:
+                continue
+            for band in range(BANDS):
+                yield (part, band, half[band * ROWS:(band + 1) * ROWS])
+
+    def add(self, key, sig):
+        self._signatures[key] = sig
+        for bucket in self._keys(sig):
+            self._buckets[bucket].add(key)
+
+    def candidates(self, sig):
+        found = set()
+        for bucket in self._keys(sig):
+            found |= self._buckets.get(bucket, set())
+        return found
+
+    def signature_of(self, key):
+        return self._signatures[key]
+
+
+def is_duplicate(sig_a, sig_b, title_a, title_b):
+    # "HackFest 2024" and "HackFest 2025" are different editions, not duplicates
+    numbers_a, numbers_b = _numbers(title_a), _numbers(title_b)
+    if numbers_a and numbers_b and numbers_a != numbers_b:
+        return False
+    title_sim = similarity(sig_a[:NUM_PERM], sig_b[:NUM_PERM])
+    if title_sim >= TITLE_THRESHOLD:
+        return True
+    description_sim = similarity(sig_a[NUM_PERM:], sig_b[NUM_PERM:])
+    return title_sim >= LOOSE_TITLE_THRESHOLD and description_sim >= DESCRIPTION_THRESHOLD
+
+
+class EventDeduplicator:
+    """Finds the canonical Event an incoming scraped event duplicates.
+
+    Built once per scrape from the stored signatures; events saved during
+    the scrape are added as they go, so duplicates within one run are caught too.
+    Only cross-source matches count: two differently-titled cards from the
+    same site are two events.
+    """
+
+    def __init__(self):
+        from .models import Event
+
+        self.index = LSHIndex()
+        self.titles = {}
+        self.sources = defaultdict(set)
+        # event id -> the source that found it first; its fields win over later duplicates
+        self.owners = {}
+        # (source, title as that source lists it) -> event id, so merged cards keep resolving
+        self.links = {}
+        missing = []
+        for event in Event.objects.only('id', 'title', 'description', 'minhash').prefetch_related('sources'):
+            if event.minhash:
+                sig = unpack(event.minhash)
+            else:
+                sig = signature(event.title, event.description)
+                event.minhash = pack(sig)
+                missing.append(event)
+            self._add(event.pk, event.title, sig, [s.source for s in event.sources.all()])
+            for link in event.sources.all():
+                self.links[(link.source, link.title)] = event.pk
+        if missing:
+            Event.objects.bulk_update(missing, ['minhash'], batch_size=500)
+
+    def _add(self, event_id, title, sig, sources):
+        self.index.add(event_id, sig)
+        self.titles[event_id] = title
+        self.sources[event_id].update(sources)
+        if sources:
+            self.owners.setdefault(event_id, sources[0])
+
+    def linked_event(self, source, title):
+        """Return the id of the event this source's card was linked to before, or None."""
+        return self.links.get((source, title))
+
+    def find_canonical(self, event_data, source, sig):
+        """Return the id of the event ``event_data`` duplicates, or None."""
+        best, best_score = None, 0.0
+        for candidate in self.index.candidates(sig):
+            if source in self.sources[candidate]:
+                continue
+            candidate_sig = self.index.signature_of(candidate)
+            if not is_duplicate(sig, candidate_sig, event_data.get("title"), self.titles[candidate]):
+                continue
+            score = similarity(sig[:NUM_PERM], candidate_sig[:NUM_PERM])
+            if best is None or score > best_score:
+                best, best_score = candidate, score
+        return best
+
+    def record(self, event_id, title, source, source_title, sig):
+        self._add(event_id, title, sig, [source])
+        self.links.setdefault((source, source_title), event_id)
@@ -0,0 +1,32 @@
+"""HTTP access for the scraper.
+
+Every request the scraper makes (listing pages and banner images) goes
+through ``get``. It calls ``requests.get`` unless a fetcher is installed
+with ``use_fetcher``; events.cassette provides fetchers that record
+responses to disk or replay them offline.
+"""
+from contextlib import contextmanager
+
+import requests
+
+_fetcher = None
+
+
+def get(url, **kwargs):
+    if _fetcher is not None:
+        return _fetcher.get(url, **kwargs)
+    return requests.get(url, **kwargs)
+
+
+@contextmanager
+def use_fetcher(fetcher):
+    """Route every scraper request through ``fetcher`` (an object with ``get``) in this block.
+
+    Process-wide rather than per thread, since pages are fetched in worker threads.
+    """
+    global _fetcher
+    previous, _fetcher = _fetcher, fetcher
+    try:
+        yield fetcher
+    finally:
+        _fetcher = previous
@@ -0,0 +1,83 @@
+"""Minimal RFC 5545 writer for the registration-window calendar feed."""
+from datetime import timezone as dt_timezone
+
+from django.utils import timezone
+
+PRODID = "-//CollegeConnect//Events//EN"
+
+
+def escape_text(value):
+    return (
+        str(value)
+        .replace("\\", "\\\\")
+        .replace(";", "\\;")
+        .replace(",", "\\,")
+        .replace("\r\n", "\\n")
+        .replace("\n", "\\n")
+    )
+
+
+def fold(line):
+    """Fold a content line at 75 octets as the RFC requires, without splitting UTF-8 sequences."""
+    encoded = line.encode("utf-8")
+    if len(encoded) <= 75:
+        return line + "\r\n"
+    parts = []
+    limit = 75
+    while encoded:
+        cut = min(limit, len(encoded))
+        # Step back to a character boundary
+        while cut < len(encoded) and (encoded[cut] & 0xC0) == 0x80:
+            cut -= 1
+        parts.append(encoded[:cut].decode("utf-8"))
+        encoded = encoded[cut:]
+        limit = 74  # continuation lines start with a space
+    return "\r\n ".join(parts) + "\r\n"
+
+
+def format_datetime(value):
+    return value.astimezone(dt_timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+
+
+def event_component(event, stamp):
+    start = event.registration_start or event.registration_end
+    lines = [
+        "BEGIN:VEVENT",
+        f"UID:event-{event.pk}@collegeconnect",
+        f"DTSTAMP:{stamp}",
+        f"DTSTART:{format_datetime(start)}",
+        f"DTEND:{format_datetime(event.registration_end)}",
+        f"SUMMARY:{escape_text(f'Registration: {event.title}')}",
+    ]
+    if event.description:
+        lines.append(f"DESCRIPTION:{escape_text(event.description)}")
+    url = event.event_url or event.link
+    if url:
+        lines.append(f"URL:{url}")
+    lines += [
+        f"LAST-MODIFIED:{format_datetime(event.updated_at)}",
+        # Remind a day before registration closes
+        "BEGIN:VALARM",
+        "ACTION:DISPLAY",
+        f"DESCRIPTION:{escape_text(f'Registration for {event.title} closes tomorrow')}",
+        "TRIGGER;RELATED=END:-P1D",
+        "END:VALARM",
+        "END:VEVENT",
+    ]
+    return "".join(fold(line) for line in lines)
+
+
+def stream_calendar(events, name="CollegeConnect events"):
+    """Yield the calendar one event at a time so memory stays flat for any feed size."""
+    stamp = format_datetime(timezone.now())
+    yield "".join(fold(line) for line in [
+        "BEGIN:VCALENDAR",
+        "VERSION:2.0",
+        f"PRODID:{PRODID}",
+        "CALSCALE:GREGORIAN",
+        "METHOD:PUBLISH",
+        f"X-WR-CALNAME:{escape_text(name)}",
+    ])
+    for event in events:
+        yield event_component(event, stamp)
+    yield fold("END:VCALENDAR")
@@ -0,0 +1,163 @@
+"""Local resize cache for remote event banners.
+
+Banners are fetched once, at scrape time, and stored on disk as a few
+resized JPEG variants under ``EVENTS_IMAGE_CACHE_DIR/<key>/<variant>.jpg``,
+where ``key`` is a hash of the remote URL. The images endpoint only ever
+serves files that are already in the cache, so it cannot be used to make
+the server fetch arbitrary URLs.
+
+The cache is bounded by ``EVENTS_IMAGE_CACHE_MAX_BYTES``. Serving a variant
+touches its directory, and eviction drops whole images least recently
+used first.
+"""
+import hashlib
+import logging
+import os
+import shutil
+import tempfile
+from io import BytesIO
+from pathlib import Path
+
+import requests
+from django.conf import settings
+from PIL import Image, UnidentifiedImageError
+
+from . import fetch
+
+logger = logging.getLogger(__name__)
+
+# variant -> maximum width in pixels
+VARIANTS = {
+    "thumb": 320,
+    "card": 640,
+    "full": 1280,
+}
+DEFAULT_VARIANT = "card"
+JPEG_QUALITY = 82
+MAX_DOWNLOAD_BYTES = 10 * 1024 * 1024
+DEFAULT_MAX_BYTES = 200 * 1024 * 1024
+
+
+class ImageCacheError(Exception):
+    pass
+
+
+def cache_dir():
+    return Path(getattr(settings, "EVENTS_IMAGE_CACHE_DIR", settings.BASE_DIR / "media" / "event_images"))
+
+
+def max_bytes():
+    return getattr(settings, "EVENTS_IMAGE_CACHE_MAX_BYTES", DEFAULT_MAX_BYTES)
+
+
+def image_key(url):
+    return hashlib.sha256(url.encode()).hexdigest()[:32]
+
+
+def variant_path(key, variant):
+    return cache_dir() / key / f"{variant}.jpg"
+
+
+def is_cached(url):
+    return variant_path(image_key(url), DEFAULT_VARIANT).exists()
+
+
+def _resize(image, width):
+    if image.width > width:
+        height = max(1, round(image.height * width / image.width))
+        image = image.resize((width, height), Image.LANCZOS)
+    buffer = BytesIO()
+    image.save(buffer, "JPEG", quality=JPEG_QUALITY, optimize=True, progressive=True)
+    return buffer.getvalue()
+
+
+def _download(url, timeout):
+    response = fetch.get(url, timeout=timeout, stream=True, headers={"User-Agent": "Mozilla/5.0"})
+    response.raise_for_status()
+    data = BytesIO()
+    for chunk in response.iter_content(64 * 1024):
+        data.write(chunk)
+        if data.tell() > MAX_DOWNLOAD_BYTES:
+            raise ImageCacheError(f"{url} is larger than {MAX_DOWNLOAD_BYTES} bytes")
+    data.seek(0)
+    return data
+
+
+def cache_image(url, timeout=10):
+    """Fetch ``url`` and store its resized variants. Returns the cache key.
+
+    Raises ImageCacheError if the download fails or is not an image.
+    """
+    key = image_key(url)
+    if variant_path(key, DEFAULT_VARIANT).exists():
+        return key
+    try:
+        with Image.open(_download(url, timeout)) as source:
+            source.load()
+            image = source.convert("RGB")
+    except requests.RequestException as e:
+        raise ImageCacheError(f"Fetching {url} failed: {e}")
+    except (UnidentifiedImageError, Image.DecompressionBombError, OSError) as e:
+        # DecompressionBombError: claims more pixels than Pillow will decode (not an OSError)
+        raise ImageCacheError(f"{url} is not a usable image: {e}")
+
+    root = cache_dir()
+    root.mkdir(parents=True, exist_ok=True)
+    # Write every variant into a scratch directory, then move it into place in one step
+    scratch = Path(tempfile.mkdtemp(dir=root, prefix=".tmp-"))
+    try:
+        for variant, width in VARIANTS.items():
+            (scratch / f"{variant}.jpg").write_bytes(_resize(image, width))
+        os.replace(scratch, root / key)
+    except OSError:
+        # Another worker stored the same image first
+        shutil.rmtree(scratch, ignore_errors=True)
+        if not variant_path(key, DEFAULT_VARIANT).exists():
+            raise
+    return key
+
+
+def open_variant(key, variant):
+    """Return an open file for a cached variant, or None if it is not cached."""
+    if variant not in VARIANTS or len(key) != 32 or not all(c in "0123456789abcdef" for c in key):
+        return None
+    path = variant_path(key, variant)
+    try:
+        handle = path.open("rb")
+    except FileNotFoundError:
+        return None
+    try:
+        # Mark the image as recently used for eviction
+        os.utime(path.parent)
+    except OSError:
+        pass
+    return handle
+
+
+def evict(limit=None):
+    """Delete least recently used images until the cache fits in ``limit`` bytes.
+
+    Returns the number of images removed.
+    """
+    limit = max_bytes() if limit is None else limit
+    root = cache_dir()
+    if not root.exists():
+        return 0
+    entries = []
+    total = 0
+    for entry in os.scandir(root):
+        if not entry.is_dir() or entry.name.startswith("."):
+            continue
+        size = sum(f.stat().st_size for f in os.scandir(entry.path) if f.is_file())
+        entries.append((entry.stat().st_mtime, entry.path, size))
+        total += size
+    removed = 0
+    for _, path, size in sorted(entries):
+        if total <= limit:
+            break
+        shutil.rmtree(path, ignore_errors=True)
+        total -= size
+        removed += 1
+    if removed:
+        logger.info(f"Evicted {removed} cached event images")
+    return removed
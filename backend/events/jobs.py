@@ -0,0 +1,138 @@
+"""Background scrape jobs.
+
+The scrape/ endpoint enqueues a ScrapeJob and returns straight away; the
+scrape itself runs on a single in-process worker thread. Only one job can
+be queued or running at a time (enforced by ScrapeJob.active_slot), so a
+second trigger joins the job that is already in flight.
+"""
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, close_old_connections, transaction
+from django.utils import timezone
+
+from .models import ScrapeJob, ScrapeRun
+
+logger = logging.getLogger(__name__)
+
+_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="scrape-job")
+
+
+def _job_timeout():
+    return timedelta(seconds=getattr(settings, "EVENTS_SCRAPE_JOB_TIMEOUT", 15 * 60))
+
+
+def _release_stale_job():
+    """Fail an active job left behind by a worker that died mid-scrape."""
+    cutoff = timezone.now() - _job_timeout()
+    ScrapeJob.objects.filter(active_slot=ScrapeJob.ACTIVE_SLOT, created_at__lt=cutoff).update(
+        status=ScrapeJob.FAILED,
+        active_slot=None,
+        error="Timed out before finishing.",
+        finished_at=timezone.now(),
+    )
+
+
+def _create_or_join():
+    """Take the active slot, or return the job holding it. The job is None if that job just finished."""
+    try:
+        with transaction.atomic():
+            return ScrapeJob.objects.create(active_slot=ScrapeJob.ACTIVE_SLOT), True
+    except IntegrityError:
+        return ScrapeJob.objects.filter(active_slot=ScrapeJob.ACTIVE_SLOT).first(), False
+
+
+def enqueue_scrape():
+    """Return ``(job, created)``. ``created`` is False when an active job was joined."""
+    _release_stale_job()
+    job, created = _create_or_join()
+    while job is None:
+        # The active job finished between our insert and lookup; try again
+        job, created = _create_or_join()
+    if not created:
+        return job, False
+
+    if getattr(settings, "EVENTS_SCRAPE_JOBS_EAGER", False):
+        run_job(job.pk)
+        job.refresh_from_db()
+    else:
+        transaction.on_commit(lambda: _executor.submit(_run_in_thread, job.pk))
+    return job, True
+
+
+def _run_in_thread(job_id):
+    close_old_connections()
+    try:
+        run_job(job_id)
+    finally:
+        close_old_connections()
+
+
+def run_scheduled_scrape():
+    """Scrape the due sources unless a scrape is already queued or running.
+
+    Registered with events.scheduler. The run takes the same active slot as
+    HTTP-triggered jobs, so the two never overlap.
+    """
+    from .sources import due_sources
+
+    sources = due_sources()
+    if not sources:
+        return None
+    _release_stale_job()
+    try:
+        with transaction.atomic():
+            job = ScrapeJob.objects.create(active_slot=ScrapeJob.ACTIVE_SLOT)
+    except IntegrityError:
+        logger.info("Skipping scheduled scrape: another scrape is in flight")
+        return None
+    run_job(job.pk, sources=sources, trigger='scheduler')
+    return job.pk
+
+
+def run_job(job_id, sources=None, trigger='job'):
+    # Imported lazily so importing the job helpers never pulls in the scraper stack
+    from .scraper import scrape_events
+    from .sources import sync_code_sources
+
+    if sources is None:
+        # Requested over HTTP: the web process may run before the scheduler has synced
+        sync_code_sources()
+    ScrapeJob.objects.filter(pk=job_id).update(status=ScrapeJob.RUNNING, started_at=timezone.now())
+    try:
+        summary = scrape_events(sources, run=ScrapeRun.objects.create(trigger=trigger, job_id=job_id))
+        new_event_count = summary["events_created"]
+        total_event_count = new_event_count + summary["events_updated"] + summary["events_unchanged"]
+        ScrapeJob.objects.filter(pk=job_id).update(
+            status=ScrapeJob.SUCCEEDED,
+            active_slot=None,
+            finished_at=timezone.now(),
+            result={
+                "message": f"Successfully scraped {total_event_count} events. Found {new_event_count} new events!",
+                "new_event_count": new_event_count,
+                "total_event_count": total_event_count,
+                "run_id": summary["run_id"],
+            },
+        )
+    except Exception as e:
+        logger.error(f"Scrape job {job_id} failed: {e}", exc_info=True)
+        ScrapeJob.objects.filter(pk=job_id).update(
+            status=ScrapeJob.FAILED,
+            active_slot=None,
+            finished_at=timezone.now(),
+            error=str(e),
+        )
+
+
+def job_payload(job):
+    return {
+        "job_id": job.pk,
+        "status": job.status,
+        "created_at": job.created_at,
+        "started_at": job.started_at,
+        "finished_at": job.finished_at,
+        "result": job.result,
+        "error": job.error or None,
+    }
@@ -0,0 +1,67 @@
+import statistics
+import time
+import tracemalloc
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from events.parsers.backends import BACKENDS, lxml_available
+from events.parsers.devfolio import parse_devfolio
+from events.parsers.reskilll import parse_reskilll
+
+FIXTURES_DIR = Path(__file__).resolve().parents[2] / "tests" / "fixtures"
+
+SOURCES = {
+    "reskilll": (parse_reskilll, "reskilll_allhacks.html", "https://reskilll.com/allhacks"),
+    "devfolio": (parse_devfolio, "devfolio_explore.html", "https://devfolio.co/explore"),
+}
+
+
+class Command(BaseCommand):
+    help = "Benchmark parse time and peak memory of each events parser backend over saved HTML pages"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--fixtures-dir", default=str(FIXTURES_DIR),
+                            help="Directory holding reskilll_allhacks.html and devfolio_explore.html")
+        parser.add_argument("--repeat", type=int, default=50, help="Timed parses per backend and source")
+        parser.add_argument("--backend", action="append", choices=list(BACKENDS),
+                            help="Backend to benchmark (repeatable, defaults to all)")
+
+    def handle(self, *args, **options):
+        fixtures_dir = Path(options["fixtures_dir"])
+        repeat = max(1, options["repeat"])
+        backends = options["backend"] or list(BACKENDS)
+        if not lxml_available():
+            self.stderr.write("lxml is not installed; lxml backends fall back to html.parser.")
+
+        self.stdout.write(f"{'source':<10} {'backend':<14} {'events':>6} {'median ms':>10} {'min ms':>8} {'peak KiB':>9}")
+        for source, (parse, filename, base_url) in SOURCES.items():
+            path = fixtures_dir / filename
+            if not path.exists():
+                raise CommandError(f"Missing fixture {path}")
+            html = path.read_text(encoding="utf-8")
+            reference = None
+
+            for backend in backends:
+                events = parse(html, base_url, backend=backend)
+                if reference is None:
+                    reference = events
+                elif events != reference:
+                    self.stderr.write(self.style.WARNING(f"{source}/{backend}: output differs from {backends[0]}"))
+
+                timings = []
+                for _ in range(repeat):
+                    started = time.perf_counter()
+                    parse(html, base_url, backend=backend)
+                    timings.append((time.perf_counter() - started) * 1000)
+
+                # Measured separately so tracing overhead does not skew the timings
+                tracemalloc.start()
+                parse(html, base_url, backend=backend)
+                _, peak = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+
+                self.stdout.write(
+                    f"{source:<10} {backend:<14} {len(events):>6} {statistics.median(timings):>10.3f} "
+                    f"{min(timings):>8.3f} {peak / 1024:>9.1f}"
+                )
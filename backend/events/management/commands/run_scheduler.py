@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand
+from events.scheduler import JOBS, Scheduler
+from events.sources import sync_code_sources
+
+
+class Command(BaseCommand):
+    help = "Run registered periodic jobs (scraping, ...) on their intervals, one leader across all nodes"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--once", action="store_true",
+                            help="Run a single tick (every job runs if this node is the leader) and exit")
+        parser.add_argument("--max-sleep", type=int, default=60,
+                            help="Upper bound in seconds on how long the loop sleeps between ticks")
+
+    def handle(self, *args, **options):
+        sync_code_sources()
+        scheduler = Scheduler()
+        jobs = ", ".join(f"{job.name} every {job.interval:.0f}s" for job in JOBS.values())
+        self.stdout.write(f"Scheduler {scheduler.owner}: {jobs}")
+        if options["once"]:
+            ran = scheduler.tick(force=True)
+            scheduler.release()
+            self.stdout.write(f"Ran: {', '.join(ran)}" if ran else "Not the leader; nothing run.")
+            return
+        try:
+            scheduler.run_forever(options["max_sleep"])
+        except KeyboardInterrupt:
+            self.stdout.write("Scheduler stopped.")
@@ -1,18 +1,87 @@
+import time
+
 from django.core.management.base import BaseCommand
+from events.cassette import Player, Recorder
+from events.fetch import use_fetcher
+from events.models import ScrapeRun
+from events.scheduler import Scheduler
 from events.scraper import scrape_events
+from events.sources import due_sources, get_sources, sync_code_sources
 
 
 class Command(BaseCommand):
     help = "Scrape events and save them to the DB (wrapper around events.scraper.scrape_events)"
 
+    def add_arguments(self, parser):
+        parser.add_argument("--source", action="append", dest="sources",
+                            help="Only scrape the named source (repeatable)")
+        parser.add_argument("--due", action="store_true",
+                            help="Only scrape sources whose fetch interval has elapsed")
+        parser.add_argument("--loop", action="store_true",
+                            help="Keep running, scraping each source on its own cadence "
+                                 "(same as run_scheduler)")
+        parser.add_argument("--max-sleep", type=int, default=300,
+                            help="Upper bound in seconds on how long --loop sleeps between checks")
+        cassette = parser.add_mutually_exclusive_group()
+        cassette.add_argument("--record", metavar="CASSETTE",
+                              help="Save every fetched response to this cassette file (.json.gz)")
+        cassette.add_argument("--replay", metavar="CASSETTE",
+                              help="Serve every request from this cassette instead of the network")
+        parser.add_argument("--latency-ms", type=int, default=0,
+                            help="Simulated round-trip time per request with --replay")
+
     def handle(self, *args, **options):
+        sync_code_sources()
+        if options["loop"]:
+            self._loop(options["max_sleep"])
+            return
         self.stdout.write("Starting scrape_events...")
+        if options["record"]:
+            recorder = Recorder(options["record"])
+            with use_fetcher(recorder):
+                self._run(options["sources"], options["due"])
+            count = recorder.save()
+            self.stdout.write(f"Recorded {count} responses to {options['record']}")
+        elif options["replay"]:
+            with use_fetcher(Player(options["replay"], latency_ms=options["latency_ms"])):
+                self._run(options["sources"], options["due"])
+        else:
+            self._run(options["sources"], options["due"])
+
+    def _run(self, names=None, due_only=False):
+        sources = due_sources() if due_only else get_sources(names)
+        if names and due_only:
+            sources = [s for s in sources if s.name in names]
+        if not sources:
+            self.stdout.write("No sources to scrape.")
+            return
+        self.stdout.write(f"Scraping: {', '.join(s.name for s in sources)}")
         try:
-            results = scrape_events()
-            # If the scraper returns a summary, print it
-            if isinstance(results, dict):
-                self.stdout.write(self.style.SUCCESS(f"Scrape result: {results}"))
-            else:
-                self.stdout.write(self.style.SUCCESS("Scrape completed."))
+            run = ScrapeRun.objects.create(trigger='command')
+            started = time.perf_counter()
+            summary = scrape_events(sources, run=run)
+            elapsed = time.perf_counter() - started
+            for m in run.source_runs.order_by('pk'):
+                self.stdout.write(
+                    f"  {m.source}: fetch {m.fetch_ms or 0:.0f} ms, {m.bytes_downloaded} bytes, "
+                    f"parse {m.parse_ms or 0:.0f} ms, {m.pages_fetched} pages, {m.cards_found} cards, "
+                    f"{m.events_created} new / {m.events_updated} updated / {m.events_unchanged} unchanged, "
+                    f"{m.duplicates_merged} merged, "
+                    f"{len(m.errors)} errors"
+                )
+            pages = sum(m.pages_fetched for m in run.source_runs.all())
+            self.stdout.write(
+                f"  {elapsed:.2f} s total, {pages / elapsed:.1f} pages/s, "
+                f"{summary['cards_found'] / elapsed:.1f} cards/s"
+            )
+            self.stdout.write(self.style.SUCCESS(f"Scrape result: {summary}"))
         except Exception as e:
             self.stderr.write(self.style.ERROR(f"Scrape failed: {e}"))
+
+    def _loop(self, max_sleep):
+        self.stdout.write("Scheduling sources on their fetch intervals (Ctrl+C to stop)...")
+        # The scheduler's leader lease keeps several --loop processes from scraping at once
+        try:
+            Scheduler().run_forever(max_sleep)
+        except KeyboardInterrupt:
+            self.stdout.write("Scheduler stopped.")
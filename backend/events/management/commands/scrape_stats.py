@@ -0,0 +1,42 @@
+from django.core.management.base import BaseCommand
+
+from events.metrics import MAX_TREND_DAYS, source_trends, trend_days
+
+
+def _fmt(value, suffix=""):
+    return "-" if value is None else f"{value:.1f}{suffix}"
+
+
+class Command(BaseCommand):
+    help = "Summarize scrape run history per source: latency, size, cards and errors against the previous window"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--days", type=int, default=7, help=f"Window size in days, 1 to {MAX_TREND_DAYS} (default 7)")
+
+    def handle(self, *args, **options):
+        days = trend_days(options["days"])
+        trends = source_trends(days=days)
+        if not trends:
+            self.stdout.write("No scrape runs recorded yet.")
+            return
+
+        self.stdout.write(f"Last {days} days vs the {days} days before:")
+        self.stdout.write(
+            f"{'source':<12} {'runs':>5} {'fail':>5} {'fetch ms':>10} {'prev':>10} {'KiB':>8} "
+            f"{'parse ms':>9} {'cards':>7} {'prev':>7} {'new':>5} {'upd':>5} {'same':>5}"
+        )
+        for entry in trends:
+            cur = entry["current"] or {}
+            prev = entry["previous"] or {}
+            avg_bytes = cur.get("avg_bytes")
+            self.stdout.write(
+                f"{entry['source']:<12} {cur.get('runs', 0):>5} {cur.get('failures', 0):>5} "
+                f"{_fmt(cur.get('avg_fetch_ms')):>10} {_fmt(prev.get('avg_fetch_ms')):>10} "
+                f"{_fmt(avg_bytes / 1024 if avg_bytes is not None else None):>8} "
+                f"{_fmt(cur.get('avg_parse_ms')):>9} {_fmt(cur.get('avg_cards')):>7} {_fmt(prev.get('avg_cards')):>7} "
+                f"{cur.get('created') or 0:>5} {cur.get('updated') or 0:>5} {cur.get('unchanged') or 0:>5}"
+            )
+            for alert in entry["alerts"]:
+                self.stdout.write(self.style.WARNING(f"  ! {entry['source']}: {alert}"))
+            for error in entry["last_errors"][:3]:
+                self.stdout.write(f"  last error: {error}")
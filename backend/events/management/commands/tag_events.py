@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+
+from events.cache import bump_events_version
+from events.models import ArchivedEvent, Event, EventTag
+from events.tagging import EventTagger
+
+
+class Command(BaseCommand):
+    help = "Re-extract topic tags for every event and drop tags left behind by deleted events"
+
+    def handle(self, *args, **options):
+        written = EventTagger().sync(Event.objects.values_list("id", flat=True).iterator())
+        # Tag rows are not cascaded; remove those whose event is in neither table
+        orphaned, _ = EventTag.objects.filter(
+            ~Q(event_id__in=Event.objects.values("id")) & ~Q(event_id__in=ArchivedEvent.objects.values("id"))
+        ).delete()
+        # Cached API pages (and ?tag= results) were built from the old tags
+        bump_events_version()
+        self.stdout.write(f"Tagged {Event.objects.count()} events: {written} tag rows changed, {orphaned} orphaned removed.")
@@ -0,0 +1,80 @@
+"""Trend summaries over the persisted scrape run history."""
+from datetime import timedelta
+
+from django.db.models import Avg, Count, Q, Sum
+from django.utils import timezone
+
+from .models import ScrapeSourceRun
+
+# A source is flagged when its fetches get this much slower than the previous window
+SLOWDOWN_RATIO = 1.5
+# ...or when it yields less than this share of the cards it used to
+CARD_DROP_RATIO = 0.5
+# Bounds for the trend window; both windows must stay within timedelta's range
+MAX_TREND_DAYS = 365
+
+
+def trend_days(days):
+    """Clamp a requested trend window to 1..MAX_TREND_DAYS days."""
+    return max(1, min(days, MAX_TREND_DAYS))
+
+
+def _window(start, end):
+    rows = (
+        ScrapeSourceRun.objects.filter(started_at__gte=start, started_at__lt=end)
+        .values('source')
+        .annotate(
+            runs=Count('id'),
+            failures=Count('id', filter=Q(parse_ms__isnull=True)),
+            avg_fetch_ms=Avg('fetch_ms'),
+            avg_bytes=Avg('bytes_downloaded'),
+            avg_parse_ms=Avg('parse_ms'),
+            avg_cards=Avg('cards_found', filter=Q(parse_ms__isnull=False)),
+            created=Sum('events_created'),
+            updated=Sum('events_updated'),
+            unchanged=Sum('events_unchanged'),
+        )
+    )
+    return {row.pop('source'): row for row in rows}
+
+
+def _change(current, previous):
+    if current is None or not previous:
+        return None
+    return round(current / previous, 2)
+
+
+def source_trends(days=7, now=None):
+    """Per-source averages for the last ``days`` compared with the ``days`` before.
+
+    Each entry carries ``alerts`` naming sources that slowed down, started
+    failing or returned far fewer cards (usually a markup change).
+    """
+    now = now or timezone.now()
+    current_start = now - timedelta(days=days)
+    current = _window(current_start, now)
+    previous = _window(current_start - timedelta(days=days), current_start)
+
+    trends = []
+    for source in sorted(set(current) | set(previous)):
+        cur = current.get(source)
+        prev = previous.get(source)
+        entry = {"source": source, "current": cur, "previous": prev, "alerts": []}
+        if cur and prev:
+            entry["fetch_ms_ratio"] = _change(cur["avg_fetch_ms"], prev["avg_fetch_ms"])
+            entry["cards_ratio"] = _change(cur["avg_cards"], prev["avg_cards"])
+            if entry["fetch_ms_ratio"] and entry["fetch_ms_ratio"] >= SLOWDOWN_RATIO:
+                entry["alerts"].append("slower")
+            if entry["cards_ratio"] is not None and entry["cards_ratio"] < CARD_DROP_RATIO:
+                entry["alerts"].append("fewer cards (markup change?)")
+        if cur and cur["failures"]:
+            entry["alerts"].append(f"{cur['failures']} of {cur['runs']} runs failed")
+        if cur and cur["avg_cards"] == 0:
+            entry["alerts"].append("no cards found")
+        last_error = (
+            ScrapeSourceRun.objects.filter(source=source).exclude(errors=[])
+            .values_list('errors', flat=True).first()
+        )
+        entry["last_errors"] = last_error or []
+        trends.append(entry)
+    return trends
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.18 on 2026-10-19 13:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0004_alter_event_registration_end_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ScrapeSource',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=50, unique=True)),
+                ('url', models.URLField(max_length=500)),
+                ('parser', models.CharField(help_text='Key of a parser registered in events.sources.PARSERS', max_length=50)),
+                ('fetch_interval', models.PositiveIntegerField(default=3600, help_text='Seconds between scrapes')),
+                ('timeout', models.PositiveIntegerField(default=10, help_text='HTTP timeout in seconds')),
+                ('priority', models.IntegerField(default=100, help_text='Lower values are scraped first')),
+                ('enabled', models.BooleanField(default=True)),
+                ('declared_in_code', models.BooleanField(default=False, editable=False)),
+                ('last_scraped_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'ordering': ['priority', 'name'],
+            },
+        ),
+    ]
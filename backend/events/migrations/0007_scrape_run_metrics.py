@@ -0,0 +1,50 @@
+# Generated by Django 5.2.18 on 2026-10-19 13:29
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0006_scrapejob'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ScrapeRun',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('trigger', models.CharField(default='manual', max_length=20)),
+                ('started_at', models.DateTimeField(auto_now_add=True, db_index=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('job', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='runs', to='events.scrapejob')),
+            ],
+            options={
+                'ordering': ['-started_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='ScrapeSourceRun',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('source', models.CharField(max_length=50)),
+                ('url', models.URLField(max_length=500)),
+                ('started_at', models.DateTimeField(auto_now_add=True)),
+                ('fetch_attempts', models.PositiveSmallIntegerField(default=0)),
+                ('fetch_ms', models.FloatField(blank=True, null=True)),
+                ('bytes_downloaded', models.PositiveIntegerField(default=0)),
+                ('parse_ms', models.FloatField(blank=True, null=True)),
+                ('cards_found', models.PositiveIntegerField(default=0)),
+                ('events_created', models.PositiveIntegerField(default=0)),
+                ('events_updated', models.PositiveIntegerField(default=0)),
+                ('events_unchanged', models.PositiveIntegerField(default=0)),
+                ('errors', models.JSONField(blank=True, default=list)),
+                ('run', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='source_runs', to='events.scraperun')),
+            ],
+            options={
+                'ordering': ['-started_at'],
+                'indexes': [models.Index(fields=['source', 'started_at'], name='events_scra_source_66c582_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-19 13:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0007_scrape_run_metrics'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['registration_end', 'id'], name='event_reg_end_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['registration_start', 'id'], name='event_reg_start_idx'),
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 5.2.18 on 2026-10-19 13:39
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0008_event_registration_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='event',
+            name='minhash',
+            field=models.BinaryField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='scrapesourcerun',
+            name='duplicates_merged',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.CreateModel(
+            name='EventSource',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('source', models.CharField(max_length=50)),
+                ('title', models.CharField(help_text='Title as shown on this source', max_length=255)),
+                ('url', models.URLField(blank=True, max_length=500, null=True)),
+                ('first_seen', models.DateTimeField(auto_now_add=True)),
+                ('event', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='sources', to='events.event')),
+            ],
+            options={
+                'ordering': ['first_seen', 'id'],
+                'constraints': [models.UniqueConstraint(fields=('event', 'source'), name='unique_event_source')],
+            },
+        ),
+    ]
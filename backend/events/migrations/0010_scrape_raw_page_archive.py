@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 13:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0009_event_sources_dedupe'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='scrapesourcerun',
+            name='raw_page_sha256',
+            field=models.CharField(blank=True, max_length=64),
+        ),
+    ]
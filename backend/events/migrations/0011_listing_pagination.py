@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-19 13:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0010_scrape_raw_page_archive'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='scrapesource',
+            name='max_pages',
+            field=models.PositiveSmallIntegerField(default=1, help_text='Listing pages to follow per scrape'),
+        ),
+        migrations.AddField(
+            model_name='scrapesource',
+            name='page_concurrency',
+            field=models.PositiveSmallIntegerField(default=1, help_text='Listing pages fetched at once'),
+        ),
+        migrations.AddField(
+            model_name='scrapesourcerun',
+            name='pages_fetched',
+            field=models.PositiveSmallIntegerField(default=0),
+        ),
+    ]
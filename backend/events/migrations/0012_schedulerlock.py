@@ -0,0 +1,22 @@
+# Generated by Django 5.2.18 on 2026-10-19 13:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0011_listing_pagination'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SchedulerLock',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=50, unique=True)),
+                ('owner', models.CharField(max_length=100)),
+                ('expires_at', models.DateTimeField()),
+            ],
+        ),
+    ]
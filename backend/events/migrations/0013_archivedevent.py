@@ -0,0 +1,34 @@
+# Generated by Django 5.2.18 on 2026-10-19 13:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0012_schedulerlock'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedEvent',
+            fields=[
+                ('id', models.IntegerField(primary_key=True, serialize=False)),
+                ('title', models.CharField(max_length=255, unique=True)),
+                ('description', models.TextField(blank=True, null=True)),
+                ('image_url', models.URLField(blank=True, max_length=2055, null=True)),
+                ('link', models.URLField(blank=True, null=True)),
+                ('registration_start', models.DateTimeField(blank=True, null=True)),
+                ('registration_end', models.DateTimeField(blank=True, null=True)),
+                ('event_url', models.URLField(blank=True, null=True)),
+                ('button_text', models.CharField(default='Register', max_length=50)),
+                ('created_at', models.DateTimeField()),
+                ('updated_at', models.DateTimeField()),
+                ('sources', models.JSONField(blank=True, default=list)),
+                ('archived_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['registration_end', 'id'], name='archived_reg_end_idx'), models.Index(fields=['registration_start', 'id'], name='archived_reg_start_idx')],
+            },
+        ),
+    ]
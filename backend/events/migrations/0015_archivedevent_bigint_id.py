@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 14:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0014_event_tags'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='archivedevent',
+            name='id',
+            field=models.BigIntegerField(primary_key=True, serialize=False),
+        ),
+    ]
@@ -0,0 +1,56 @@
+from urllib.parse import urlsplit
+
+from django.db import migrations
+
+# Hosts of the sources declared in events.sources when EventSource was added
+CODE_SOURCE_HOSTS = {
+    "reskilll.com": "reskilll",
+    "devfolio.co": "devfolio",
+}
+
+
+def _host(url):
+    host = (urlsplit(url or "").hostname or "").lower()
+    return host[4:] if host.startswith("www.") else host
+
+
+def _source_for(link, hosts):
+    host = _host(link)
+    for source_host, name in hosts.items():
+        if host == source_host or host.endswith("." + source_host):
+            return name
+    return None
+
+
+def backfill_event_sources(apps, schema_editor):
+    """Link events scraped before EventSource existed to the source their link points at.
+
+    Without a source, deduplication cannot tell that two events came from the
+    same site and would merge distinct events on the next scrape.
+    """
+    Event = apps.get_model("events", "Event")
+    EventSource = apps.get_model("events", "EventSource")
+    ScrapeSource = apps.get_model("events", "ScrapeSource")
+
+    hosts = dict(CODE_SOURCE_HOSTS)
+    for name, url in ScrapeSource.objects.values_list("name", "url"):
+        if _host(url):
+            hosts.setdefault(_host(url), name)
+
+    links = []
+    for event in Event.objects.filter(sources__isnull=True).only("id", "title", "link").iterator():
+        source = _source_for(event.link, hosts)
+        if source is not None:
+            links.append(EventSource(event=event, source=source, title=event.title, url=event.link))
+    EventSource.objects.bulk_create(links, batch_size=500, ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0015_archivedevent_bigint_id'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_event_sources, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-19 14:20
+
+import events.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0016_backfill_event_sources'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='scrapesource',
+            name='parser',
+            field=models.CharField(choices=events.models.parser_choices, help_text='Key of a parser registered in events.sources.PARSERS', max_length=50),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-19 14:21
+
+import django.core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0017_scrapesource_parser_choices'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='scrapesource',
+            name='page_concurrency',
+            field=models.PositiveSmallIntegerField(default=1, help_text='Listing pages fetched at once', validators=[django.core.validators.MinValueValidator(1)]),
+        ),
+    ]
@@ -1,3 +1,6 @@
+from datetime import timedelta
+
+from django.core.validators import MinValueValidator
 from django.db import models
 
 class Event(models.Model):
@@ -12,6 +15,237 @@ class Event(models.Model):
     button_text = models.CharField(max_length=50, default="Register")
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    # Packed MinHash signature of title + description, see events.dedupe
+    minhash = models.BinaryField(blank=True, null=True, editable=False)
+
+    class Meta:
+        # Composite (date, id) indexes back the keyset pagination in events.pagination:
+        # the range filter and the ORDER BY both walk the index.
+        indexes = [
+            models.Index(fields=['registration_end', 'id'], name='event_reg_end_idx'),
+            models.Index(fields=['registration_start', 'id'], name='event_reg_start_idx'),
+        ]
+
+    def __str__(self):
+        return self.title
+
+
+class EventSource(models.Model):
+    """A listing site an Event was scraped from.
+
+    Cross-source duplicates are merged into one canonical Event, which keeps
+    one EventSource per site it appears on.
+    """
+    event = models.ForeignKey(Event, on_delete=models.CASCADE, related_name='sources')
+    source = models.CharField(max_length=50)
+    title = models.CharField(max_length=255, help_text="Title as shown on this source")
+    url = models.URLField(blank=True, null=True, max_length=500)
+    first_seen = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['first_seen', 'id']
+        constraints = [models.UniqueConstraint(fields=['event', 'source'], name='unique_event_source')]
+
+    def __str__(self):
+        return f"{self.title} on {self.source}"
+
+
+class Tag(models.Model):
+    """A normalized topic ("ai", "web3", ...) from the vocabulary in events.tagging."""
+    name = models.CharField(max_length=50, unique=True)
+
+    def __str__(self):
+        return self.name
+
+
+class EventTag(models.Model):
+    """Tag assignment for an Event.
+
+    The event reference has no database constraint and is not cascaded, so
+    tags stay in place when events.archival moves the event (with the same
+    id) into ArchivedEvent and ``?tag=`` keeps working over the archive.
+    """
+    event = models.ForeignKey(Event, on_delete=models.DO_NOTHING, db_constraint=False, related_name='event_tags')
+    tag = models.ForeignKey(Tag, on_delete=models.CASCADE, related_name='event_tags')
+
+    class Meta:
+        # Its (tag, event) index serves ?tag= filters; the event FK index serves per-event lookups
+        constraints = [models.UniqueConstraint(fields=['tag', 'event'], name='unique_event_tag')]
+
+    def __str__(self):
+        return f"{self.event_id}: {self.tag_id}"
+
+
+class ArchivedEvent(models.Model):
+    """An Event whose registration closed, moved out of the hot table by events.archival.
+
+    Keeps the original Event id so links and cursors stay valid.
+    """
+    id = models.BigIntegerField(primary_key=True)
+    title = models.CharField(max_length=255, unique=True)
+    description = models.TextField(blank=True, null=True)
+    image_url = models.URLField(blank=True, null=True, max_length=2055)
+    link = models.URLField(blank=True, null=True)
+    registration_start = models.DateTimeField(blank=True, null=True)
+    registration_end = models.DateTimeField(blank=True, null=True)
+    event_url = models.URLField(blank=True, null=True)
+    button_text = models.CharField(max_length=50, default="Register")
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+    # The EventSource rows at archival time, as [{"source", "title", "url"}]
+    sources = models.JSONField(default=list, blank=True)
+    tags = models.JSONField(default=list, blank=True)
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['registration_end', 'id'], name='archived_reg_end_idx'),
+            models.Index(fields=['registration_start', 'id'], name='archived_reg_start_idx'),
+        ]
 
     def __str__(self):
         return self.title
+
+
+def parser_choices():
+    # Imported lazily: events.sources imports this module
+    from .sources import PARSERS
+
+    return [(name, name) for name in sorted(PARSERS)]
+
+
+class ScrapeSource(models.Model):
+    """A listing page the scraper fetches, with its own fetch cadence.
+
+    Sources declared in code (events.sources) are synced into this table so the
+    scheduler only has to look in one place; extra sources can be added in the admin.
+    """
+    name = models.CharField(max_length=50, unique=True)
+    url = models.URLField(max_length=500)
+    parser = models.CharField(max_length=50, choices=parser_choices,
+                              help_text="Key of a parser registered in events.sources.PARSERS")
+    fetch_interval = models.PositiveIntegerField(default=3600, help_text="Seconds between scrapes")
+    timeout = models.PositiveIntegerField(default=10, help_text="HTTP timeout in seconds")
+    priority = models.IntegerField(default=100, help_text="Lower values are scraped first")
+    max_pages = models.PositiveSmallIntegerField(default=1, help_text="Listing pages to follow per scrape")
+    page_concurrency = models.PositiveSmallIntegerField(default=1, validators=[MinValueValidator(1)],
+                                                        help_text="Listing pages fetched at once")
+    enabled = models.BooleanField(default=True)
+    declared_in_code = models.BooleanField(default=False, editable=False)
+    last_scraped_at = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        ordering = ['priority', 'name']
+
+    def is_due(self, now):
+        if not self.enabled:
+            return False
+        if self.last_scraped_at is None:
+            return True
+        return self.last_scraped_at + timedelta(seconds=self.fetch_interval) <= now
+
+    def next_run_at(self):
+        if self.last_scraped_at is None:
+            return None
+        return self.last_scraped_at + timedelta(seconds=self.fetch_interval)
+
+    def __str__(self):
+        return self.name
+
+
+class ScrapeJob(models.Model):
+    """A queued or finished run of the scraper triggered over HTTP."""
+    QUEUED = 'queued'
+    RUNNING = 'running'
+    SUCCEEDED = 'succeeded'
+    FAILED = 'failed'
+    STATUS_CHOICES = [
+        (QUEUED, 'Queued'),
+        (RUNNING, 'Running'),
+        (SUCCEEDED, 'Succeeded'),
+        (FAILED, 'Failed'),
+    ]
+    ACTIVE_SLOT = 'scrape'
+
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=QUEUED)
+    # Set to ACTIVE_SLOT while queued/running and cleared when done; the unique
+    # constraint lets the database reject a second concurrent job on any node.
+    active_slot = models.CharField(max_length=20, unique=True, null=True, blank=True, editable=False)
+    result = models.JSONField(blank=True, null=True)
+    error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(blank=True, null=True)
+    finished_at = models.DateTimeField(blank=True, null=True)
+
+    @property
+    def is_active(self):
+        return self.status in (self.QUEUED, self.RUNNING)
+
+    def __str__(self):
+        return f"Scrape job {self.pk} ({self.status})"
+
+
+class ScrapeRun(models.Model):
+    """One pass of the scraper over a set of sources."""
+    trigger = models.CharField(max_length=20, default='manual')
+    job = models.ForeignKey(ScrapeJob, on_delete=models.SET_NULL, null=True, blank=True, related_name='runs')
+    started_at = models.DateTimeField(auto_now_add=True, db_index=True)
+    finished_at = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        ordering = ['-started_at']
+
+    def summary(self):
+        totals = self.source_runs.aggregate(
+            cards_found=models.Sum('cards_found'),
+            events_created=models.Sum('events_created'),
+            events_updated=models.Sum('events_updated'),
+            events_unchanged=models.Sum('events_unchanged'),
+            duplicates_merged=models.Sum('duplicates_merged'),
+        )
+        return {"run_id": self.pk, **{k: v or 0 for k, v in totals.items()}}
+
+    def __str__(self):
+        return f"Scrape run {self.pk} ({self.trigger})"
+
+
+class ScrapeSourceRun(models.Model):
+    """Fetch/parse/persist metrics for one source within a ScrapeRun."""
+    run = models.ForeignKey(ScrapeRun, on_delete=models.CASCADE, related_name='source_runs')
+    source = models.CharField(max_length=50)
+    url = models.URLField(max_length=500)
+    started_at = models.DateTimeField(auto_now_add=True)
+    fetch_attempts = models.PositiveSmallIntegerField(default=0)
+    fetch_ms = models.FloatField(blank=True, null=True)
+    bytes_downloaded = models.PositiveIntegerField(default=0)
+    parse_ms = models.FloatField(blank=True, null=True)
+    cards_found = models.PositiveIntegerField(default=0)
+    pages_fetched = models.PositiveSmallIntegerField(default=0)
+    events_created = models.PositiveIntegerField(default=0)
+    events_updated = models.PositiveIntegerField(default=0)
+    events_unchanged = models.PositiveIntegerField(default=0)
+    duplicates_merged = models.PositiveIntegerField(default=0)
+    # Key of the fetched page in events.archive; blank if nothing was fetched
+    raw_page_sha256 = models.CharField(max_length=64, blank=True)
+    errors = models.JSONField(default=list, blank=True)
+
+    class Meta:
+        ordering = ['-started_at']
+        indexes = [models.Index(fields=['source', 'started_at'])]
+
+    @property
+    def succeeded(self):
+        return self.fetch_ms is not None and self.parse_ms is not None
+
+    def __str__(self):
+        return f"{self.source} in run {self.run_id}"
+
+
+class SchedulerLock(models.Model):
+    """Leader lease for events.scheduler; only the owner of a live lease runs jobs."""
+    name = models.CharField(max_length=50, unique=True)
+    owner = models.CharField(max_length=100)
+    expires_at = models.DateTimeField()
+
+    def __str__(self):
+        return f"{self.name} held by {self.owner} until {self.expires_at}"
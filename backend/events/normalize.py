@@ -0,0 +1,123 @@
+"""Turn the display strings parsers return into values the Event model can store.
+
+Registration dates arrive as whatever a listing page shows ("01 Mar 2025",
+"Ends: March 15th, 2025", ...). Each source sticks to one format, so the
+parser remembers the format that last worked for a source and tries it
+first; after the first event of a scrape every string costs a single
+``strptime`` instead of a walk through the whole format list.
+"""
+import re
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+from django.conf import settings
+from django.utils import timezone
+
+DATE_FORMATS = (
+    "%d %b %Y",
+    "%d %B %Y",
+    "%b %d, %Y",
+    "%B %d, %Y",
+    "%d %b, %Y",
+    "%d %B, %Y",
+    "%b %d %Y",
+    "%B %d %Y",
+    "%d %b %Y, %I:%M %p",
+    "%d %b %Y %I:%M %p",
+    "%d %b %Y %H:%M",
+    "%b %d, %Y %I:%M %p",
+    "%Y-%m-%d",
+    "%Y-%m-%d %H:%M",
+    "%Y-%m-%dT%H:%M:%S",
+    "%Y-%m-%dT%H:%M:%S.%f",
+    "%d/%m/%Y",
+    "%d-%m-%Y",
+    "%d.%m.%Y",
+)
+
+DATE_FIELDS = ("registration_start", "registration_end")
+
+# "Registration ends:", "Starts on -" and similar labels in front of the date
+_LABEL_RE = re.compile(r"^[^0-9A-Za-z]*(?:[A-Za-z][A-Za-z .]*?)\s*[:\-]\s+(?=\w)")
+_ORDINAL_RE = re.compile(r"(\d)(st|nd|rd|th)\b", re.IGNORECASE)
+_SPACE_RE = re.compile(r"\s+")
+
+
+def clean_date_string(value):
+    value = _SPACE_RE.sub(" ", value).strip()
+    value = _LABEL_RE.sub("", value)
+    value = _ORDINAL_RE.sub(r"\1", value)
+    # Sept is not a %b abbreviation
+    value = re.sub(r"\bSept\b", "Sep", value)
+    return value.rstrip(".").strip()
+
+
+class RegistrationDateParser:
+    """Parse registration date strings into aware datetimes, learning one format per source."""
+
+    def __init__(self, formats=DATE_FORMATS, tz=None):
+        self.formats = tuple(formats)
+        self.tz = tz
+        self.learned = {}
+        self.strptime_calls = 0
+
+    def _timezone(self):
+        if self.tz is not None:
+            return self.tz
+        name = getattr(settings, "EVENTS_SCRAPE_TIMEZONE", None)
+        return ZoneInfo(name) if name else timezone.get_default_timezone()
+
+    def _try(self, value, fmt):
+        self.strptime_calls += 1
+        try:
+            return datetime.strptime(value, fmt)
+        except ValueError:
+            return None
+
+    def parse(self, value, source=None):
+        """Return an aware datetime for ``value`` or None when no format matches."""
+        if value is None or isinstance(value, datetime):
+            return value
+        cleaned = clean_date_string(str(value))
+        if not cleaned:
+            return None
+
+        parsed = None
+        fmt = self.learned.get(source)
+        if fmt is not None:
+            parsed = self._try(cleaned, fmt)
+        if parsed is None:
+            for candidate in self.formats:
+                if candidate == fmt:
+                    continue
+                parsed = self._try(cleaned, candidate)
+                if parsed is not None:
+                    self.learned[source] = candidate
+                    break
+        if parsed is None:
+            return None
+        return timezone.make_aware(parsed, self._timezone())
+
+    def normalize_events(self, events, source=None):
+        """Replace the date strings of a whole scrape in place.
+
+        Returns the list of raw strings that could not be parsed; those
+        fields are set to None so the row still saves.
+        """
+        unparsed = []
+        for event in events:
+            for field in DATE_FIELDS:
+                raw = event.get(field)
+                value = self.parse(raw, source)
+                if value is None and raw not in (None, ""):
+                    unparsed.append(raw)
+                event[field] = value
+        return unparsed
+
+
+# Shared instance so learned formats survive across scrapes in this process
+date_parser = RegistrationDateParser()
+
+
+def normalize_events(events, source=None):
+    return date_parser.normalize_events(events, source)
@@ -0,0 +1,54 @@
+from bs4 import BeautifulSoup, SoupStrainer
+from bs4.exceptions import FeatureNotFound
+from django.conf import settings
+
+
+# name -> (bs4 tree builder, build only the card subtrees?)
+BACKENDS = {
+    "html.parser": ("html.parser", False),
+    "lxml": ("lxml", False),
+    "strainer": ("html.parser", True),
+    "lxml-strainer": ("lxml", True),
+}
+
+DEFAULT_BACKEND = "lxml-strainer"
+
+
+def get_backend(name=None):
+    """Resolve a backend name, falling back to the pure-Python builder when lxml is missing."""
+    name = name or getattr(settings, "EVENTS_PARSER_BACKEND", DEFAULT_BACKEND)
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown parser backend '{name}'. Choose from: {', '.join(BACKENDS)}")
+    features, strain = BACKENDS[name]
+    if features == "lxml" and not lxml_available():
+        features = "html.parser"
+    return features, strain
+
+
+def lxml_available():
+    try:
+        import lxml  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def _has_class(card_class):
+    # The strainer sees the raw attribute value while parsing, so match on the
+    # whitespace-split tokens rather than relying on multi-valued class handling.
+    return lambda value: bool(value) and card_class in value.split()
+
+
+def make_soup(html_content, card_tag, card_class, backend=None):
+    """Build a soup for a listing page.
+
+    Strainer backends only build the ``card_tag.card_class`` subtrees, so the
+    cards are the top-level children of the returned soup and navigation,
+    scripts and footers are never materialised.
+    """
+    features, strain = get_backend(backend)
+    parse_only = SoupStrainer(card_tag, class_=_has_class(card_class)) if strain else None
+    try:
+        return BeautifulSoup(html_content, features, parse_only=parse_only)
+    except FeatureNotFound:
+        return BeautifulSoup(html_content, "html.parser", parse_only=parse_only)
@@ -1,13 +1,18 @@
-from bs4 import BeautifulSoup
+import json
 from urllib.parse import urljoin
 
+from django.utils.dateparse import parse_datetime
+from django.utils.timezone import is_aware
 
-def parse_devfolio(html_content, base_url):
+from .backends import make_soup
+
+
+def parse_devfolio(html_content, base_url, backend=None):
     """Minimal parser for Devfolio listing pages. Returns normalized event dicts.
     This is intentionally conservative; Devfolio markup varies and should be extended
     with concrete samples later.
     """
-    soup = BeautifulSoup(html_content, "html.parser")
+    soup = make_soup(html_content, "a", "project-card-link", backend=backend)
     # Try to locate project / event cards; this selector may need refinement
     cards = soup.find_all("a", class_="project-card-link") or []
     events = []
@@ -22,6 +27,48 @@ def parse_devfolio(html_content, base_url):
             "image_url": None,
             "registration_start": None,
             "registration_end": None,
-            "_raw_snippet": str(c)[:200],
         })
     return events
+
+
+def parse_devfolio_api(json_content, base_url):
+    """Parse a page of Devfolio's infinite-scroll JSON listing.
+
+    Accepts the common response shapes (``hits``/``results``/``data`` lists,
+    optionally Elasticsearch-style ``_source`` wrappers). As with the HTML
+    parser, extend this once concrete responses are captured.
+    """
+    payload = json.loads(json_content)
+    if isinstance(payload, dict):
+        items = payload.get("hits") or payload.get("results") or payload.get("data") or []
+        if isinstance(items, dict):
+            items = items.get("hits") or []
+    else:
+        items = payload
+    events = []
+    for item in items:
+        item = item.get("_source", item)
+        title = item.get("name") or item.get("title")
+        if not title:
+            continue
+        slug = item.get("slug")
+        link = item.get("url") or (f"https://{slug}.devfolio.co/" if slug else base_url)
+        events.append({
+            "title": title.strip(),
+            "link": link,
+            "description": item.get("tagline") or item.get("description") or "",
+            "image_url": item.get("cover_img") or item.get("image"),
+            "registration_start": _datetime(item.get("starts_at")),
+            "registration_end": _datetime(item.get("ends_at")),
+        })
+    return events
+
+
+def _datetime(value):
+    # ISO timestamps with an offset parse straight to aware datetimes;
+    # anything else is left for events.normalize to handle
+    try:
+        parsed = parse_datetime(value) if isinstance(value, str) else None
+    except ValueError:
+        parsed = None
+    return parsed if parsed is not None and is_aware(parsed) else value
@@ -0,0 +1,37 @@
+"""URL generators for listing pages after the first one.
+
+A pager takes the source URL and yields the URLs of the following pages
+in order. They are open-ended; the crawler stops on its own (empty page,
+page with nothing new, repeated page or the source's max_pages).
+"""
+from itertools import count
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+
+def with_query(url, **params):
+    parts = urlsplit(url)
+    query = dict(parse_qsl(parts.query, keep_blank_values=True))
+    query.update({key: str(value) for key, value in params.items()})
+    return urlunsplit(parts._replace(query=urlencode(query)))
+
+
+def numbered_pages(param="page", start=2):
+    """?page=2, ?page=3, ... on the listing URL itself."""
+    def pages(url):
+        for number in count(start):
+            yield with_query(url, **{param: number})
+    return pages
+
+
+def offset_pages(endpoint, page_size, offset_param="offset", size_param="limit", start=None):
+    """Infinite-scroll JSON endpoint paged by offset.
+
+    The first listing page is HTML and already holds ``page_size`` items, so
+    the JSON pages start at that offset unless ``start`` says otherwise.
+    """
+    first = page_size if start is None else start
+
+    def pages(url):
+        for offset in count(first, page_size):
+            yield with_query(endpoint, **{offset_param: offset, size_param: page_size})
+    return pages
@@ -1,10 +1,32 @@
-from bs4 import BeautifulSoup
 from urllib.parse import urljoin
 
+from .backends import make_soup
 
-def parse_reskilll(html_content, base_url):
+TITLE_CLASS = "allhackname eventName text-decoration-none"
+
+
+def _extract_card(card):
+    """Collect the tags we need from one card in a single walk of its subtree."""
+    title_tag = image_tag = description_tag = None
+    registration_dates = []
+    for tag in card.find_all(["a", "img", "div"]):
+        classes = tag.get("class") or []
+        if tag.name == "a":
+            if title_tag is None and " ".join(classes) == TITLE_CLASS:
+                title_tag = tag
+        elif tag.name == "img":
+            if image_tag is None and "allhacksbanner" in classes:
+                image_tag = tag
+        elif "hackresgiterdate" in classes:
+            registration_dates.append(tag)
+        elif description_tag is None and "eventDescription" in classes:
+            description_tag = tag
+    return title_tag, image_tag, description_tag, registration_dates
+
+
+def parse_reskilll(html_content, base_url, backend=None):
     """Parse events from reskilll.com and return normalized event dicts."""
-    soup = BeautifulSoup(html_content, "html.parser")
+    soup = make_soup(html_content, "div", "hackathonCard", backend=backend)
     event_list = soup.find_all("div", class_="hackathonCard")
 
     if not event_list:
@@ -12,16 +34,12 @@ def parse_reskilll(html_content, base_url):
 
     events = []
     for card in event_list:
-        title_tag = card.find("a", class_="allhackname eventName text-decoration-none")
-        title = title_tag.get_text(strip=True) if title_tag else "No title found"
+        title_tag, image_tag, description_tag, registration_dates = _extract_card(card)
 
-        image_tag = card.find("img", class_="allhacksbanner")
+        title = title_tag.get_text(strip=True) if title_tag else "No title found"
         image_url = urljoin(base_url, image_tag["src"]) if image_tag and "src" in image_tag.attrs else None
-
-        description_tag = card.find("div", class_="eventDescription")
         description = description_tag.get_text(strip=True) if description_tag else ""
 
-        registration_dates = card.find_all("div", class_="hackresgiterdate")
         registration_start = registration_dates[0].get_text(strip=True) if len(registration_dates) > 0 else None
         registration_end = registration_dates[1].get_text(strip=True) if len(registration_dates) > 1 else None
 
@@ -34,7 +52,6 @@ def parse_reskilll(html_content, base_url):
             "registration_start": registration_start,
             "registration_end": registration_end,
             "link": event_url,
-            "_raw_snippet": str(card)[:200],
         })
 
     return events
@@ -0,0 +1,98 @@
+"""Registration-window filters shared by the JSON and HTML event lists."""
+from datetime import timedelta
+
+from django.db.models import Q
+from django.utils import timezone
+
+ORDERINGS = ("-id", "id", "registration_end", "-registration_end", "registration_start", "-registration_start")
+
+# mode -> ordering that keeps the filter and the sort on the same index
+MODE_ORDERINGS = {
+    "open": "registration_end",
+    "closing_soon": "registration_end",
+    "upcoming": "registration_start",
+}
+
+DEFAULT_CLOSING_SOON_DAYS = 7
+MAX_CLOSING_SOON_DAYS = 365
+
+INCLUDE_VALUES = ("archived",)
+
+
+def filter_events(queryset, params, now=None):
+    """Apply ``?status=``, ``?tag=`` and ``?ordering=`` from ``params``.
+
+    Returns ``(queryset, ordering)``. Raises ValueError for unknown values.
+
+    * ``status=open``: registration has started (or has no start date) and has not ended
+    * ``status=closing_soon``: registration ends within ``?within=`` days (default 7)
+    * ``status=upcoming``: registration has not started yet
+    * ``tag=ai``: tagged with that topic; repeat ``tag`` to require several
+    """
+    now = now or timezone.now()
+    mode = params.get("status")
+    if mode and mode not in MODE_ORDERINGS:
+        raise ValueError(f"status must be one of: {', '.join(MODE_ORDERINGS)}")
+
+    if mode in ("open", "closing_soon"):
+        queryset = queryset.filter(registration_end__gte=now).filter(
+            Q(registration_start__lte=now) | Q(registration_start__isnull=True)
+        )
+        if mode == "closing_soon":
+            try:
+                days = float(params.get("within", DEFAULT_CLOSING_SOON_DAYS))
+            except ValueError:
+                raise ValueError("within must be a number of days")
+            # Also rejects nan and inf, which fail every comparison
+            if not 0 <= days <= MAX_CLOSING_SOON_DAYS:
+                raise ValueError(f"within must be between 0 and {MAX_CLOSING_SOON_DAYS} days")
+            queryset = queryset.filter(registration_end__lte=now + timedelta(days=days))
+    elif mode == "upcoming":
+        queryset = queryset.filter(registration_start__gt=now)
+
+    # QueryDict params carry repeated keys; plain dicts hold a single value
+    tags = params.getlist("tag") if hasattr(params, "getlist") else [params.get("tag")]
+    queryset = filter_tags(queryset, [tag for tag in tags if tag])
+
+    ordering = params.get("ordering") or MODE_ORDERINGS.get(mode, "-id")
+    if ordering not in ORDERINGS:
+        raise ValueError(f"ordering must be one of: {', '.join(ORDERINGS)}")
+    return queryset, ordering
+
+
+def filter_tags(queryset, tags):
+    """Keep events carrying every tag in ``tags``. Raises ValueError for unknown tags.
+
+    Matches by event id through the EventTag index, so the same filter
+    applies to Event and ArchivedEvent querysets.
+    """
+    from .models import EventTag
+    from .tagging import VOCABULARY
+
+    for tag in dict.fromkeys(tags):
+        if tag not in VOCABULARY:
+            raise ValueError(f"tag must be one of: {', '.join(VOCABULARY)}")
+        queryset = queryset.filter(id__in=EventTag.objects.filter(tag__name=tag).values("event_id"))
+    return queryset
+
+
+def wants_archived(params):
+    """True for ``?include=archived``; the archive table is skipped otherwise."""
+    include = params.get("include")
+    if include and include not in INCLUDE_VALUES:
+        raise ValueError(f"include must be one of: {', '.join(INCLUDE_VALUES)}")
+    return include == "archived"
+
+
+def listed_events(hot_queryset, params, now=None):
+    """Filter the hot events and, for ``?include=archived``, the archive too.
+
+    Returns ``(queryset or [hot, archived], ordering)`` ready for keyset_paginate.
+    """
+    from .models import ArchivedEvent
+
+    queryset, ordering = filter_events(hot_queryset, params, now)
+    if wants_archived(params):
+        archived, _ = filter_events(ArchivedEvent.objects.all(), params, now)
+        queryset = [queryset, archived]
+    return queryset, ordering
@@ -0,0 +1,153 @@
+"""Broker-free periodic job scheduler.
+
+``manage.py run_scheduler`` runs a loop that fires the jobs registered here
+on their intervals, each with random jitter so nodes and jobs do not line
+up. Any number of app nodes may run the command. They share one leader
+lease (SchedulerLock); only the node holding a live lease runs jobs, and
+another node takes over once it expires. No Celery or other broker is needed.
+"""
+import logging
+import os
+import random
+import socket
+import time
+import uuid
+from dataclasses import dataclass
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, close_old_connections, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import SchedulerLock
+
+logger = logging.getLogger(__name__)
+
+LOCK_NAME = "events-scheduler"
+DEFAULT_LOCK_TTL = 15 * 60
+DEFAULT_JITTER = 0.1
+
+
+@dataclass
+class PeriodicJob:
+    name: str
+    func: object
+    interval: float  # seconds
+    jitter: float = DEFAULT_JITTER  # fraction of the interval
+
+    def delay(self, rng):
+        spread = self.interval * self.jitter
+        return max(1.0, self.interval + rng.uniform(-spread, spread))
+
+
+JOBS = {}
+
+
+def register_job(name, func, interval, jitter=DEFAULT_JITTER):
+    JOBS[name] = PeriodicJob(name, func, interval, jitter)
+    return func
+
+
+def _lock_ttl():
+    return timedelta(seconds=getattr(settings, "EVENTS_SCHEDULER_LOCK_TTL", DEFAULT_LOCK_TTL))
+
+
+class Scheduler:
+    """Runs registered jobs while holding the leader lease.
+
+    The lease TTL must outlast the longest job, since it is renewed between
+    jobs rather than during them.
+    """
+
+    def __init__(self, jobs=None, owner=None, rng=None):
+        self.jobs = dict(JOBS if jobs is None else jobs)
+        self.owner = owner or f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self.rng = rng or random.Random()
+        self.next_runs = {}
+
+    def acquire(self, now=None):
+        """Take or renew the leader lease; returns True if this scheduler holds it."""
+        now = now or timezone.now()
+        expires_at = now + _lock_ttl()
+        renewed = SchedulerLock.objects.filter(name=LOCK_NAME).filter(
+            Q(owner=self.owner) | Q(expires_at__lte=now)
+        ).update(owner=self.owner, expires_at=expires_at)
+        if renewed:
+            return True
+        try:
+            with transaction.atomic():
+                SchedulerLock.objects.create(name=LOCK_NAME, owner=self.owner, expires_at=expires_at)
+        except IntegrityError:
+            return False
+        return True
+
+    def release(self):
+        SchedulerLock.objects.filter(name=LOCK_NAME, owner=self.owner).delete()
+
+    def tick(self, now=None, force=False):
+        """Run every due job (every job with ``force``) if we are the leader.
+
+        Returns the names of the jobs run.
+        """
+        now = now or timezone.now()
+        if not self.acquire(now):
+            # Followers forget their schedule so a takeover starts with a fresh, jittered one
+            self.next_runs.clear()
+            return []
+        ran = []
+        for job in self.jobs.values():
+            if job.name not in self.next_runs:
+                # Spread the first runs out instead of firing everything at start-up
+                self.next_runs[job.name] = now + timedelta(seconds=self.rng.uniform(0, job.interval * job.jitter))
+            if self.next_runs[job.name] > now and not force:
+                continue
+            self._run(job)
+            ran.append(job.name)
+            self.next_runs[job.name] = timezone.now() + timedelta(seconds=job.delay(self.rng))
+        return ran
+
+    def _run(self, job):
+        started = time.perf_counter()
+        try:
+            job.func()
+            logger.info(f"Scheduled job {job.name} finished in {time.perf_counter() - started:.1f}s")
+        except Exception as e:
+            logger.error(f"Scheduled job {job.name} failed: {e}", exc_info=True)
+        finally:
+            close_old_connections()
+
+    def seconds_until_next(self, now=None):
+        now = now or timezone.now()
+        if not self.next_runs:
+            return None
+        return max(0.0, (min(self.next_runs.values()) - now).total_seconds())
+
+    def run_forever(self, max_sleep=60):
+        """Tick until interrupted, sleeping until the next job (at most ``max_sleep`` seconds)."""
+        try:
+            while True:
+                self.tick()
+                wait = self.seconds_until_next()
+                time.sleep(max_sleep if wait is None else min(max(wait, 1), max_sleep))
+        finally:
+            self.release()
+
+
+def _scrape_due_sources():
+    from .jobs import run_scheduled_scrape
+
+    run_scheduled_scrape()
+
+
+# Sources keep their own fetch intervals; this only decides how often to check them
+register_job("scrape", _scrape_due_sources, interval=60)
+
+
+def _archive_expired_events():
+    from .archival import archive_expired_events
+
+    archive_expired_events()
+
+
+register_job("archive_events", _archive_expired_events, interval=60 * 60)
@@ -1,110 +1,350 @@
 import requests
 import json
 import time
-import schedule
+from collections import deque, namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
 from bs4 import BeautifulSoup
 from urllib.parse import urljoin
-from .models import Event
+from .models import ArchivedEvent, Event, EventSource, ScrapeRun, ScrapeSource, ScrapeSourceRun
+from django.conf import settings
 from django.db import IntegrityError
-from django.http import JsonResponse
-from rest_framework.decorators import api_view
+from django.utils import timezone
 
-# Import site-specific parsers
-from .parsers.reskilll import parse_reskilll
-from .parsers.devfolio import parse_devfolio
+# Source definitions and their site-specific parsers live in the registry
+from .sources import get_sources, get_parser, get_pagination, due_sources
+from .normalize import normalize_events
+from .cache import batch_version_bump
+from .dedupe import EventDeduplicator, pack, signature
+from . import archive, fetch, images
+from .cassette import CassetteMiss
+from .stream import publish_event_changes
+from .tagging import EventTagger
 
-def scrape_events():
-    """Scrape events from reskilll.com and devfolio.co and save to database
-    Returns a list of normalized event dicts. Keeps raw_html for debugging.
+HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36 Edg/120.0.0.0"
+}
+# Pages downloaded ahead of the one being parsed/saved; bounds memory held in HTML
+DEFAULT_PREFETCH = 2
+
+
+def scrape_events(sources=None, run=None):
+    """Scrape events from the registered sources and save to database.
+
+    `sources` defaults to every enabled source; pass due_sources() to honour
+    each source's fetch interval. Per-source metrics are recorded on `run`
+    (a ScrapeRun, created if not given), and its totals are returned.
+    Fetched pages are kept in the raw-page archive (events.archive) for debugging.
     """
-    websites = [
-        "https://reskilll.com/allhacks",
-        "https://devfolio.co/explore",  # placeholder devfolio listing page
-    ]
-    headers = {
-        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36 Edg/120.0.0.0"
-    }
+    if run is None:
+        run = ScrapeRun.objects.create()
+    created_count = saved_count = 0
+    for event_data in iter_scrape(sources, run):
+        saved_count += 1
+        created_count += event_data["newly_created"]
+    print(f"✅ Found {saved_count} events. Created {created_count} new events.")
+    return run.summary()
+
+
+def iter_scrape(sources=None, run=None):
+    """Run the scrape as a pipeline and yield each event dict once it is saved.
+
+    fetch -> parse -> normalize -> dedupe/persist. Pages are downloaded in
+    worker threads at most EVENTS_SCRAPE_PREFETCH sources ahead, so the first
+    source is being saved while later ones are still downloading, and only a
+    bounded number of pages is held in memory at any time. All database work
+    stays on the calling thread. Sources are persisted in priority order, so
+    the higher-priority source keeps ownership of merged duplicates.
+    """
+    if sources is None:
+        sources = get_sources()
+    if run is None:
+        run = ScrapeRun.objects.create()
+    sources = _with_known_parser(sources, run)
+    prefetch = max(1, getattr(settings, "EVENTS_SCRAPE_PREFETCH", DEFAULT_PREFETCH))
 
-    all_events = []
-    created_count = 0
+    # Signatures of stored events, bucketed for near-duplicate lookups
+    dedupe = EventDeduplicator()
+    changes = []
 
-    for url in websites:
-        attempt = 0
-        response = None
-        while attempt < 3:
+    # One events-version bump for the whole scrape instead of one per saved row
+    with batch_version_bump(), ThreadPoolExecutor(max_workers=prefetch) as pool:
+        for source, metrics, fetched in _fetched_pages(pool, sources, run, prefetch):
             try:
-                response = requests.get(url, headers=headers, timeout=10)
-                response.raise_for_status()
-                break
-            except requests.RequestException as e:
-                attempt += 1
-                print(f"Attempt {attempt} failed for {url}: {e}")
-                time.sleep(1 + attempt)
+                _record_fetch(metrics, fetched)
+                if fetched.response is None:
+                    print(f"Giving up scraping {source.url} after retries.")
+                    continue
+                print(f"Scraping: {source.url}")
+                for saved in _crawl(source, metrics, fetched.response, dedupe):
+                    if saved["outcome"] != "unchanged":
+                        changes.append((saved["id"], saved["outcome"]))
+                    yield saved
+            finally:
+                metrics.save()
+
+        # Re-tag what changed before it is pushed, so stream payloads carry the new tags,
+        # and before the version bump, so no cached page holds the untagged events
+        EventTagger().sync(event_id for event_id, _ in changes)
+
+    # Push what changed to connected stream clients once the writes are committed
+    publish_event_changes(changes)
+
+    # Keep the banner cache and the page archive within their budgets
+    images.evict()
+    archive.prune()
+
+    run.finished_at = timezone.now()
+    run.save(update_fields=['finished_at'])
+
+
+def _with_known_parser(sources, run):
+    """Drop sources whose parser is not registered, recording the error on ``run``.
 
-        if response is None:
-            print(f"Giving up scraping {url} after retries.")
+    Sources can be edited in the admin; one bad parser key must not abort the
+    whole scrape.
+    """
+    known = []
+    for source in sources:
+        try:
+            get_parser(source.parser)
+        except ValueError as e:
+            print(f"Skipping {source.name}: {e}")
+            ScrapeSourceRun.objects.create(run=run, source=source.name, url=source.url, errors=[str(e)])
             continue
+        known.append(source)
+    return known
+
+
+def _fetched_pages(pool, sources, run, prefetch):
+    """Yield (source, metrics, fetch result) in source order, downloading ahead.
+
+    At most ``prefetch`` downloads are queued or finished-but-unconsumed at once;
+    the next one is submitted only when the caller takes a page.
+    """
+    pending = deque()
+    sources = iter(sources)
+
+    def submit_next():
+        source = next(sources, None)
+        if source is None:
+            return
+        metrics = ScrapeSourceRun(run=run, source=source.name, url=source.url)
+        # Record the attempt up front so a failing source waits for its next slot
+        ScrapeSource.objects.filter(pk=source.pk).update(last_scraped_at=timezone.now())
+        pending.append((source, metrics, pool.submit(_fetch, source.url, source.timeout)))
+
+    for _ in range(prefetch):
+        submit_next()
+    while pending:
+        source, metrics, future = pending.popleft()
+        fetched = future.result()
+        submit_next()
+        yield source, metrics, fetched
+
+
+def _crawl(source, metrics, first_response, dedupe):
+    """Persist the first listing page, then follow the source's pagination.
+
+    Later pages are fetched up to ``page_concurrency`` at a time and persisted
+    in page order. The crawl stops after ``max_pages``, or at the first page
+    that has no cards, repeats an earlier page, or holds nothing new or changed.
+    """
+    pagination = get_pagination(source.parser)
+    seen = set()
+    changed = yield from _persist_page(source, metrics, first_response, get_parser(source.parser), dedupe, seen)
+    if pagination is None or source.max_pages <= 1 or not changed:
+        return
+
+    pages, page_parser = pagination
+    urls = islice(pages(source.url), source.max_pages - 1)
+    # Rows saved before page_concurrency was validated may still hold 0
+    concurrency = max(1, source.page_concurrency)
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        window = deque(pool.submit(_fetch, url, source.timeout) for url in islice(urls, concurrency))
+        while window:
+            fetched = window.popleft().result()
+            _record_fetch(metrics, fetched)
+            if fetched.response is None:
+                break
+            changed = yield from _persist_page(source, metrics, fetched.response, page_parser, dedupe, seen)
+            if not changed:
+                break
+            url = next(urls, None)
+            if url is not None:
+                window.append(pool.submit(_fetch, url, source.timeout))
+        # Pages already downloading past the stopping point are dropped
+        for future in window:
+            future.cancel()
+
 
-        print(f"Scraping: {url}")
-        html = response.text
+def _persist_page(source, metrics, response, parse, dedupe, seen):
+    """Parse and save one listing page, yielding saved events.
 
-        if "reskilll.com" in url:
-            events = parse_reskilll(html, url)
-        elif "devfolio" in url:
-            events = parse_devfolio(html, url)
+    Returns True when the page had events and at least one was new or changed.
+    """
+    digest = archive.store(response.content)
+    if digest in seen:
+        return False
+    seen.add(digest)
+    metrics.pages_fetched += 1
+    metrics.bytes_downloaded += len(response.content)
+    metrics.raw_page_sha256 = metrics.raw_page_sha256 or digest
+
+    events = _parse_page(source, metrics, response.text, parse)
+    before = metrics.events_created + metrics.events_updated
+    for event_data in events:
+        saved = _persist(event_data, source, metrics, dedupe)
+        if saved is not None:
+            yield saved
+    return bool(events) and metrics.events_created + metrics.events_updated > before
+
+
+FetchResult = namedtuple("FetchResult", "response attempts fetch_ms errors")
+
+
+def _fetch(url, timeout):
+    """Download a page with retries. Runs in a worker thread; no database access."""
+    errors = []
+    for attempt in range(1, 4):
+        started = time.perf_counter()
+        try:
+            response = fetch.get(url, headers=HEADERS, timeout=timeout)
+            response.raise_for_status()
+            return FetchResult(response, attempt, (time.perf_counter() - started) * 1000, errors)
+        except requests.RequestException as e:
+            print(f"Attempt {attempt} failed for {url}: {e}")
+            errors.append(f"fetch attempt {attempt} ({url}): {e}")
+            if isinstance(e, CassetteMiss):
+                return FetchResult(None, attempt, None, errors)
+            time.sleep(1 + attempt)
+    return FetchResult(None, 3, None, errors)
+
+
+def _record_fetch(metrics, fetched):
+    metrics.fetch_attempts += fetched.attempts
+    metrics.errors.extend(fetched.errors)
+    if fetched.fetch_ms is not None:
+        metrics.fetch_ms = (metrics.fetch_ms or 0) + fetched.fetch_ms
+
+
+def _parse_page(source, metrics, html, parse):
+    """Parse and normalize one fetched page; returns its event dicts."""
+    started = time.perf_counter()
+    try:
+        events = parse(html, source.url)
+    except Exception as e:
+        metrics.errors.append(f"parse: {e}")
+        return []
+    metrics.parse_ms = (metrics.parse_ms or 0) + (time.perf_counter() - started) * 1000
+    metrics.cards_found += len(events)
+
+    # Display strings -> aware datetimes, one strptime per string once the format is learned
+    for raw in normalize_events(events, source.name):
+        metrics.errors.append(f"unparsed date '{raw}'")
+    return events
+
+
+def _persist(event_data, source, metrics, dedupe):
+    """Save one event, update the source metrics, and return the result dict (None on failure)."""
+    try:
+        event, outcome, merged = _save_event(event_data, source.url, source.name, dedupe)
+    except IntegrityError as e:
+        print(f"❌ Could not save event {event_data.get('title')}: {e}")
+        metrics.errors.append(f"save '{event_data.get('title')}': {e}")
+        return None
+    setattr(metrics, f"events_{outcome}", getattr(metrics, f"events_{outcome}") + 1)
+    if merged:
+        metrics.duplicates_merged += 1
+    _cache_banner(event, source, metrics)
+
+    # Add database ID and creation status
+    event_data["id"] = event.id
+    event_data["newly_created"] = outcome == "created"
+    event_data["outcome"] = outcome
+    return event_data
+
+
+def _cache_banner(event, source, metrics):
+    """Store resized copies of the event's banner so the API can serve them locally."""
+    if not event.image_url or images.is_cached(event.image_url):
+        return
+    try:
+        images.cache_image(event.image_url, timeout=source.timeout)
+    except images.ImageCacheError as e:
+        metrics.errors.append(f"image: {e}")
+
+
+def _save_event(event_data, url, source, dedupe):
+    """Create or update the Event for a scraped dict.
+
+    Returns (event, outcome, merged) where outcome is "created", "updated" or
+    "unchanged"; unchanged rows are not written at all. When the event turns
+    out to be a cross-source duplicate (same title, or a near-duplicate found
+    by the MinHash index) it is merged into the existing canonical event:
+    only fields that are still blank there are filled in, and the source is
+    linked to it. An event that has already been archived is left in the
+    archive, with its id, and reported as unchanged.
+    """
+    defaults = {
+        'description': event_data.get("description"),
+        'image_url': event_data.get("image_url"),
+        'link': event_data.get("link") or url,
+        'event_url': event_data.get("link"),
+        'registration_start': event_data.get("registration_start"),
+        'registration_end': event_data.get("registration_end"),
+    }
+    sig = signature(event_data["title"], defaults['description'])
+    event = Event.objects.filter(title=event_data["title"]).first()
+    if event is None:
+        # Closed events often stay listed on their source after being archived
+        archived = ArchivedEvent.objects.filter(title=event_data["title"]).first()
+        if archived is not None:
+            return archived, "unchanged", False
+        canonical_id = (dedupe.linked_event(source, event_data["title"])
+                        or dedupe.find_canonical(event_data, source, sig))
+        if canonical_id is not None:
+            event = Event.objects.filter(pk=canonical_id).first()
+
+    if event is None:
+        event = Event.objects.create(title=event_data["title"], minhash=pack(sig), **defaults)
+        outcome, merged = "created", False
+    else:
+        owner = dedupe.owners.get(event.pk)
+        merged = owner is not None and owner != source
+        if merged:
+            changed = [field for field, value in defaults.items()
+                       if value not in (None, "") and getattr(event, field) in (None, "")]
         else:
-            events = []
+            changed = [field for field, value in defaults.items() if getattr(event, field) != value]
+        for field in changed:
+            setattr(event, field, defaults[field])
+        if not merged and bytes(event.minhash or b"") != pack(sig):
+            event.minhash = pack(sig)
+            changed.append('minhash')
+        if changed:
+            event.save(update_fields=changed + ['updated_at'])
+        outcome = "updated" if changed else "unchanged"
+
+    if source not in dedupe.sources[event.pk]:
+        EventSource.objects.get_or_create(
+            event=event, source=source,
+            defaults={'title': event_data["title"], 'url': event_data.get("link") or url},
+        )
+    dedupe.record(event.pk, event.title, source, event_data["title"], sig)
+    return event, outcome, merged
+
+
+def scrape_due_sources():
+    """Scrape only the sources whose fetch interval has elapsed.
+
+    For periodic scraping run ``manage.py run_scheduler`` (events.scheduler).
+    """
+    return scrape_events(due_sources())
+
+
+# parse_reskilll and parse_devfolio are implemented in parsers/ and registered in sources.py
 
-        # Save events to database
-        for event_data in events:
-            try:
-                event, created = Event.objects.update_or_create(
-                    title=event_data["title"],
-                    defaults={
-                        'description': event_data.get("description"),
-                        'image_url': event_data.get("image_url"),
-                        'link': event_data.get("link") or url,
-                        'event_url': event_data.get("link"),
-                        'registration_start': event_data.get("registration_start"),
-                        'registration_end': event_data.get("registration_end"),
-                    }
-                )
-                if created:
-                    created_count += 1
-
-                # Add to response list with database ID and creation status
-                event_data["id"] = event.id
-                event_data["newly_created"] = created
-                # keep raw html snippet for debugging (optional)
-                event_data["_raw_snippet"] = event_data.get("_raw_snippet")
-                all_events.append(event_data)
-            except IntegrityError as e:
-                print(f"❌ Could not save event {event_data.get('title')}: {e}")
-
-    print(f"✅ Found {len(all_events)} events. Created {created_count} new events.")
-    return all_events
-
-
-# parse_reskilll and parse_devfolio are implemented in parsers/ to keep scraper small
-
-
-@api_view(['GET'])
-def run_scraper(request):
-    """Endpoint to trigger the scraper and return the latest events"""
-    # Run the scraper and save to database
-    events = scrape_events()
-    
-    # Count how many events have newly created=True
-    new_event_count = sum(1 for event in events if event.get('newly_created', False))
-    
-    # Return the scraped events with count info
-    return JsonResponse({
-        "status": 200,
-        "message": f"Successfully scraped {len(events)} events. Found {new_event_count} new events!",
-        "events": events,
-        "new_event_count": new_event_count,
-        "total_event_count": len(events)
-    })
 
 # Run Scraper
 if __name__ == "__main__":
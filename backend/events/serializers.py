@@ -1,13 +1,87 @@
+from urllib.parse import urljoin
+
+from django.urls import reverse
 from rest_framework import serializers
-from .models import Event
+from . import images
+from .models import ArchivedEvent, Event, EventSource, ScrapeRun, ScrapeSourceRun
+
+
+class EventSourceSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = EventSource
+        fields = ('source', 'title', 'url')
+
 
 class EventSerializer(serializers.ModelSerializer):
+    # Every listing site this (possibly merged) event was found on
+    sources = EventSourceSerializer(many=True, read_only=True)
+    tags = serializers.SerializerMethodField()
+
     class Meta:
         model = Event
-        fields = '__all__'
+        exclude = ('minhash',)
+
+    def to_representation(self, instance):
+        data = super().to_representation(instance)
+        data['archived'] = isinstance(instance, ArchivedEvent)
+        # Point cached banners at the local resize proxy instead of the remote CDN
+        original = data.get('image_url')
+        data['image_original_url'] = original
+        if original and images.is_cached(original):
+            key = images.image_key(original)
+            data['image_url'] = self._absolute(reverse('event-image', args=[key, images.DEFAULT_VARIANT]))
+            data['image_variants'] = {
+                variant: self._absolute(reverse('event-image', args=[key, variant]))
+                for variant in images.VARIANTS
+            }
+        return data
+
+    def get_tags(self, instance):
+        return sorted(event_tag.tag.name for event_tag in instance.event_tags.all())
+
+    def _absolute(self, path):
+        request = self.context.get('request')
+        if request:
+            return request.build_absolute_uri(path)
+        # Serialized outside a request (the event stream): use the configured public origin
+        base_url = self.context.get('base_url')
+        return urljoin(base_url, path) if base_url else path
 
     def validate_title(self, value):
         """Ensure event titles are unique"""
         if Event.objects.filter(title=value).exists():
             raise serializers.ValidationError("An event with this title already exists.")
         return value
+
+
+class ArchivedEventSerializer(EventSerializer):
+    # Snapshot of the EventSource rows taken when the event was archived
+    sources = serializers.JSONField(read_only=True)
+    # Snapshot of the event's tags, for display; ?tag= filters still use EventTag
+    tags = serializers.JSONField(read_only=True)
+
+    class Meta:
+        model = ArchivedEvent
+        fields = '__all__'
+
+
+def serialize_events(rows, context=None):
+    """Serialize a page that may mix hot and archived events."""
+    return [
+        (ArchivedEventSerializer if isinstance(row, ArchivedEvent) else EventSerializer)(row, context=context).data
+        for row in rows
+    ]
+
+
+class ScrapeSourceRunSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = ScrapeSourceRun
+        exclude = ('run',)
+
+
+class ScrapeRunSerializer(serializers.ModelSerializer):
+    source_runs = ScrapeSourceRunSerializer(many=True, read_only=True)
+
+    class Meta:
+        model = ScrapeRun
+        fields = ('id', 'trigger', 'job', 'started_at', 'finished_at', 'source_runs')
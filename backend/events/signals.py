@@ -0,0 +1,12 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .cache import bump_on_commit
+from .models import Event
+
+
+@receiver(post_save, sender=Event)
+@receiver(post_delete, sender=Event)
+def invalidate_events_cache(sender, **kwargs):
+    """Move the events version on so cached API responses are revalidated."""
+    bump_on_commit()
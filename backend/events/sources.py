@@ -0,0 +1,110 @@
+"""Registry of scrape sources and the parsers they use.
+
+Sources can be declared here with ``register_source`` or added as
+``ScrapeSource`` rows in the admin. Code declarations are synced into the
+table by ``sync_code_sources``, which the scheduler and the scrape command
+run once at startup, so both kinds are scheduled the same way without
+rewriting every row on each lookup.
+"""
+from django.utils import timezone
+
+from .models import ScrapeSource
+from .parsers.devfolio import parse_devfolio, parse_devfolio_api
+from .parsers.pagination import numbered_pages, offset_pages
+from .parsers.reskilll import parse_reskilll
+
+# Devfolio's explore page loads further hackathons from this JSON endpoint as you scroll
+DEVFOLIO_API = "https://api.devfolio.co/api/search/hackathons"
+DEVFOLIO_PAGE_SIZE = 12
+
+PARSERS = {}
+PAGINATION = {}
+CODE_SOURCES = {}
+
+
+def register_parser(name, func, pages=None, page_parser=None):
+    """Register a listing parser.
+
+    ``pages`` is a pager from events.parsers.pagination that yields the URLs
+    after the first page; ``page_parser`` parses those pages when they are
+    not in the same format as the first one (e.g. a JSON scroll endpoint).
+    """
+    PARSERS[name] = func
+    if pages is not None:
+        PAGINATION[name] = (pages, page_parser or func)
+    return func
+
+
+def get_parser(name):
+    try:
+        return PARSERS[name]
+    except KeyError:
+        raise ValueError(f"No parser registered under '{name}'")
+
+
+def get_pagination(name):
+    """Return ``(pages, page_parser)`` for a parser, or None if it reads a single page."""
+    return PAGINATION.get(name)
+
+
+def register_source(name, url, parser, fetch_interval=3600, timeout=10, priority=100,
+                    max_pages=1, page_concurrency=1):
+    """Declare a source in code. Fields a developer controls are overwritten on sync;
+    ``enabled`` and ``last_scraped_at`` stay under admin/scheduler control."""
+    CODE_SOURCES[name] = {
+        "url": url,
+        "parser": parser,
+        "fetch_interval": fetch_interval,
+        "timeout": timeout,
+        "priority": priority,
+        "max_pages": max_pages,
+        "page_concurrency": page_concurrency,
+    }
+
+
+def sync_code_sources():
+    """Write the sources declared in code into the ScrapeSource table."""
+    for name, definition in CODE_SOURCES.items():
+        ScrapeSource.objects.update_or_create(
+            name=name, defaults=dict(definition, declared_in_code=True)
+        )
+
+
+def get_sources(names=None):
+    """Return enabled sources ordered by priority, optionally limited to ``names``."""
+    qs = ScrapeSource.objects.filter(enabled=True)
+    if names:
+        qs = qs.filter(name__in=names)
+    return list(qs.order_by('priority', 'name'))
+
+
+def due_sources(now=None):
+    """Sources whose fetch interval has elapsed since their last scrape."""
+    now = now or timezone.now()
+    return [source for source in get_sources() if source.is_due(now)]
+
+
+def seconds_until_next_due(now=None):
+    """How long a scheduler loop can sleep before some source becomes due."""
+    now = now or timezone.now()
+    waits = []
+    for source in get_sources():
+        next_run = source.next_run_at()
+        if next_run is None:
+            return 0
+        waits.append(max(0, (next_run - now).total_seconds()))
+    return min(waits) if waits else None
+
+
+register_parser("reskilll", parse_reskilll, pages=numbered_pages("page"))
+register_parser(
+    "devfolio", parse_devfolio,
+    pages=offset_pages(DEVFOLIO_API, page_size=DEVFOLIO_PAGE_SIZE, offset_param="from", size_param="size"),
+    page_parser=parse_devfolio_api,
+)
+
+register_source("reskilll", "https://reskilll.com/allhacks", "reskilll", fetch_interval=30 * 60, priority=10,
+                max_pages=10, page_concurrency=3)
+# placeholder devfolio listing page
+register_source("devfolio", "https://devfolio.co/explore", "devfolio", fetch_interval=2 * 60 * 60, priority=20,
+                max_pages=5, page_concurrency=2)
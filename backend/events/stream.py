@@ -0,0 +1,196 @@
+"""In-process fan-out of event changes to server-sent-event clients.
+
+The scraper publishes the events it created or changed once its writes
+have committed. Each message is serialized and framed once, then handed
+to every connected stream. Connections are plain asyncio queues on the
+ASGI event loop, so thousands of idle clients cost a queue each and no
+thread.
+
+Publishing reaches only clients connected to the same process. Scrapes
+started over HTTP run inside the web process, so their changes are
+pushed. For changes made elsewhere (the scheduler command, other
+workers, admin edits) a watcher thread polls the shared events version
+while streams are open and sends them a resync message when it moves
+without a local publish.
+"""
+import asyncio
+import json
+import logging
+import threading
+import time
+from collections import deque
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import close_old_connections, transaction
+
+from .cache import get_events_version
+
+logger = logging.getLogger(__name__)
+
+# Frames kept for clients reconnecting with Last-Event-ID
+REPLAY_SIZE = 256
+# Frames a slow client may fall behind before its backlog is replaced by a resync message
+QUEUE_SIZE = 100
+KEEPALIVE_SECONDS = 15
+RETRY_MS = 5000
+# How often open streams check the shared events version for changes made by other processes
+VERSION_POLL_SECONDS = 10
+
+RESYNC = b"event: resync\ndata: {}\n\n"
+
+
+class Broadcaster:
+    def __init__(self, replay_size=REPLAY_SIZE, queue_size=QUEUE_SIZE, version_poll=VERSION_POLL_SECONDS):
+        self.queue_size = queue_size
+        self.version_poll = version_poll
+        self._lock = threading.Lock()
+        self._watcher = None
+        # Events version already covered by frames published from this process
+        self._published_version = None
+        self._next_id = 1
+        self._replay = deque(maxlen=replay_size)
+        # event loop -> queues of the streams served on that loop
+        self._loops = {}
+
+    @property
+    def subscriber_count(self):
+        with self._lock:
+            return sum(len(queues) for queues in self._loops.values())
+
+    def subscribe(self, last_event_id=None):
+        """Register a stream on the running loop. Returns ``(queue, backlog)``.
+
+        ``backlog`` holds the frames published after ``last_event_id``, or a
+        single resync frame when that id has already left the replay buffer.
+        """
+        loop = asyncio.get_running_loop()
+        queue = asyncio.Queue(self.queue_size)
+        with self._lock:
+            self._loops.setdefault(loop, set()).add(queue)
+            if self._watcher is None:
+                self._watcher = threading.Thread(target=self._watch_version, daemon=True)
+                self._watcher.start()
+            backlog = []
+            if last_event_id is not None:
+                backlog = [frame for frame_id, frame in self._replay if frame_id > last_event_id]
+                oldest = self._replay[0][0] if self._replay else self._next_id
+                # Missed frames, or ids from before a server restart
+                if last_event_id < oldest - 1 or last_event_id >= self._next_id:
+                    backlog = [RESYNC]
+        return queue, backlog
+
+    def unsubscribe(self, queue, loop=None):
+        loop = loop or asyncio.get_running_loop()
+        with self._lock:
+            queues = self._loops.get(loop)
+            if queues is not None:
+                queues.discard(queue)
+                if not queues:
+                    del self._loops[loop]
+
+    def publish(self, kind, data):
+        """Frame ``data`` once and queue it on every stream. Safe to call from any thread."""
+        with self._lock:
+            frame_id = self._next_id
+            self._next_id += 1
+            frame = (
+                f"id: {frame_id}\nevent: {kind}\n"
+                f"data: {json.dumps(data, cls=DjangoJSONEncoder, separators=(',', ':'))}\n\n"
+            ).encode()
+            self._replay.append((frame_id, frame))
+            # Copy the queue sets too: streams on other threads add and drop theirs under the lock
+            loops = [(loop, list(queues)) for loop, queues in self._loops.items()]
+        # One wake-up per loop; the loop then fans out to its own queues
+        for loop, queues in loops:
+            if not loop.is_closed():
+                loop.call_soon_threadsafe(self._fan_out, queues, frame)
+        return frame_id
+
+    def mark_published(self, version):
+        """Record that clients were sent the changes behind ``version``."""
+        with self._lock:
+            self._published_version = version
+
+    def _watch_version(self):
+        """Resync every stream when the events version moves without a local publish.
+
+        Runs while at least one stream is open and exits with the last one.
+        """
+        close_old_connections()
+        try:
+            seen = get_events_version()
+            while True:
+                time.sleep(self.version_poll)
+                with self._lock:
+                    if not self._loops:
+                        self._watcher = None
+                        return
+                    published = self._published_version
+                current = get_events_version()
+                if current not in (seen, published):
+                    self.publish("resync", {})
+                seen = current
+        except Exception as e:
+            # The next stream to connect starts a fresh watcher
+            logger.error(f"Watching the events version failed: {e}", exc_info=True)
+            with self._lock:
+                self._watcher = None
+        finally:
+            close_old_connections()
+
+    @staticmethod
+    def _fan_out(queues, frame):
+        for queue in queues:
+            try:
+                queue.put_nowait(frame)
+            except asyncio.QueueFull:
+                # Too far behind: clear what it has not read and ask it to refetch
+                while not queue.empty():
+                    queue.get_nowait()
+                queue.put_nowait(RESYNC)
+
+
+broadcaster = Broadcaster()
+
+
+async def sse_frames(last_event_id=None, keepalive=KEEPALIVE_SECONDS, hub=None):
+    """Async iterator of SSE frames for one client connection."""
+    hub = hub or broadcaster
+    loop = asyncio.get_running_loop()
+    queue, backlog = hub.subscribe(last_event_id)
+    try:
+        yield f"retry: {RETRY_MS}\n\n".encode()
+        for frame in backlog:
+            yield frame
+        while True:
+            try:
+                yield await asyncio.wait_for(queue.get(), keepalive)
+            except asyncio.TimeoutError:
+                # Comment line keeps proxies from closing an idle connection
+                yield b": keepalive\n\n"
+    finally:
+        hub.unsubscribe(queue, loop)
+
+
+def publish_event_changes(changes):
+    """Push created/updated events once the current transaction commits.
+
+    ``changes`` is a list of ``(event_id, outcome)`` pairs collected by the scraper.
+    """
+    if changes:
+        transaction.on_commit(lambda: _publish(changes))
+
+
+def _publish(changes):
+    from .models import Event
+    from .serializers import EventSerializer
+
+    outcomes = dict(changes)
+    events = Event.objects.filter(pk__in=outcomes).prefetch_related("sources", "event_tags__tag")
+    # No request to build absolute URLs from; the SPA is served from another origin
+    context = {"base_url": getattr(settings, "EVENTS_PUBLIC_BASE_URL", "http://localhost:8000")}
+    for event in events.iterator(chunk_size=200):
+        broadcaster.publish(outcomes[event.pk], EventSerializer(event, context=context).data)
+    # The scrape's version bump commits first, so the watcher need not resync for it
+    broadcaster.mark_published(get_events_version())
@@ -0,0 +1,114 @@
+"""Topic tags for events, matched against a fixed vocabulary.
+
+Every vocabulary phrase ("machine learning", "web3", "ai") maps to one
+normalized tag. The title and description are tokenized once into the set
+of their 1..3-word n-grams; intersecting that set with the set of all
+vocabulary phrases finds every match in one C-level set operation, however
+large the vocabulary grows. No per-phrase regex or substring scans are run.
+
+Tags are stored in EventTag rows indexed by (tag, event), so ``?tag=``
+filters are index lookups rather than LIKE scans over descriptions.
+"""
+import re
+
+VOCABULARY = {
+    "ai": ("ai", "artificial intelligence", "machine learning", "ml", "deep learning", "genai",
+           "generative ai", "llm", "llms", "nlp", "computer vision"),
+    "web3": ("web3", "web 3", "blockchain", "crypto", "ethereum", "solidity", "defi", "nft", "nfts", "dapp"),
+    "fintech": ("fintech", "finance", "banking", "payments", "upi"),
+    "healthtech": ("healthtech", "healthcare", "health", "medtech", "medical"),
+    "edtech": ("edtech", "education", "learning platform"),
+    "climate": ("climate", "sustainability", "sustainable", "greentech", "green tech", "clean energy",
+                "renewable energy"),
+    "iot": ("iot", "internet of things", "embedded", "hardware"),
+    "cybersecurity": ("cybersecurity", "cyber security", "security", "ctf", "infosec"),
+    "cloud": ("cloud", "devops", "kubernetes", "serverless", "aws", "azure", "gcp"),
+    "data-science": ("data science", "analytics", "big data", "data engineering"),
+    "mobile": ("mobile", "android", "ios", "flutter", "react native"),
+    "web": ("web development", "web dev", "frontend", "backend", "full stack", "fullstack", "react"),
+    "ar-vr": ("ar", "vr", "ar vr", "augmented reality", "virtual reality", "metaverse", "xr"),
+    "robotics": ("robotics", "robot", "robots", "drone", "drones"),
+    "open-source": ("open source", "opensource", "oss"),
+    "gaming": ("gaming", "game development", "gamedev", "game jam"),
+    "social-good": ("social good", "social impact", "civic tech", "smart city", "smart campus"),
+}
+
+MAX_NGRAM = 3
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+def _tokens(text):
+    return _TOKEN_RE.findall((text or "").lower())
+
+
+def _compile(vocabulary):
+    phrases = {}
+    for tag, synonyms in vocabulary.items():
+        for phrase in synonyms + (tag,):
+            phrases[" ".join(_tokens(phrase))] = tag
+    return phrases
+
+
+PHRASES = _compile(VOCABULARY)
+_PHRASE_SET = frozenset(PHRASES)
+
+
+def ngrams(text, max_n=MAX_NGRAM):
+    tokens = _tokens(text)
+    grams = set(tokens)
+    for n in range(2, max_n + 1):
+        grams.update(" ".join(tokens[i:i + n]) for i in range(len(tokens) - n + 1))
+    return grams
+
+
+def extract_tags(title, description=""):
+    """Return the sorted tag names found in an event's title and description."""
+    grams = ngrams(title) | ngrams(description)
+    return sorted({PHRASES[phrase] for phrase in grams & _PHRASE_SET})
+
+
+class EventTagger:
+    """Keeps EventTag rows in step with the extracted tags.
+
+    Built once per scrape so tag ids come from a dict; ``sync`` reads and
+    writes the tags of a whole batch of events in a few queries.
+    """
+
+    def __init__(self):
+        from .models import Tag
+
+        existing = dict(Tag.objects.values_list("name", "id"))
+        missing = [Tag(name=name) for name in VOCABULARY if name not in existing]
+        if missing:
+            Tag.objects.bulk_create(missing, ignore_conflicts=True)
+            existing = dict(Tag.objects.values_list("name", "id"))
+        self.tag_ids = existing
+
+    def sync(self, event_ids, batch_size=500):
+        """Re-tag the given events; returns the number of tag rows added and removed."""
+        from .models import Event, EventTag
+
+        event_ids = list(event_ids)
+        written = 0
+        for start in range(0, len(event_ids), batch_size):
+            batch = event_ids[start:start + batch_size]
+            current = {}
+            for pk, event_id, tag_id in EventTag.objects.filter(event_id__in=batch).values_list(
+                "pk", "event_id", "tag_id"
+            ):
+                current.setdefault(event_id, {})[tag_id] = pk
+            added, stale = [], []
+            for event_id, title, description in Event.objects.filter(pk__in=batch).values_list(
+                "id", "title", "description"
+            ):
+                wanted = {self.tag_ids[name] for name in extract_tags(title, description)}
+                have = current.get(event_id, {})
+                added.extend(EventTag(event_id=event_id, tag_id=tag_id) for tag_id in wanted - have.keys())
+                stale.extend(pk for tag_id, pk in have.items() if tag_id not in wanted)
+            if stale:
+                EventTag.objects.filter(pk__in=stale).delete()
+            if added:
+                EventTag.objects.bulk_create(added, ignore_conflicts=True)
+            written += len(added) + len(stale)
+        return written
@@ -1,4 +1,5 @@
 from celery import shared_task
+from .models import ScrapeRun
 from .scraper import scrape_events
 
 
@@ -6,11 +7,8 @@ from .scraper import scrape_events
 def scrape_events_task(self):
     """Celery task wrapper around the scraper. Returns a small summary dict or raises on failure."""
     try:
-        result = scrape_events()
-        # If scraper returns number of created items, return that; else return a generic summary
-        if isinstance(result, dict):
-            return result
-        return {"status": "ok"}
+        # Totals for the run; per-source metrics are persisted on the ScrapeRun
+        return {"status": "ok", **scrape_events(run=ScrapeRun.objects.create(trigger='task'))}
     except Exception as e:
         # Let Celery handle retries if configured
         raise
@@ -0,0 +1,17 @@
+import shutil
+import tempfile
+
+from django.test import TestCase, override_settings
+
+
+class ScrapeTestCase(TestCase):
+    """TestCase for tests that run the scraper: fetched pages are archived in a temp dir, not media/."""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        archive_dir = tempfile.mkdtemp()
+        cls.addClassCleanup(shutil.rmtree, archive_dir, True)
+        overrides = override_settings(EVENTS_RAW_ARCHIVE_DIR=archive_dir)
+        overrides.enable()
+        cls.addClassCleanup(overrides.disable)
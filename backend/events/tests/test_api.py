@@ -1,11 +1,12 @@
-from django.test import TestCase
+from django.test import TestCase, override_settings
 from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APITestCase
-from .models import Event
+from ..models import Event, ScrapeJob
 from unittest.mock import patch
 import requests
 
+@override_settings(EVENTS_SCRAPE_JOBS_EAGER=True)
 class EventAPITestCase(APITestCase):
 
     def setUp(self):
@@ -32,7 +33,8 @@ class EventAPITestCase(APITestCase):
         """Test that scraper runs successfully and stores data"""
         url = reverse('run-scraper')
         response = self.client.get(url)
-        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertIn("job_id", response.json())
         self.assertTrue(Event.objects.exists())
 
     def test_scraper_creates_unique_events(self):
@@ -50,4 +52,6 @@ class EventAPITestCase(APITestCase):
         mock_get.side_effect = requests.RequestException("Failed request")
         url = reverse('run-scraper')
         response = self.client.get(url)
-        self.assertEqual(response.status_code, status.HTTP_500_INTERNAL_SERVER_ERROR)
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        job = ScrapeJob.objects.get(pk=response.json()["job_id"])
+        self.assertEqual(job.result["total_event_count"], 0)
@@ -0,0 +1,77 @@
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from ..archival import archive_expired_events
+from ..dedupe import EventDeduplicator
+from ..models import ArchivedEvent, Event, EventSource
+from ..scheduler import JOBS
+from ..scraper import _save_event
+
+
+class ArchivalTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.now = timezone.now()
+        for n in range(5):
+            Event.objects.create(title=f"Closed {n}", registration_end=self.now - timedelta(days=10 + n))
+        self.open = Event.objects.create(title="Open", registration_end=self.now + timedelta(days=3))
+        self.closed = Event.objects.get(title="Closed 0")
+        EventSource.objects.create(event=self.closed, source="reskilll", title="Closed 0")
+
+    def test_expired_events_move_in_batches(self):
+        self.assertEqual(archive_expired_events(now=self.now, batch_size=2), 5)
+        self.assertEqual(list(Event.objects.values_list("title", flat=True)), ["Open"])
+        archived = ArchivedEvent.objects.get(pk=self.closed.pk)
+        self.assertEqual(archived.title, "Closed 0")
+        self.assertEqual(archived.sources, [{"source": "reskilll", "title": "Closed 0", "url": None}])
+        # Nothing left to do on the next pass
+        self.assertEqual(archive_expired_events(now=self.now), 0)
+
+    def test_grace_period_keeps_just_closed_events(self):
+        Event.objects.create(title="Closed yesterday", registration_end=self.now - timedelta(hours=12))
+        archive_expired_events(now=self.now)
+        self.assertTrue(Event.objects.filter(title="Closed yesterday").exists())
+
+    def test_rescraped_event_supersedes_archived_copy(self):
+        archive_expired_events(now=self.now)
+        Event.objects.create(title="Closed 0", registration_end=self.now - timedelta(days=5))
+        archive_expired_events(now=self.now)
+        self.assertEqual(ArchivedEvent.objects.filter(title="Closed 0").count(), 1)
+
+    def test_scraping_an_archived_event_keeps_it_archived(self):
+        archive_expired_events(now=self.now)
+        event, outcome, merged = _save_event(
+            {"title": "Closed 0", "registration_end": self.now - timedelta(days=10)},
+            "https://reskilll.com/allhacks", "reskilll", EventDeduplicator(),
+        )
+        self.assertEqual((event.pk, outcome, merged), (self.closed.pk, "unchanged", False))
+        self.assertFalse(Event.objects.filter(title="Closed 0").exists())
+        archive_expired_events(now=self.now)
+        self.assertTrue(ArchivedEvent.objects.filter(pk=self.closed.pk).exists())
+
+    def test_api_reads_archive_only_when_asked(self):
+        archive_expired_events(now=self.now)
+        client = APIClient()
+        url = reverse("api-event-list")
+
+        hot = client.get(url).json()
+        self.assertEqual([e["title"] for e in hot["results"]], ["Open"])
+
+        titles, next_url = [], f"{url}?include=archived&ordering=registration_end&page_size=2"
+        while next_url:
+            page = client.get(next_url).json()
+            titles += [(e["title"], e["archived"]) for e in page["results"]]
+            next_url = page["next"]
+        self.assertEqual(titles, [(f"Closed {n}", True) for n in range(4, -1, -1)] + [("Open", False)])
+
+        self.assertEqual(client.get(url, {"include": "everything"}).status_code, 400)
+        detail = client.get(reverse("api-event-detail", args=[self.closed.pk])).json()
+        self.assertTrue(detail["archived"])
+
+    def test_archival_job_is_registered(self):
+        self.assertIn("archive_events", JOBS)
@@ -0,0 +1,54 @@
+import shutil
+import tempfile
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from .. import archive
+from ..models import ScrapeRun, ScrapeSource, ScrapeSourceRun
+from ..scraper import iter_scrape
+
+PAGE = (
+    '<div class="hackathonCard"><a class="allhackname eventName text-decoration-none" '
+    'href="https://example.com/a">Archived Hack</a></div>'
+)
+
+
+class RawPageArchiveTest(TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.dir, True)
+        overrides = override_settings(EVENTS_RAW_ARCHIVE_DIR=self.dir, EVENTS_RAW_ARCHIVE_RETENTION_DAYS=7)
+        overrides.enable()
+        self.addCleanup(overrides.disable)
+
+    def test_store_is_content_addressed(self):
+        digest = archive.store(PAGE.encode())
+        self.assertEqual(archive.store(PAGE.encode()), digest)
+        self.assertEqual(archive.load(digest), PAGE.encode())
+        self.assertEqual(len(list(archive.archive_dir().glob("*/*.html.gz"))), 1)
+        self.assertLess(archive.page_path(digest).stat().st_size, 4096)
+
+    @patch("events.scraper.requests.get")
+    def test_scrape_archives_page_and_drops_snippets(self, mock_get):
+        mock_get.return_value.text = PAGE
+        mock_get.return_value.content = PAGE.encode()
+        source = ScrapeSource.objects.create(name="campus", url="https://example.com/events", parser="reskilll")
+        run = ScrapeRun.objects.create()
+        events = list(iter_scrape([source], run=run))
+
+        self.assertNotIn("_raw_snippet", events[0])
+        self.assertEqual(archive.load(run.source_runs.get().raw_page_sha256), PAGE.encode())
+
+    def test_prune_keeps_pages_of_recent_runs(self):
+        run = ScrapeRun.objects.create()
+        old, recent = archive.store(b"old page"), archive.store(b"recent page")
+        ScrapeSourceRun.objects.create(run=run, source="campus", url="https://example.com", raw_page_sha256=recent)
+        later = timezone.now() + timedelta(days=30)
+        ScrapeSourceRun.objects.update(started_at=later)
+
+        self.assertEqual(archive.prune(now=later + timedelta(days=1)), 1)
+        self.assertIsNone(archive.load(old))
+        self.assertIsNotNone(archive.load(recent))
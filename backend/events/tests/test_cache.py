@@ -0,0 +1,86 @@
+from unittest.mock import patch
+
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from ..cache import _refresh, batch_version_bump, get_events_version
+from ..models import Event
+
+
+class EventsCacheTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.event = Event.objects.create(title="Cached Hack")
+        self.url = reverse('api-event-list')
+
+    @contextmanager
+    def assertNoEventQueries(self):
+        # The shared cache lives in the database; only the events tables must stay untouched
+        with CaptureQueriesContext(connection) as queries:
+            yield
+        self.assertFalse([q["sql"] for q in queries.captured_queries
+                          if Event._meta.db_table in q["sql"]])
+
+    def test_second_read_skips_the_events_table(self):
+        first = self.client.get(self.url)
+        self.assertEqual(first.status_code, 200)
+        with self.assertNoEventQueries():
+            second = self.client.get(self.url)
+        self.assertEqual(second.data, first.data)
+        self.assertEqual(second["ETag"], first["ETag"])
+        self.assertIn("stale-while-revalidate", second["Cache-Control"])
+
+    def test_conditional_get_returns_304(self):
+        etag = self.client.get(self.url)["ETag"]
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response["ETag"], etag)
+
+    def test_detail_endpoint(self):
+        response = self.client.get(reverse('api-event-detail', args=[self.event.pk]))
+        self.assertEqual(response.data["title"], "Cached Hack")
+        self.assertTrue(response.has_header("ETag"))
+        self.assertEqual(self.client.get(reverse('api-event-detail', args=[999])).status_code, 404)
+
+    @patch("events.cache._spawn")
+    def test_commit_serves_stale_then_revalidates(self, spawn):
+        old = self.client.get(self.url)
+        with self.captureOnCommitCallbacks(execute=True):
+            Event.objects.create(title="New Hack")
+
+        # Version moved on: the old payload is served and a refresh is scheduled
+        with self.assertNoEventQueries():
+            stale = self.client.get(self.url)
+        self.assertEqual(stale.data, old.data)
+        spawn.assert_called_once()
+
+        _refresh(*spawn.call_args.args[1:])
+        fresh = self.client.get(self.url)
+        self.assertEqual([e["title"] for e in fresh.data["results"]], ["New Hack", "Cached Hack"])
+        self.assertNotEqual(fresh["ETag"], old["ETag"])
+
+    def test_batch_bumps_once(self):
+        before = get_events_version()
+        with patch("events.cache.bump_events_version") as bump:
+            with self.captureOnCommitCallbacks(execute=True):
+                with batch_version_bump():
+                    Event.objects.create(title="A")
+                    Event.objects.create(title="B")
+        self.assertEqual(bump.call_count, 1)
+        self.assertEqual(get_events_version(), before)
+
+    def test_culling_responses_keeps_the_version(self):
+        version = get_events_version()
+        options = {"MAX_ENTRIES": 3, "CULL_FREQUENCY": 1}
+        with override_settings(CACHES={**settings.CACHES, "default": {**settings.CACHES["default"], "OPTIONS": options}}):
+            for n in range(10):
+                cache.set(f"events:list:{n}", n)
+            self.assertEqual(get_events_version(), version)
@@ -0,0 +1,110 @@
+import os
+import shutil
+import tempfile
+from io import StringIO
+from unittest.mock import MagicMock, patch
+
+import requests
+from django.core.management import call_command
+from django.test import SimpleTestCase
+
+from .base import ScrapeTestCase
+from ..cassette import CassetteMiss, Player, Recorder
+from ..fetch import use_fetcher
+from ..models import Event, ScrapeRun, ScrapeSource
+from ..scraper import scrape_events
+
+PAGE = (
+    '<div class="hackathonCard"><a class="allhackname eventName text-decoration-none" '
+    'href="https://example.com/a">Replayed Hack</a></div>'
+)
+URL = "https://example.com/events"
+
+
+def live_response(url, **kwargs):
+    response = MagicMock()
+    response.status_code = 200 if url.startswith(URL) else 404
+    response.headers = {"Content-Type": "text/html; charset=utf-8", "Set-Cookie": "x"}
+    # Later listing pages are empty
+    response.text = PAGE if url == URL else ""
+    response.content = response.text.encode()
+    return response
+
+
+class CassetteTest(SimpleTestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.dir, True)
+        self.path = os.path.join(self.dir, "cassette.json.gz")
+
+    @patch("events.cassette.requests.get", side_effect=live_response)
+    def test_round_trip(self, live_get):
+        recorder = Recorder(self.path)
+        recorder.get(URL)
+        recorder.get("https://example.com/missing")
+        self.assertEqual(recorder.save(), 2)
+
+        live_get.reset_mock()
+        player = Player(self.path)
+        response = player.get(URL)
+        self.assertEqual(response.text, PAGE)
+        self.assertEqual(response.headers["content-type"], "text/html; charset=utf-8")
+        self.assertNotIn("set-cookie", response.headers)
+        with self.assertRaises(requests.HTTPError):
+            player.get("https://example.com/missing").raise_for_status()
+        with self.assertRaises(CassetteMiss):
+            player.get(URL + "?page=3")
+        live_get.assert_not_called()
+
+    @patch("events.cassette.time.sleep")
+    @patch("events.cassette.requests.get", side_effect=live_response)
+    def test_replay_latency(self, _live_get, sleep):
+        recorder = Recorder(self.path)
+        recorder.get(URL)
+        recorder.save()
+        Player(self.path, latency_ms=150).get(URL)
+        sleep.assert_called_once_with(0.15)
+
+
+class CassetteScrapeTest(ScrapeTestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.dir, True)
+        self.path = os.path.join(self.dir, "cassette.json.gz")
+        self.source = ScrapeSource.objects.create(name="campus", url=URL, parser="reskilll", max_pages=3)
+
+    def test_scrape_replays_offline(self):
+        with patch("events.cassette.requests.get", side_effect=live_response):
+            recorder = Recorder(self.path)
+            with use_fetcher(recorder):
+                scrape_events([self.source])
+            recorder.save()
+        Event.objects.all().delete()
+
+        with patch("events.scraper.requests.get") as live_get, use_fetcher(Player(self.path)):
+            run = ScrapeRun.objects.create()
+            scrape_events([self.source], run=run)
+        live_get.assert_not_called()
+        self.assertTrue(Event.objects.filter(title="Replayed Hack").exists())
+        # Page 2 was recorded empty, which ends the crawl the same way it did live
+        self.assertEqual(run.source_runs.get().pages_fetched, 2)
+
+    @patch("events.scraper.time.sleep")
+    def test_cassette_miss_is_not_retried(self, sleep):
+        Recorder(self.path).save()
+        with use_fetcher(Player(self.path)):
+            run = ScrapeRun.objects.create()
+            scrape_events([self.source], run=run)
+        self.assertEqual(run.source_runs.get().fetch_attempts, 1)
+        sleep.assert_not_called()
+
+    def test_command_replays_cassette(self):
+        with patch("events.cassette.requests.get", side_effect=live_response):
+            recorder = Recorder(self.path)
+            recorder.get(URL)
+            recorder.save()
+        out = StringIO()
+        with patch("events.sources.CODE_SOURCES", {}):
+            call_command("scrape_events", "--replay", self.path, "--source", "campus", stdout=out)
+        self.assertIn("pages/s", out.getvalue())
+        self.assertTrue(Event.objects.filter(title="Replayed Hack").exists())
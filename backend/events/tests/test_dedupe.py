@@ -0,0 +1,123 @@
+from importlib import import_module
+from unittest.mock import MagicMock, patch
+
+from django.apps import apps
+from django.test import SimpleTestCase
+
+from .base import ScrapeTestCase
+from ..dedupe import NUM_PERM, EventDeduplicator, is_duplicate, pack, signature, similarity, unpack
+from ..models import Event, EventSource, ScrapeRun, ScrapeSource
+from ..scraper import scrape_events
+
+RESKILLL_CARD = (
+    '<div class="hackathonCard"><a class="allhackname eventName text-decoration-none" href="https://reskilll.com/{slug}">{title}</a>'
+    '<div class="eventDescription">{desc}</div></div>'
+)
+DEVFOLIO_CARD = '<a class="project-card-link" href="https://{slug}.devfolio.co/"><h3>{title}</h3></a>'
+DESCRIPTION = "A 36 hour hackathon for students building tools for campus life and open data"
+
+
+class SignatureTest(SimpleTestCase):
+    def test_similar_titles_score_high(self):
+        a = signature("HackFest 2025", DESCRIPTION)
+        b = signature("Hackfest-2025 ", DESCRIPTION)
+        c = signature("Design Sprint", "A weekend of UI critique")
+        self.assertEqual(similarity(a[:NUM_PERM], b[:NUM_PERM]), 1.0)
+        self.assertLess(similarity(a[:NUM_PERM], c[:NUM_PERM]), 0.3)
+
+    def test_pack_round_trip(self):
+        sig = signature("HackFest 2025", DESCRIPTION)
+        self.assertEqual(unpack(pack(sig)), sig)
+
+    def test_different_editions_are_not_duplicates(self):
+        a = signature("HackFest 2024", DESCRIPTION)
+        b = signature("HackFest 2025", DESCRIPTION)
+        self.assertFalse(is_duplicate(a, b, "HackFest 2024", "HackFest 2025"))
+
+    def test_loose_title_needs_matching_description(self):
+        a = signature("CodeSprint by GDSC", DESCRIPTION)
+        b = signature("GDSC CodeSprint", DESCRIPTION)
+        c = signature("GDSC CodeSprint", "Talks on cloud careers")
+        self.assertTrue(is_duplicate(a, b, "CodeSprint by GDSC", "GDSC CodeSprint"))
+        self.assertFalse(is_duplicate(a, c, "CodeSprint by GDSC", "GDSC CodeSprint"))
+
+
+class CrossSourceDedupeTest(ScrapeTestCase):
+    def setUp(self):
+        self.reskilll = ScrapeSource.objects.create(
+            name="reskilll", url="https://reskilll.com/allhacks", parser="reskilll", priority=10)
+        self.devfolio = ScrapeSource.objects.create(
+            name="devfolio", url="https://devfolio.co/hackathons", parser="devfolio", priority=20)
+
+    def _respond(self, mock_get, pages):
+        def get(url, **kwargs):
+            response = MagicMock()
+            response.text = pages[url]
+            response.content = pages[url].encode()
+            return response
+        mock_get.side_effect = get
+
+    @patch("events.scraper.requests.get")
+    def test_near_duplicate_from_other_source_is_merged(self, mock_get):
+        self._respond(mock_get, {
+            self.reskilll.url: RESKILLL_CARD.format(slug="hackfest", title="HackFest 2025", desc=DESCRIPTION),
+            self.devfolio.url: (
+                DEVFOLIO_CARD.format(slug="hackfest", title="Hackfest-2025")
+                + DEVFOLIO_CARD.format(slug="other", title="Design Sprint")
+            ),
+        })
+        run = ScrapeRun.objects.create()
+        scrape_events([self.reskilll, self.devfolio], run=run)
+
+        self.assertEqual(Event.objects.count(), 2)
+        event = Event.objects.get(title="HackFest 2025")
+        # The canonical event keeps the fields from the source that found it first
+        self.assertEqual(event.description, DESCRIPTION)
+        self.assertEqual(event.link, "https://reskilll.com/hackfest")
+        self.assertEqual(
+            set(EventSource.objects.filter(event=event).values_list("source", flat=True)),
+            {"reskilll", "devfolio"},
+        )
+        devfolio_run = run.source_runs.get(source="devfolio")
+        self.assertEqual(devfolio_run.duplicates_merged, 1)
+        self.assertEqual(devfolio_run.events_created, 1)
+
+        # A second scrape keeps the merge and does not create anything
+        run = ScrapeRun.objects.create()
+        scrape_events([self.reskilll, self.devfolio], run=run)
+        self.assertEqual(Event.objects.count(), 2)
+        self.assertEqual(run.summary()["events_created"], 0)
+        event.refresh_from_db()
+        self.assertEqual(event.link, "https://reskilll.com/hackfest")
+
+    @patch("events.scraper.requests.get")
+    def test_same_source_cards_are_never_merged(self, mock_get):
+        self._respond(mock_get, {
+            self.reskilll.url: (
+                RESKILLL_CARD.format(slug="a", title="HackFest 2025", desc=DESCRIPTION)
+                + RESKILLL_CARD.format(slug="b", title="HackFest 2025!", desc=DESCRIPTION)
+            ),
+        })
+        scrape_events([self.reskilll])
+        self.assertEqual(Event.objects.count(), 2)
+
+    def test_missing_signatures_are_backfilled(self):
+        event = Event.objects.create(title="Old Event", description="stored before dedupe")
+        dedupe = EventDeduplicator()
+        event.refresh_from_db()
+        self.assertEqual(unpack(event.minhash), signature("Old Event", "stored before dedupe"))
+        self.assertIn(event.pk, dedupe.titles)
+
+    def test_pre_existing_events_are_linked_to_their_source(self):
+        old = Event.objects.create(title="HackFest 2025", link="https://reskilll.com/hackfest")
+        other = Event.objects.create(title="Design Sprint", link="https://sprint.devfolio.co/")
+        unknown = Event.objects.create(title="Meetup", link="https://example.com/meetup")
+        migration = import_module("events.migrations.0016_backfill_event_sources")
+        migration.backfill_event_sources(apps, None)
+
+        self.assertEqual(list(old.sources.values_list("source", flat=True)), ["reskilll"])
+        self.assertEqual(list(other.sources.values_list("source", flat=True)), ["devfolio"])
+        self.assertFalse(unknown.sources.exists())
+        # A differently titled card from the same site is no longer merged into it
+        sig = signature("HackFest 2025!", DESCRIPTION)
+        self.assertIsNone(EventDeduplicator().find_canonical({"title": "HackFest 2025!"}, "reskilll", sig))
@@ -0,0 +1,62 @@
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from ..ical import escape_text, fold
+from ..models import Event
+
+
+class ICalFormattingTest(SimpleTestCase):
+    def test_escape_text(self):
+        self.assertEqual(escape_text("AI, Web3; more\nlines"), "AI\\, Web3\\; more\\nlines")
+
+    def test_fold_long_lines(self):
+        folded = fold("DESCRIPTION:" + "é" * 80)
+        lines = folded.rstrip("\r\n").split("\r\n")
+        self.assertGreater(len(lines), 1)
+        for line in lines:
+            self.assertLessEqual(len(line.encode("utf-8")), 75)
+        self.assertEqual("".join(l[1:] if i else l for i, l in enumerate(lines)), "DESCRIPTION:" + "é" * 80)
+
+
+class EventsCalendarTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        now = timezone.now()
+        Event.objects.create(title="Deadline Hack", description="AI, ML",
+                             registration_start=datetime(2025, 3, 1, tzinfo=dt_timezone.utc),
+                             registration_end=datetime(2025, 3, 15, 18, 30, tzinfo=dt_timezone.utc),
+                             link="https://example.com/hack")
+        Event.objects.create(title="Open Hack", registration_end=now + timedelta(days=3))
+        Event.objects.create(title="No Dates")
+        self.url = reverse('events-calendar')
+
+    def test_streams_a_calendar_of_registration_windows(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        self.assertEqual(response["Content-Type"], "text/calendar; charset=utf-8")
+        body = b"".join(response.streaming_content).decode()
+        self.assertTrue(body.startswith("BEGIN:VCALENDAR\r\n"))
+        self.assertTrue(body.endswith("END:VCALENDAR\r\n"))
+        self.assertEqual(body.count("BEGIN:VEVENT"), 2)
+        self.assertIn("DTSTART:20250301T000000Z", body)
+        self.assertIn("DTEND:20250315T183000Z", body)
+        self.assertIn("DESCRIPTION:AI\\, ML", body)
+        self.assertNotIn("No Dates", body)
+
+    def test_status_filter(self):
+        body = b"".join(self.client.get(self.url, {"status": "open"}).streaming_content).decode()
+        self.assertEqual(body.count("BEGIN:VEVENT"), 1)
+        self.assertIn("Open Hack", body)
+
+    def test_polling_client_gets_304(self):
+        first = self.client.get(self.url)
+        b"".join(first.streaming_content)
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=first["ETag"])
+        self.assertEqual(response.status_code, 304)
+        response = self.client.get(self.url, HTTP_IF_MODIFIED_SINCE=first["Last-Modified"])
+        self.assertEqual(response.status_code, 304)
@@ -0,0 +1,125 @@
+import os
+import shutil
+import tempfile
+from io import BytesIO
+from unittest.mock import patch
+
+from django.core.cache import cache
+from django.test import override_settings
+from django.urls import reverse
+from PIL import Image
+from rest_framework.test import APIClient
+
+from .base import ScrapeTestCase
+from .. import images
+from ..models import Event, ScrapeRun, ScrapeSource
+from ..scraper import scrape_events
+from ..stream import publish_event_changes
+
+BANNER_URL = "https://cdn.example.com/banner.png"
+
+
+def png_bytes(width=2000, height=1000):
+    buffer = BytesIO()
+    Image.new("RGB", (width, height), (200, 30, 30)).save(buffer, "PNG")
+    return buffer.getvalue()
+
+
+def image_response(mock_get, data):
+    mock_get.return_value.iter_content.return_value = [data]
+    mock_get.return_value.raise_for_status.return_value = None
+
+
+class ImageCacheTest(ScrapeTestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.dir, True)
+        overrides = override_settings(EVENTS_IMAGE_CACHE_DIR=self.dir)
+        overrides.enable()
+        self.addCleanup(overrides.disable)
+        cache.clear()
+
+    @patch("events.images.requests.get")
+    def test_variants_are_resized(self, mock_get):
+        image_response(mock_get, png_bytes())
+        key = images.cache_image(BANNER_URL)
+        for variant, width in images.VARIANTS.items():
+            with Image.open(images.variant_path(key, variant)) as stored:
+                self.assertEqual(stored.size, (width, width // 2))
+        # Cached images are not fetched again
+        images.cache_image(BANNER_URL)
+        self.assertEqual(mock_get.call_count, 1)
+
+    @patch("events.images.requests.get")
+    def test_non_image_is_rejected(self, mock_get):
+        image_response(mock_get, b"<html>not found</html>")
+        with self.assertRaises(images.ImageCacheError):
+            images.cache_image(BANNER_URL)
+        self.assertFalse(images.is_cached(BANNER_URL))
+
+    @patch("PIL.Image.MAX_IMAGE_PIXELS", 1000)
+    @patch("events.images.requests.get")
+    def test_decompression_bomb_is_rejected(self, mock_get):
+        image_response(mock_get, png_bytes())
+        with self.assertRaises(images.ImageCacheError):
+            images.cache_image(BANNER_URL)
+        self.assertFalse(images.is_cached(BANNER_URL))
+
+    @patch("events.images.requests.get")
+    def test_evict_drops_least_recently_used(self, mock_get):
+        image_response(mock_get, png_bytes(400, 200))
+        old, recent = (images.cache_image(f"https://cdn.example.com/{n}.png") for n in ("old", "recent"))
+        os.utime(os.path.join(self.dir, old), (1, 1))
+        os.utime(os.path.join(self.dir, recent), (1, 1))
+        images.open_variant(recent, "card").close()
+        size = sum(f.stat().st_size for f in os.scandir(os.path.join(self.dir, recent)))
+
+        self.assertEqual(images.evict(limit=size), 1)
+        self.assertFalse(os.path.exists(os.path.join(self.dir, old)))
+        self.assertTrue(os.path.exists(os.path.join(self.dir, recent)))
+
+    @patch("events.images.requests.get")
+    def test_proxy_serves_cached_variant_and_serializer_points_at_it(self, mock_get):
+        image_response(mock_get, png_bytes())
+        key = images.cache_image(BANNER_URL)
+        event = Event.objects.create(title="Banner Event", image_url=BANNER_URL)
+
+        client = APIClient()
+        response = client.get(reverse("event-image", args=[key, "thumb"]))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], "image/jpeg")
+        self.assertIn("immutable", response["Cache-Control"])
+        self.assertEqual(client.get(reverse("event-image", args=[key, "huge"])).status_code, 404)
+        self.assertEqual(client.get(reverse("event-image", args=["0" * 32, "card"])).status_code, 404)
+
+        data = client.get(reverse("api-event-detail", args=[event.pk])).json()
+        self.assertEqual(data["image_original_url"], BANNER_URL)
+        self.assertTrue(data["image_url"].endswith(reverse("event-image", args=[key, "card"])))
+        self.assertEqual(set(data["image_variants"]), set(images.VARIANTS))
+
+    @override_settings(EVENTS_PUBLIC_BASE_URL="https://api.example.com")
+    @patch("events.stream.broadcaster")
+    @patch("events.images.requests.get")
+    def test_streamed_event_points_at_absolute_banner_url(self, mock_get, hub):
+        image_response(mock_get, png_bytes())
+        key = images.cache_image(BANNER_URL)
+        event = Event.objects.create(title="Banner Event", image_url=BANNER_URL)
+        with self.captureOnCommitCallbacks(execute=True):
+            publish_event_changes([(event.pk, "created")])
+        data = hub.publish.call_args.args[1]
+        self.assertEqual(data["image_url"], "https://api.example.com" + reverse("event-image", args=[key, "card"]))
+
+    @patch("events.scraper.requests.get")
+    def test_scrape_caches_banners(self, mock_get):
+        card = (
+            '<div class="hackathonCard"><img class="allhacksbanner" src="/banner.png">'
+            '<a class="allhackname eventName text-decoration-none" href="https://example.com/a">A</a></div>'
+        )
+        mock_get.return_value.text = card
+        mock_get.return_value.content = card.encode()
+        mock_get.return_value.iter_content.return_value = [png_bytes(800, 400)]
+        source = ScrapeSource.objects.create(name="campus", url="https://example.com/events", parser="reskilll")
+        run = ScrapeRun.objects.create()
+        scrape_events([source], run=run)
+        self.assertTrue(images.is_cached("https://example.com/banner.png"))
+        self.assertEqual(run.source_runs.get().errors, [])
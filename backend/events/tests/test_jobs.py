@@ -0,0 +1,68 @@
+from unittest.mock import patch
+
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from ..jobs import enqueue_scrape, run_job
+from ..models import ScrapeJob
+
+
+class ScrapeJobTest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+
+    @patch("events.jobs._executor")
+    def test_endpoint_enqueues_without_scraping(self, executor):
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.get(reverse('run-scraper'))
+        self.assertEqual(response.status_code, 202)
+        body = response.json()
+        self.assertEqual(body["status"], ScrapeJob.QUEUED)
+        self.assertFalse(body["deduplicated"])
+        self.assertTrue(body["status_url"].endswith(f"/scrape/{body['job_id']}/"))
+        executor.submit.assert_called_once()
+
+    @patch("events.jobs._executor")
+    def test_concurrent_trigger_joins_active_job(self, executor):
+        first, created = enqueue_scrape()
+        self.assertTrue(created)
+        response = self.client.get(reverse('run-scraper'))
+        self.assertEqual(response.json()["job_id"], first.pk)
+        self.assertTrue(response.json()["deduplicated"])
+        self.assertEqual(ScrapeJob.objects.count(), 1)
+
+    @patch("events.jobs._executor")
+    def test_losing_the_race_twice_joins_the_winner(self, executor):
+        winner = ScrapeJob.objects.create(active_slot=ScrapeJob.ACTIVE_SLOT)
+        # First lookup: the previous active job had just finished; retry hits the new winner
+        with patch("events.jobs._create_or_join", side_effect=[(None, False), (winner, False)]):
+            self.assertEqual(enqueue_scrape(), (winner, False))
+        executor.submit.assert_not_called()
+
+    @patch("events.scraper.scrape_events", return_value={
+        "run_id": 1, "cards_found": 1, "events_created": 1, "events_updated": 0,
+        "events_unchanged": 0, "duplicates_merged": 0,
+    })
+    def test_run_job_records_result_and_frees_slot(self, scrape):
+        job = ScrapeJob.objects.create(active_slot=ScrapeJob.ACTIVE_SLOT)
+        run_job(job.pk)
+        job.refresh_from_db()
+        self.assertEqual(job.status, ScrapeJob.SUCCEEDED)
+        self.assertIsNone(job.active_slot)
+        self.assertEqual(job.result["new_event_count"], 1)
+
+        response = self.client.get(reverse('scrape-job-status', args=[job.pk]))
+        self.assertEqual(response.json()["status"], ScrapeJob.SUCCEEDED)
+
+    @override_settings(EVENTS_SCRAPE_JOBS_EAGER=True)
+    @patch("events.scraper.scrape_events", side_effect=RuntimeError("boom"))
+    def test_failed_job_reports_error(self, scrape):
+        job, _ = enqueue_scrape()
+        self.assertEqual(job.status, ScrapeJob.FAILED)
+        self.assertEqual(job.error, "boom")
+        # A new trigger after a failure starts a fresh job
+        with patch("events.jobs._executor"):
+            second, created = enqueue_scrape()
+        self.assertTrue(created)
+        self.assertNotEqual(second.pk, job.pk)
@@ -0,0 +1,84 @@
+from datetime import timedelta
+from io import StringIO
+from unittest.mock import patch
+
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from .base import ScrapeTestCase
+from ..metrics import source_trends
+from ..models import ScrapeRun, ScrapeSource, ScrapeSourceRun
+from ..scraper import scrape_events
+
+CARD_HTML = (
+    '<div class="hackathonCard"><a class="allhackname eventName text-decoration-none" '
+    'href="https://example.com/{slug}">{title}</a><div class="eventDescription">{desc}</div></div>'
+)
+
+
+class ScrapeMetricsTest(ScrapeTestCase):
+    def setUp(self):
+        self.source = ScrapeSource.objects.create(name="campus", url="https://example.com/events", parser="reskilll")
+
+    def _scrape(self, mock_get, cards):
+        html = "".join(CARD_HTML.format(slug=i, title=t, desc=d) for i, (t, d) in enumerate(cards))
+        mock_get.return_value.text = html
+        mock_get.return_value.content = html.encode()
+        run = ScrapeRun.objects.create(trigger='test')
+        scrape_events([self.source], run=run)
+        return run.source_runs.get()
+
+    @patch("events.scraper.requests.get")
+    def test_run_records_created_updated_unchanged(self, mock_get):
+        first = self._scrape(mock_get, [("A", "one"), ("B", "two")])
+        self.assertEqual((first.events_created, first.events_updated, first.events_unchanged), (2, 0, 0))
+        self.assertEqual(first.cards_found, 2)
+        self.assertGreater(first.bytes_downloaded, 0)
+        self.assertIsNotNone(first.fetch_ms)
+        self.assertIsNotNone(first.parse_ms)
+
+        second = self._scrape(mock_get, [("A", "one"), ("B", "changed")])
+        self.assertEqual((second.events_created, second.events_updated, second.events_unchanged), (0, 1, 1))
+
+    @patch("events.scraper.time.sleep")
+    @patch("events.scraper.requests.get")
+    def test_fetch_errors_are_recorded(self, mock_get, _sleep):
+        import requests
+        mock_get.side_effect = requests.RequestException("down")
+        run = ScrapeRun.objects.create()
+        scrape_events([self.source], run=run)
+        metrics = run.source_runs.get()
+        self.assertEqual(metrics.fetch_attempts, 3)
+        self.assertEqual(len(metrics.errors), 3)
+        self.assertFalse(metrics.succeeded)
+
+    def test_trends_flag_slowdown_and_card_drop(self):
+        now = timezone.now()
+        run = ScrapeRun.objects.create()
+        for days_ago, fetch_ms, cards in [(10, 100, 20), (9, 100, 20), (2, 400, 2), (1, 400, 2)]:
+            row = ScrapeSourceRun.objects.create(run=run, source="campus", url=self.source.url,
+                                                 fetch_ms=fetch_ms, parse_ms=5, cards_found=cards)
+            ScrapeSourceRun.objects.filter(pk=row.pk).update(started_at=now - timedelta(days=days_ago))
+
+        [entry] = source_trends(days=7, now=now)
+        self.assertEqual(entry["fetch_ms_ratio"], 4.0)
+        self.assertEqual(entry["cards_ratio"], 0.1)
+        self.assertIn("slower", entry["alerts"])
+        self.assertIn("fewer cards (markup change?)", entry["alerts"])
+
+        response = APIClient().get(reverse('scrape-stats'), {'days': 7})
+        self.assertEqual(response.data["sources"][0]["source"], "campus")
+        response = APIClient().get(reverse('scrape-runs'))
+        self.assertEqual(len(response.data[0]["source_runs"]), 4)
+        # Out-of-range values are clamped rather than failing
+        self.assertEqual(len(APIClient().get(reverse('scrape-runs'), {'limit': -1}).data), 1)
+        self.assertEqual(APIClient().get(reverse('scrape-stats'), {'days': 10 ** 10}).data["days"], 365)
+
+        out = StringIO()
+        call_command("scrape_stats", stdout=out)
+        self.assertIn("campus", out.getvalue())
+        out = StringIO()
+        call_command("scrape_stats", "--days", "0", stdout=out)
+        self.assertIn("Last 1 days", out.getvalue())
@@ -0,0 +1,46 @@
+from datetime import datetime, timezone as dt_timezone
+
+from django.test import SimpleTestCase
+
+from ..normalize import RegistrationDateParser, clean_date_string
+
+
+class RegistrationDateParserTest(SimpleTestCase):
+    def setUp(self):
+        self.parser = RegistrationDateParser(tz=dt_timezone.utc)
+
+    def test_clean_date_string(self):
+        self.assertEqual(clean_date_string("  Ends:  March 15th,\n 2025 "), "March 15, 2025")
+        self.assertEqual(clean_date_string("01 Mar 2025"), "01 Mar 2025")
+        self.assertEqual(clean_date_string("Registration starts - 1 Sept 2025"), "1 Sep 2025")
+
+    def test_parses_common_formats_to_aware_datetimes(self):
+        cases = {
+            "01 Mar 2025": datetime(2025, 3, 1),
+            "Ends: March 15th, 2025": datetime(2025, 3, 15),
+            "2025-04-02": datetime(2025, 4, 2),
+            "10 Apr 2025, 05:30 PM": datetime(2025, 4, 10, 17, 30),
+        }
+        for raw, expected in cases.items():
+            with self.subTest(raw=raw):
+                value = self.parser.parse(raw, source=raw)
+                self.assertEqual(value, expected.replace(tzinfo=dt_timezone.utc))
+                self.assertIsNotNone(value.tzinfo)
+
+    def test_learned_format_costs_one_strptime(self):
+        self.parser.parse("15 March 2025", source="reskilll")
+        self.assertEqual(self.parser.learned["reskilll"], "%d %B %Y")
+        calls = self.parser.strptime_calls
+        self.parser.parse("20 April 2025", source="reskilll")
+        self.assertEqual(self.parser.strptime_calls, calls + 1)
+
+    def test_normalize_events_batch(self):
+        events = [
+            {"title": "A", "registration_start": "01 Mar 2025", "registration_end": "15 Mar 2025"},
+            {"title": "B", "registration_start": None, "registration_end": "soon"},
+        ]
+        unparsed = self.parser.normalize_events(events, source="reskilll")
+        self.assertEqual(unparsed, ["soon"])
+        self.assertEqual(events[0]["registration_end"], datetime(2025, 3, 15, tzinfo=dt_timezone.utc))
+        self.assertIsNone(events[1]["registration_start"])
+        self.assertIsNone(events[1]["registration_end"])
@@ -0,0 +1,113 @@
+import json
+from unittest.mock import MagicMock, patch
+
+from django.core.exceptions import ValidationError
+from django.test import SimpleTestCase
+
+from .base import ScrapeTestCase
+from ..models import Event, ScrapeRun, ScrapeSource
+from ..parsers.devfolio import parse_devfolio_api
+from ..parsers.pagination import numbered_pages, offset_pages, with_query
+from ..scraper import scrape_events
+
+CARD_HTML = (
+    '<div class="hackathonCard"><a class="allhackname eventName text-decoration-none" '
+    'href="https://example.com/{slug}">{title}</a></div>'
+)
+BASE_URL = "https://example.com/events"
+
+
+def listing(*titles):
+    response = MagicMock()
+    response.text = "".join(CARD_HTML.format(slug=t.lower(), title=t) for t in titles)
+    response.content = response.text.encode()
+    return response
+
+
+class PagerTest(SimpleTestCase):
+    def test_numbered_pages_keep_existing_query(self):
+        pages = numbered_pages("page")(BASE_URL + "?sort=new")
+        self.assertEqual([next(pages), next(pages)], [
+            BASE_URL + "?sort=new&page=2",
+            BASE_URL + "?sort=new&page=3",
+        ])
+
+    def test_offset_pages_start_after_first_page(self):
+        pages = offset_pages("https://api.example.com/search", page_size=12)(BASE_URL)
+        self.assertEqual(next(pages), "https://api.example.com/search?offset=12&limit=12")
+        self.assertEqual(next(pages), "https://api.example.com/search?offset=24&limit=12")
+
+    def test_devfolio_api_page(self):
+        payload = {"hits": {"hits": [
+            {"_source": {"name": "Scroll Hack", "slug": "scroll", "tagline": "Found by scrolling",
+                         "starts_at": "2025-03-01T00:00:00+00:00", "ends_at": "bad date"}},
+            {"_source": {"slug": "untitled"}},
+        ]}}
+        events = parse_devfolio_api(json.dumps(payload), "https://devfolio.co/explore")
+        self.assertEqual(len(events), 1)
+        self.assertEqual(events[0]["link"], "https://scroll.devfolio.co/")
+        self.assertEqual(events[0]["registration_start"].year, 2025)
+        self.assertEqual(events[0]["registration_end"], "bad date")
+
+
+class ListingCrawlTest(ScrapeTestCase):
+    def setUp(self):
+        self.source = ScrapeSource.objects.create(
+            name="campus", url=BASE_URL, parser="reskilll", max_pages=5, page_concurrency=2)
+
+    def _scrape(self, mock_get, pages):
+        mock_get.side_effect = lambda url, **kwargs: pages.get(url, listing())
+        run = ScrapeRun.objects.create()
+        scrape_events([self.source], run=run)
+        return run.source_runs.get()
+
+    @patch("events.scraper.requests.get")
+    def test_follows_pages_until_an_empty_one(self, mock_get):
+        metrics = self._scrape(mock_get, {
+            BASE_URL: listing("A", "B"),
+            with_query(BASE_URL, page=2): listing("C"),
+            with_query(BASE_URL, page=3): listing("D"),
+        })
+        self.assertEqual(Event.objects.count(), 4)
+        self.assertEqual(metrics.cards_found, 4)
+        self.assertEqual(metrics.pages_fetched, 4)  # the empty page 4 ends the crawl
+        self.assertLessEqual(mock_get.call_count, 5)
+
+    @patch("events.scraper.requests.get")
+    def test_zero_page_concurrency_still_follows_pages(self, mock_get):
+        ScrapeSource.objects.filter(pk=self.source.pk).update(page_concurrency=0)
+        self.source.refresh_from_db()
+        metrics = self._scrape(mock_get, {
+            BASE_URL: listing("A"),
+            with_query(BASE_URL, page=2): listing("B"),
+        })
+        self.assertEqual(metrics.cards_found, 2)
+        with self.assertRaises(ValidationError):
+            self.source.full_clean()
+
+    @patch("events.scraper.requests.get")
+    def test_stops_when_a_page_has_nothing_new(self, mock_get):
+        pages = {
+            BASE_URL: listing("A", "B"),
+            with_query(BASE_URL, page=2): listing("C"),
+        }
+        self._scrape(mock_get, pages)
+        mock_get.reset_mock()
+
+        pages[BASE_URL] = listing("New", "A", "B")
+        metrics = self._scrape(mock_get, pages)
+        # Page 2 only holds events we already have, so page 3 is never read
+        self.assertEqual(metrics.pages_fetched, 2)
+        self.assertEqual(metrics.events_created, 1)
+
+        mock_get.reset_mock()
+        metrics = self._scrape(mock_get, pages)
+        self.assertEqual(metrics.pages_fetched, 1)
+
+    @patch("events.scraper.requests.get")
+    def test_site_ignoring_page_param_is_read_once(self, mock_get):
+        mock_get.side_effect = lambda url, **kwargs: listing("A", "B")
+        run = ScrapeRun.objects.create()
+        scrape_events([self.source], run=run)
+        self.assertEqual(run.source_runs.get().pages_fetched, 1)
+        self.assertEqual(Event.objects.count(), 2)
@@ -1,7 +1,12 @@
+from pathlib import Path
+
 from django.test import SimpleTestCase
+from ..parsers.backends import BACKENDS
 from ..parsers.reskilll import parse_reskilll
 from ..parsers.devfolio import parse_devfolio
 
+FIXTURES_DIR = Path(__file__).resolve().parent / "fixtures"
+
 
 class ParsersTest(SimpleTestCase):
     def test_parse_reskilll_empty(self):
@@ -13,3 +18,31 @@ class ParsersTest(SimpleTestCase):
         html = "<html><body></body></html>"
         result = parse_devfolio(html, "https://devfolio.co/explore")
         self.assertIsInstance(result, list)
+
+    def test_parse_reskilll_fixture(self):
+        html = (FIXTURES_DIR / "reskilll_allhacks.html").read_text()
+        events = parse_reskilll(html, "https://reskilll.com/allhacks")
+        self.assertEqual(len(events), 6)
+        first = events[0]
+        self.assertEqual(first["title"], "HackFest 2025")
+        self.assertEqual(first["image_url"], "https://reskilll.com/uploads/banners/hackfest-2025.png")
+        self.assertEqual(first["registration_start"], "01 Mar 2025")
+        self.assertEqual(first["registration_end"], "15 Mar 2025")
+        self.assertEqual(first["link"], "https://reskilll.com/hack/hackfest-2025")
+
+    def test_backends_produce_identical_output(self):
+        cases = [
+            (parse_reskilll, "reskilll_allhacks.html", "https://reskilll.com/allhacks"),
+            (parse_devfolio, "devfolio_explore.html", "https://devfolio.co/explore"),
+        ]
+        for parse, filename, base_url in cases:
+            html = (FIXTURES_DIR / filename).read_text()
+            reference = parse(html, base_url, backend="html.parser")
+            self.assertTrue(reference)
+            for backend in BACKENDS:
+                with self.subTest(parser=parse.__name__, backend=backend):
+                    self.assertEqual(parse(html, base_url, backend=backend), reference)
+
+    def test_unknown_backend(self):
+        with self.assertRaises(ValueError):
+            parse_reskilll("<html></html>", "https://reskilll.com/allhacks", backend="regex")
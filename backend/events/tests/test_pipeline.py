@@ -0,0 +1,67 @@
+import threading
+from unittest.mock import MagicMock, patch
+
+from django.test import override_settings
+
+from .base import ScrapeTestCase
+from ..models import Event, ScrapeRun, ScrapeSource
+from ..scraper import iter_scrape, scrape_events
+
+CARD_HTML = (
+    '<div class="hackathonCard"><a class="allhackname eventName text-decoration-none" '
+    'href="https://example.com/{slug}">{title}</a></div>'
+)
+
+
+def page(title):
+    response = MagicMock()
+    response.text = CARD_HTML.format(slug=title.lower(), title=title)
+    response.content = response.text.encode()
+    return response
+
+
+class ScrapePipelineTest(ScrapeTestCase):
+    def setUp(self):
+        self.sources = [
+            ScrapeSource.objects.create(name=f"site{n}", url=f"https://site{n}.example.com/", parser="reskilll",
+                                        priority=n)
+            for n in range(3)
+        ]
+
+    @patch("events.scraper.requests.get")
+    def test_first_source_is_saved_while_later_ones_download(self, mock_get):
+        gate = threading.Event()
+
+        def get(url, **kwargs):
+            if url != self.sources[0].url:
+                # Later sources only finish once the first source is in the database
+                gate.wait(5)
+            return page(url.split("//")[1].split(".")[0].title())
+        mock_get.side_effect = get
+
+        scrape = iter_scrape(self.sources, ScrapeRun.objects.create())
+        first = next(scrape)
+        self.assertEqual(first["title"], "Site0")
+        self.assertTrue(Event.objects.filter(title="Site0").exists())
+        self.assertFalse(gate.is_set())
+        gate.set()
+        self.assertEqual([e["title"] for e in scrape], ["Site1", "Site2"])
+
+    @override_settings(EVENTS_SCRAPE_PREFETCH=1)
+    @patch("events.scraper.requests.get")
+    def test_prefetch_bounds_pages_in_flight(self, mock_get):
+        mock_get.side_effect = lambda url, **kwargs: page("Hack" + url[12])
+        scrape = iter_scrape(self.sources, ScrapeRun.objects.create())
+        next(scrape)
+        # The page being saved plus at most one downloaded ahead
+        self.assertLessEqual(mock_get.call_count, 2)
+        list(scrape)
+        self.assertEqual(mock_get.call_count, 3)
+
+    @patch("events.scraper.requests.get")
+    def test_scrape_events_returns_run_totals(self, mock_get):
+        mock_get.side_effect = lambda url, **kwargs: page("Hack" + url[12])
+        summary = scrape_events(self.sources)
+        self.assertEqual(summary["events_created"], 3)
+        self.assertEqual(summary["cards_found"], 3)
+        self.assertEqual(ScrapeRun.objects.get(pk=summary["run_id"]).source_runs.count(), 3)
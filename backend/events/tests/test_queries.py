@@ -0,0 +1,112 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.core.cache import cache
+from django.db import connection
+from django.http import QueryDict
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.html import escape
+from rest_framework.test import APIClient
+
+from ..models import Event
+from ..views import EventListView
+from ..pagination import encode_cursor, keyset_paginate
+
+
+class EventQueryTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        now = timezone.now()
+        self.open_late = Event.objects.create(title="Open late", registration_start=now - timedelta(days=5),
+                                              registration_end=now + timedelta(days=20))
+        self.open_soon = Event.objects.create(title="Closing soon", registration_start=now - timedelta(days=5),
+                                              registration_end=now + timedelta(days=2))
+        self.no_start = Event.objects.create(title="No start", registration_end=now + timedelta(days=3))
+        self.closed = Event.objects.create(title="Closed", registration_start=now - timedelta(days=30),
+                                           registration_end=now - timedelta(days=1))
+        self.upcoming = Event.objects.create(title="Upcoming", registration_start=now + timedelta(days=4),
+                                             registration_end=now + timedelta(days=40))
+        self.undated = Event.objects.create(title="Undated")
+
+    def titles(self, params):
+        response = self.client.get(reverse('api-event-list'), params)
+        self.assertEqual(response.status_code, 200)
+        return [e["title"] for e in response.data["results"]]
+
+    def test_default_listing_is_newest_first(self):
+        self.assertEqual(self.titles({})[0], "Undated")
+
+    def test_open_now_sorted_by_deadline(self):
+        self.assertEqual(self.titles({"status": "open"}), ["Closing soon", "No start", "Open late"])
+
+    def test_closing_soon_window(self):
+        self.assertEqual(self.titles({"status": "closing_soon", "within": 2.5}), ["Closing soon"])
+
+    def test_upcoming(self):
+        self.assertEqual(self.titles({"status": "upcoming"}), ["Upcoming"])
+
+    def test_keyset_pages_follow_next_link(self):
+        seen = []
+        response = self.client.get(reverse('api-event-list'), {"ordering": "registration_end", "page_size": 2})
+        while True:
+            seen += [e["title"] for e in response.data["results"]]
+            if not response.data["next"]:
+                break
+            response = self.client.get(response.data["next"])
+        self.assertEqual(seen, ["Closed", "Closing soon", "No start", "Open late", "Upcoming"])
+
+    def test_ties_on_the_ordering_column_are_not_skipped(self):
+        same = timezone.now() + timedelta(days=100)
+        for i in range(5):
+            Event.objects.create(title=f"Tie {i}", registration_end=same)
+        qs = Event.objects.filter(registration_end=same)
+        rows, cursor = keyset_paginate(qs, "registration_end", page_size=2)
+        titles = [e.title for e in rows]
+        while cursor:
+            rows, cursor = keyset_paginate(qs, "registration_end", cursor, page_size=2)
+            titles += [e.title for e in rows]
+        self.assertEqual(titles, [f"Tie {i}" for i in range(5)])
+
+    def test_bad_parameters(self):
+        url = reverse('api-event-list')
+        self.assertEqual(self.client.get(url, {"status": "soon"}).status_code, 400)
+        self.assertEqual(self.client.get(url, {"cursor": "garbage"}).status_code, 400)
+        for within in ("1e20", "nan", "-1"):
+            self.assertEqual(self.client.get(url, {"status": "closing_soon", "within": within}).status_code, 400)
+
+    def test_html_next_link_keeps_filters(self):
+        for n in range(3):
+            Event.objects.create(title=f"Soon {n}", registration_end=timezone.now() + timedelta(hours=n + 1))
+        params = {"status": "closing_soon", "within": "1", "include": "archived"}
+        with mock.patch.object(EventListView, "paginate_by", 2):
+            first = self.client.get(reverse('event-list'), params)
+            query = QueryDict(first.context["next_query"])
+            self.assertEqual({key: query[key] for key in params}, params)
+            self.assertEqual(query["cursor"], first.context["next_cursor"])
+            self.assertContains(first, f'href="?{escape(first.context["next_query"])}"')
+
+            second = self.client.get(reverse('event-list') + "?" + first.context["next_query"])
+        titles = [e.title for e in first.context["events"]] + [e.title for e in second.context["events"]]
+        self.assertEqual(titles, ["Soon 0", "Soon 1", "Soon 2"])
+
+    def test_html_view_rejects_bad_parameters(self):
+        url = reverse('event-list')
+        impossible = encode_cursor("2024-13-45T00:00:00", 1)
+        self.assertEqual(self.client.get(url, {"status": "soon"}).status_code, 400)
+        self.assertEqual(self.client.get(url, {"ordering": "registration_end", "cursor": impossible}).status_code, 400)
+        self.assertEqual(self.client.get(url, {"status": "closing_soon", "within": "1e20"}).status_code, 400)
+
+    def test_open_query_uses_index(self):
+        if connection.vendor != "sqlite":
+            self.skipTest("query plan check is sqlite specific")
+        qs = Event.objects.filter(registration_end__gte=timezone.now()).order_by("registration_end", "id")
+        self.assertIn("event_reg_end_idx", qs.explain())
+
+    def test_html_view_paginates_with_cursor(self):
+        response = self.client.get(reverse('event-list'), {"status": "open"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([e.title for e in response.context["events"]], ["Closing soon", "No start", "Open late"])
+        self.assertIsNone(response.context["next_cursor"])
@@ -0,0 +1,85 @@
+import random
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from ..jobs import run_scheduled_scrape
+from ..models import ScrapeJob, ScrapeSource, SchedulerLock
+from ..scheduler import JOBS, PeriodicJob, Scheduler
+
+
+class SchedulerTest(TestCase):
+    def setUp(self):
+        self.calls = []
+        self.jobs = {"ping": PeriodicJob("ping", lambda: self.calls.append("ping"), interval=60)}
+
+    def scheduler(self, owner):
+        return Scheduler(jobs=self.jobs, owner=owner, rng=random.Random(1))
+
+    def test_only_the_leader_runs_jobs(self):
+        now = timezone.now()
+        leader, follower = self.scheduler("a"), self.scheduler("b")
+        self.assertEqual(leader.tick(now, force=True), ["ping"])
+        self.assertEqual(follower.tick(now, force=True), [])
+        self.assertEqual(self.calls, ["ping"])
+        self.assertEqual(SchedulerLock.objects.get().owner, "a")
+
+    @override_settings(EVENTS_SCHEDULER_LOCK_TTL=30)
+    def test_expired_lease_is_taken_over(self):
+        now = timezone.now()
+        self.scheduler("a").acquire(now)
+        follower = self.scheduler("b")
+        self.assertFalse(follower.acquire(now + timedelta(seconds=10)))
+        self.assertTrue(follower.acquire(now + timedelta(seconds=31)))
+        self.assertEqual(SchedulerLock.objects.get().owner, "b")
+
+    def test_release_frees_the_lease(self):
+        leader = self.scheduler("a")
+        leader.acquire()
+        leader.release()
+        self.assertTrue(self.scheduler("b").acquire())
+
+    def test_jobs_run_on_jittered_interval(self):
+        scheduler = self.scheduler("a")
+        now = timezone.now()
+        # The first run is spread over the first jitter window
+        scheduler.tick(now)
+        scheduler.tick(now + timedelta(seconds=6))
+        self.assertEqual(self.calls, ["ping"])
+        wait = scheduler.seconds_until_next()
+        self.assertTrue(54 <= wait <= 66, wait)
+        self.assertEqual(scheduler.tick(timezone.now() + timedelta(seconds=30)), [])
+
+    def test_failing_job_does_not_stop_the_others(self):
+        self.jobs["boom"] = PeriodicJob("boom", lambda: 1 / 0, interval=60)
+        with self.assertLogs("events.scheduler", "ERROR"):
+            ran = self.scheduler("a").tick(force=True)
+        self.assertEqual(ran, ["ping", "boom"])
+
+    def test_scrape_job_is_registered(self):
+        self.assertIn("scrape", JOBS)
+
+
+class ScheduledScrapeTest(TestCase):
+    def setUp(self):
+        ScrapeSource.objects.create(name="campus", url="https://example.com/events", parser="reskilll")
+
+    @patch("events.sources.CODE_SOURCES", {})
+    @patch("events.scraper.scrape_events", return_value={
+        "run_id": 1, "cards_found": 0, "events_created": 0, "events_updated": 0,
+        "events_unchanged": 0, "duplicates_merged": 0,
+    })
+    def test_runs_due_sources_in_the_scrape_slot(self, scrape):
+        job_id = run_scheduled_scrape()
+        self.assertEqual([s.name for s in scrape.call_args.args[0]], ["campus"])
+        job = ScrapeJob.objects.get(pk=job_id)
+        self.assertEqual(job.status, ScrapeJob.SUCCEEDED)
+        self.assertEqual(job.runs.get().trigger, "scheduler")
+
+    @patch("events.scraper.scrape_events")
+    def test_skips_while_another_scrape_is_active(self, scrape):
+        ScrapeJob.objects.create(active_slot=ScrapeJob.ACTIVE_SLOT)
+        self.assertIsNone(run_scheduled_scrape())
+        scrape.assert_not_called()
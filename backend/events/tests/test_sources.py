@@ -0,0 +1,79 @@
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.core.exceptions import ValidationError
+from django.utils import timezone
+
+from .base import ScrapeTestCase
+from ..models import ScrapeRun, ScrapeSource
+from ..scraper import iter_scrape
+from ..sources import due_sources, get_sources, seconds_until_next_due, sync_code_sources
+
+
+class ScrapeSourceRegistryTest(ScrapeTestCase):
+    def setUp(self):
+        sync_code_sources()
+
+    def test_code_sources_are_synced(self):
+        names = [s.name for s in get_sources()]
+        self.assertEqual(names, ["reskilll", "devfolio"])
+        self.assertTrue(ScrapeSource.objects.get(name="reskilll").declared_in_code)
+
+    def test_db_declared_source_is_scheduled(self):
+        ScrapeSource.objects.create(name="campus", url="https://example.com/events",
+                                    parser="reskilll", priority=1)
+        self.assertEqual(get_sources()[0].name, "campus")
+
+    def test_sync_keeps_admin_controlled_fields(self):
+        ScrapeSource.objects.filter(name="devfolio").update(enabled=False)
+        sync_code_sources()
+        self.assertNotIn("devfolio", [s.name for s in get_sources()])
+
+    def test_lookups_do_not_rewrite_sources(self):
+        # One read each, no update_or_create per code source
+        with self.assertNumQueries(2):
+            get_sources()
+            seconds_until_next_due()
+
+    def test_due_sources_follow_each_interval(self):
+        now = timezone.now()
+        ScrapeSource.objects.filter(name="reskilll").update(last_scraped_at=now - timedelta(minutes=31))
+        ScrapeSource.objects.filter(name="devfolio").update(last_scraped_at=now - timedelta(minutes=31))
+        self.assertEqual([s.name for s in due_sources(now)], ["reskilll"])
+        self.assertAlmostEqual(seconds_until_next_due(now), 0)
+
+        ScrapeSource.objects.filter(name="reskilll").update(last_scraped_at=now)
+        self.assertEqual(due_sources(now), [])
+        self.assertAlmostEqual(seconds_until_next_due(now), 30 * 60)
+
+    @patch("events.scraper.requests.get")
+    def test_scrape_dispatches_to_source_parser(self, mock_get):
+        mock_get.return_value.text = (
+            '<div class="hackathonCard"><a class="allhackname eventName text-decoration-none" '
+            'href="https://example.com/e">Campus Hack</a></div>'
+        )
+        mock_get.return_value.content = mock_get.return_value.text.encode()
+        source = ScrapeSource.objects.create(name="campus", url="https://example.com/events",
+                                             parser="reskilll", timeout=3)
+        events = list(iter_scrape([source]))
+        self.assertEqual([e["title"] for e in events], ["Campus Hack"])
+        self.assertEqual(mock_get.call_args.kwargs["timeout"], 3)
+        source.refresh_from_db()
+        self.assertIsNotNone(source.last_scraped_at)
+
+    @patch("events.scraper.requests.get")
+    def test_unknown_parser_skips_only_that_source(self, mock_get):
+        mock_get.return_value.text = (
+            '<div class="hackathonCard"><a class="allhackname eventName text-decoration-none" '
+            'href="https://example.com/e">Campus Hack</a></div>'
+        )
+        mock_get.return_value.content = mock_get.return_value.text.encode()
+        broken = ScrapeSource(name="typo", url="https://example.com/typo", parser="reskill", priority=1)
+        with self.assertRaises(ValidationError):
+            broken.full_clean()
+        broken.save()
+        source = ScrapeSource.objects.create(name="campus", url="https://example.com/events", parser="reskilll")
+        run = ScrapeRun.objects.create()
+        events = list(iter_scrape([broken, source], run=run))
+        self.assertEqual([e["title"] for e in events], ["Campus Hack"])
+        self.assertIn("No parser registered under 'reskill'", run.source_runs.get(source="typo").errors[0])
@@ -0,0 +1,153 @@
+import asyncio
+import itertools
+import threading
+from unittest.mock import MagicMock, patch
+
+from django.test import SimpleTestCase
+from django.urls import reverse
+
+from .base import ScrapeTestCase
+from ..models import ScrapeRun, ScrapeSource
+from ..scraper import scrape_events
+from ..stream import RESYNC, Broadcaster, sse_frames
+
+
+def run(coro):
+    return asyncio.run(asyncio.wait_for(coro, 5))
+
+
+# Streams start a thread that polls the events version, which lives in the database cache
+@patch("events.stream.get_events_version", return_value="1")
+class BroadcasterTest(SimpleTestCase):
+    def test_publish_from_another_thread_reaches_every_stream(self, _version):
+        hub = Broadcaster()
+
+        async def scenario():
+            streams = [sse_frames(hub=hub) for _ in range(3)]
+            for stream in streams:
+                self.assertTrue((await anext(stream)).startswith(b"retry:"))
+            # The generators subscribed on their first step
+            self.assertEqual(hub.subscriber_count, 3)
+            publisher = threading.Thread(target=hub.publish, args=("created", {"id": 1, "title": "Push Hack"}))
+            publisher.start()
+            frames = [await anext(stream) for stream in streams]
+            publisher.join()
+            for stream in streams:
+                await stream.aclose()
+            return frames
+
+        frames = run(scenario())
+        self.assertEqual(len(set(frames)), 1)
+        self.assertEqual(frames[0], b'id: 1\nevent: created\ndata: {"id":1,"title":"Push Hack"}\n\n')
+        self.assertEqual(hub.subscriber_count, 0)
+
+    def test_reconnect_replays_missed_frames(self, _version):
+        hub = Broadcaster(replay_size=2)
+        for n in range(3):
+            hub.publish("updated", {"id": n})
+
+        async def backlog(last_event_id):
+            stream = sse_frames(last_event_id, hub=hub)
+            await anext(stream)
+            frames = [await anext(stream)]
+            await stream.aclose()
+            return frames
+
+        self.assertIn(b"id: 3\n", run(backlog(2))[0])
+        # Frame 2 has already left the two-frame buffer
+        self.assertEqual(run(backlog(0)), [RESYNC])
+
+    def test_slow_client_is_told_to_resync(self, _version):
+        hub = Broadcaster(queue_size=2)
+
+        async def scenario():
+            stream = sse_frames(hub=hub)
+            await anext(stream)
+            for n in range(3):
+                hub.publish("created", {"id": n})
+            await asyncio.sleep(0)
+            frame = await anext(stream)
+            await stream.aclose()
+            return frame
+
+        self.assertEqual(run(scenario()), RESYNC)
+
+    def test_idle_stream_sends_keepalive(self, _version):
+        async def scenario():
+            stream = sse_frames(keepalive=0.01, hub=Broadcaster())
+            await anext(stream)
+            frame = await anext(stream)
+            await stream.aclose()
+            return frame
+
+        self.assertEqual(run(scenario()), b": keepalive\n\n")
+
+
+    def test_version_moved_elsewhere_resyncs_streams(self, version):
+        hub = Broadcaster(version_poll=0.01)
+
+        # Read once when the watcher starts, then moved on by another process
+        version.side_effect = itertools.chain(["1"], itertools.repeat("2"))
+
+        async def next_frame(stream):
+            await anext(stream)
+            frame = await anext(stream)
+            await stream.aclose()
+            return frame
+
+        self.assertEqual(run(next_frame(sse_frames(keepalive=5, hub=hub))), b"id: 1\nevent: resync\ndata: {}\n\n")
+
+    def test_locally_published_version_does_not_resync(self, version):
+        hub = Broadcaster(version_poll=0.01)
+
+        version.side_effect = itertools.chain(["1"], itertools.repeat("2"))
+        hub.mark_published("2")
+
+        async def next_frame(stream):
+            await anext(stream)
+            frame = await anext(stream)
+            await stream.aclose()
+            return frame
+
+        self.assertEqual(run(next_frame(sse_frames(keepalive=0.1, hub=hub))), b": keepalive\n\n")
+
+
+class ScrapePublishTest(ScrapeTestCase):
+    @patch("events.stream.broadcaster")
+    @patch("events.scraper.requests.get")
+    def test_scrape_publishes_created_and_updated_events(self, mock_get, hub):
+        source = ScrapeSource.objects.create(name="campus", url="https://example.com/events", parser="reskilll")
+
+        def scrape(title, description):
+            response = MagicMock()
+            response.text = (
+                '<div class="hackathonCard"><a class="allhackname eventName text-decoration-none" '
+                f'href="https://example.com/a">{title}</a><div class="eventDescription">{description}</div></div>'
+            )
+            response.content = response.text.encode()
+            mock_get.return_value = response
+            with self.captureOnCommitCallbacks(execute=True):
+                scrape_events([source], run=ScrapeRun.objects.create())
+
+        scrape("Push Hack", "first")
+        scrape("Push Hack", "first")
+        scrape("Push Hack", "second")
+        kinds = [call.args[0] for call in hub.publish.call_args_list]
+        self.assertEqual(kinds, ["created", "updated"])
+        self.assertEqual(hub.publish.call_args.args[1]["description"], "second")
+
+
+@patch("events.stream.get_events_version", return_value="1")
+class EventStreamViewTest(SimpleTestCase):
+    async def test_stream_response(self, _version):
+        response = await self.async_client.get(reverse("event-stream"), headers={"Last-Event-ID": "x"})
+        self.assertEqual(response["Content-Type"], "text/event-stream")
+        self.assertEqual(response["Cache-Control"], "no-cache")
+        stream = aiter(response.streaming_content)
+        self.assertTrue((await anext(stream)).startswith(b"retry:"))
+        await stream.aclose()
+
+    def test_wsgi_request_gets_no_content(self, _version):
+        # A WSGI server would buffer the endless stream, so the client is told to poll instead
+        response = self.client.get(reverse("event-stream"))
+        self.assertEqual(response.status_code, 204)
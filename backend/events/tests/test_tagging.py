@@ -0,0 +1,83 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from ..archival import archive_expired_events
+from ..cache import get_events_version
+from ..models import Event, EventTag
+from ..tagging import EventTagger, extract_tags
+
+
+class ExtractTagsTest(TestCase):
+    def test_matches_synonyms_and_phrases(self):
+        self.assertEqual(
+            extract_tags("GenAI Hackathon 2025", "Build with machine learning on the Ethereum blockchain."),
+            ["ai", "web3"],
+        )
+
+    def test_phrases_match_whole_words_only(self):
+        # "air" and "fair" contain "ai" but are not the AI tag
+        self.assertEqual(extract_tags("Air quality fair", "A civic tech sprint"), ["social-good"])
+
+    def test_punctuation_and_case_are_ignored(self):
+        self.assertEqual(extract_tags("Open-Source WEEK", "Internet-of-Things & AR/VR"), ["ar-vr", "iot", "open-source"])
+
+
+class EventTagFilterTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        now = timezone.now()
+        self.ai = Event.objects.create(title="ML Sprint", description="Deep learning challenge",
+                                       registration_end=now + timedelta(days=5))
+        self.both = Event.objects.create(title="DeFi x AI", description="Payments on the blockchain",
+                                         registration_end=now + timedelta(days=6))
+        self.none = Event.objects.create(title="Design jam", registration_end=now + timedelta(days=7))
+        EventTagger().sync([self.ai.pk, self.both.pk, self.none.pk])
+
+    def titles(self, params):
+        response = self.client.get(reverse('api-event-list'), params)
+        self.assertEqual(response.status_code, 200)
+        return sorted(e["title"] for e in response.data["results"])
+
+    def test_filter_by_tag(self):
+        self.assertEqual(self.titles({"tag": "ai"}), ["DeFi x AI", "ML Sprint"])
+
+    def test_repeated_tags_must_all_match(self):
+        self.assertEqual(self.titles({"tag": ["ai", "web3"]}), ["DeFi x AI"])
+
+    def test_unknown_tag_is_rejected(self):
+        response = self.client.get(reverse('api-event-list'), {"tag": "nope"})
+        self.assertEqual(response.status_code, 400)
+
+    def test_tags_are_serialized(self):
+        response = self.client.get(reverse('api-event-list'), {"tag": "web3"})
+        self.assertEqual(response.data["results"][0]["tags"], ["ai", "fintech", "web3"])
+
+    def test_sync_replaces_stale_tags(self):
+        Event.objects.filter(pk=self.ai.pk).update(title="Robot race", description="")
+        EventTagger().sync([self.ai.pk])
+        tags = list(EventTag.objects.filter(event_id=self.ai.pk).values_list("tag__name", flat=True))
+        self.assertEqual(tags, ["robotics"])
+        # Nothing left to change
+        self.assertEqual(EventTagger().sync([self.ai.pk]), 0)
+
+    def test_archived_events_keep_their_tags(self):
+        Event.objects.filter(pk=self.ai.pk).update(registration_end=timezone.now() - timedelta(days=3))
+        archive_expired_events()
+        cache.clear()
+        self.assertEqual(self.titles({"tag": "ai"}), ["DeFi x AI"])
+        response = self.client.get(reverse('api-event-list'), {"tag": "ai", "include": "archived"})
+        archived = [e for e in response.data["results"] if e["archived"]]
+        self.assertEqual([(e["title"], e["tags"]) for e in archived], [("ML Sprint", ["ai"])])
+
+    def test_backfill_command_invalidates_cached_pages(self):
+        before = get_events_version()
+        call_command("tag_events", stdout=StringIO())
+        self.assertNotEqual(get_events_version(), before)
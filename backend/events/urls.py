@@ -1,9 +1,16 @@
 from django.urls import path
-from .views import EventListView, run_scraper
-from .views_api import list_events
+from .views import EventListView, event_image, event_stream, events_calendar, run_scraper, scrape_job_status
+from .views_api import event_detail, list_events, scrape_runs, scrape_stats
 
 urlpatterns = [
     path('events/', EventListView.as_view(), name='event-list'),  # List of stored events (HTML)
-    path('scrape/', run_scraper, name='run-scraper'),  # Runs the scraper and returns latest data
+    path('scrape/', run_scraper, name='run-scraper'),  # Enqueues a scrape job and returns its id
+    path('scrape/<int:job_id>/', scrape_job_status, name='scrape-job-status'),  # Poll a scrape job
+    path('scrape/runs/', scrape_runs, name='scrape-runs'),  # Run history with per-source metrics
+    path('scrape/stats/', scrape_stats, name='scrape-stats'),  # Per-source trend summary
     path('api/events/', list_events, name='api-event-list'),  # JSON paginated events for frontend
+    path('calendar.ics', events_calendar, name='events-calendar'),  # iCalendar feed of registration windows
+    path('stream/', event_stream, name='event-stream'),  # Server-sent events of new/changed events
+    path('api/events/<int:event_id>/', event_detail, name='api-event-detail'),  # JSON single event
+    path('images/<str:key>/<str:variant>.jpg', event_image, name='event-image'),  # Cached, resized banners
 ]
@@ -1,66 +1,156 @@
-from django.shortcuts import render
-from django.views.generic import ListView
+import hashlib
+from datetime import datetime, timezone as dt_timezone
 
-from .scraper import scrape_events
-from .models import Event
-import requests
-from bs4 import BeautifulSoup
-from django.http import JsonResponse
+from django.core.exceptions import BadRequest
+from django.core.handlers.asgi import ASGIRequest
+from django.http import FileResponse, Http404, HttpResponse, JsonResponse, StreamingHttpResponse
+from django.shortcuts import render, get_object_or_404
+from django.urls import reverse
+from django.views.decorators.http import condition, require_GET
+from django.views.generic import ListView
 from rest_framework.decorators import api_view
 
+from . import images
+from .cache import get_events_version
+from .ical import stream_calendar
+from .stream import sse_frames
+from .jobs import enqueue_scrape, job_payload
+from .models import Event, ScrapeJob
+from .pagination import InvalidCursor, keyset_paginate
+from .queries import filter_events, listed_events
+
 # Create your views here.
 
 class EventListView(ListView):
     model = Event
     template_name = 'events/event_list.html'
     context_object_name = 'events'
+    paginate_by = 20
+
+    def get_queryset(self):
+        try:
+            # Closed events live in the archive table and are only listed with ?include=archived
+            qs, self.ordering = listed_events(Event.objects.all(), self.request.GET)
+        except ValueError as e:
+            raise BadRequest(str(e))
+        return qs
+
+    def paginate_queryset(self, queryset, page_size):
+        # Keyset pagination instead of ListView's OFFSET-based Paginator
+        try:
+            rows, self.next_cursor = keyset_paginate(queryset, self.ordering, self.request.GET.get('cursor'), page_size)
+        except InvalidCursor as e:
+            raise BadRequest(str(e))
+        return None, None, rows, self.next_cursor is not None
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['next_cursor'] = self.next_cursor
+        context['ordering'] = self.ordering
+        if self.next_cursor:
+            # Keep every filter (status, within, tag, include, ...) and move only the cursor
+            query = self.request.GET.copy()
+            query['ordering'] = self.ordering
+            query['cursor'] = self.next_cursor
+            context['next_query'] = query.urlencode()
+        return context
 
+@api_view(['GET', 'POST'])
 def run_scraper(request):
-    url = "https://reskilll.com/allhacks"
-    response = requests.get(url)
-    soup = BeautifulSoup(response.content, 'html.parser')
-
-    event_list = soup.find_all("div", class_="hackathonCard")
-    events = []
-
-    for card in event_list:
-        event_name_tag = card.find('a', class_='allhackname eventName text-decoration-none')
-        image_tag = card.find("img")
-        event_description_tag = card.find('div', class_='eventDescription')
-        registration_start_tag = card.find_all('div', class_='hackresgiterdate')[0] if len(card.find_all('div', class_='hackresgiterdate')) > 0 else None
-        registration_end_tag = card.find_all('div', class_='hackresgiterdate')[1] if len(card.find_all('div', class_='hackresgiterdate')) > 1 else None
-        link_tag = card.find("a", href=True)
-
-        event_name = event_name_tag.get_text(strip=True) if event_name_tag else "No title found"
-        image_url = image_tag["src"] if image_tag and "src" in image_tag.attrs else "No image"
-        event_description = event_description_tag.get_text(strip=True) if event_description_tag else "No description found"
-        registration_start = registration_start_tag.get_text(strip=True) if registration_start_tag else "No start date found"
-        registration_end = registration_end_tag.get_text(strip=True) if registration_end_tag else "No end date found"
-        event_url = link_tag["href"] if link_tag else "No link found"
-
-        events.append({
-            "title": event_name,
-            "image": image_url,
-            "description": event_description,
-            "registration_start": registration_start,
-            "registration_end": registration_end,
-            "event_url": event_url
-        })
+    """Enqueue a scrape job and return its id straight away.
+
+    If a scrape is already queued or running the caller joins that job
+    instead of starting another one. Poll the returned status_url for progress.
+    """
+    job, created = enqueue_scrape()
+    payload = job_payload(job)
+    payload["deduplicated"] = not created
+    payload["status_url"] = request.build_absolute_uri(reverse('scrape-job-status', args=[job.pk]))
+    return JsonResponse(payload, status=202)
+
 
 @api_view(['GET'])
-def run_scraper(request):
-    """Endpoint to trigger the scraper and return the latest events"""
-    # Run the scraper and save to database
-    events = scrape_events()
-    
-    # Count how many events have newly created=True
-    new_event_count = sum(1 for event in events if event.get('newly_created', False))
-    
-    # Return the scraped events with count info
-    return JsonResponse({
-        "status": 200,
-        "message": f"Successfully scraped {len(events)} events. Found {new_event_count} new events!",
-        "events": events,
-        "new_event_count": new_event_count,
-        "total_event_count": len(events)
-    })
+def scrape_job_status(request, job_id):
+    """Return the state of a scrape job, including its summary once finished."""
+    job = get_object_or_404(ScrapeJob, pk=job_id)
+    return JsonResponse(job_payload(job))
+
+
+def _calendar_etag(request):
+    return hashlib.sha1(f"{get_events_version()}:{request.GET.urlencode()}".encode()).hexdigest()
+
+
+def _calendar_last_modified(request):
+    try:
+        return datetime.fromtimestamp(float(get_events_version()), tz=dt_timezone.utc)
+    except (TypeError, ValueError):
+        return None
+
+
+@require_GET
+@condition(etag_func=_calendar_etag, last_modified_func=_calendar_last_modified)
+def events_calendar(request):
+    """iCalendar feed of registration windows, streamed row by row.
+
+    Accepts the same ?status= filter as the JSON list. The ETag and
+    Last-Modified follow the events version, so polling calendar clients
+    get 304s until a scrape changes something.
+    """
+    try:
+        qs, _ = filter_events(Event.objects.filter(registration_end__isnull=False), request.GET)
+    except ValueError as e:
+        return JsonResponse({'error': str(e)}, status=400)
+    qs = qs.order_by('registration_end', 'id').only(
+        'id', 'title', 'description', 'link', 'event_url',
+        'registration_start', 'registration_end', 'updated_at',
+    )
+    response = StreamingHttpResponse(
+        stream_calendar(qs.iterator(chunk_size=500)),
+        content_type='text/calendar; charset=utf-8',
+    )
+    response['Content-Disposition'] = 'inline; filename="collegeconnect-events.ics"'
+    response['Cache-Control'] = 'public, max-age=300'
+    return response
+
+
+@require_GET
+def event_image(request, key, variant):
+    """Serve a resized banner from the local image cache.
+
+    Only images cached during a scrape are served; anything else is a 404,
+    so this never fetches remote URLs on behalf of a visitor. A key always
+    maps to the same remote URL, so responses are cacheable for a year.
+    """
+    handle = images.open_variant(key, variant)
+    if handle is None:
+        raise Http404("Image not cached")
+    response = FileResponse(handle, content_type='image/jpeg')
+    response['Cache-Control'] = 'public, max-age=31536000, immutable'
+    return response
+
+
+@require_GET
+async def event_stream(request):
+    """Server-sent events stream of created and updated events.
+
+    Each message is ``event: created|updated`` with the serialized event as
+    data. Reconnecting clients send Last-Event-ID and get what they missed;
+    a ``resync`` message means they fell too far behind and should refetch
+    the list. Serve the app over ASGI (collegeconnect.asgi) so idle
+    connections do not each hold a worker thread.
+
+    Under WSGI (plain ``runserver``) the stream would be buffered to the end
+    and never reach the client, so it answers 204 instead: EventSource stops
+    reconnecting on 204 and the page falls back to polling the list.
+    """
+    if not isinstance(request, ASGIRequest):
+        return HttpResponse(status=204)
+    try:
+        last_event_id = int(request.headers.get('Last-Event-ID', ''))
+    except ValueError:
+        last_event_id = None
+    response = StreamingHttpResponse(sse_frames(last_event_id), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    # Stop nginx from buffering the stream
+    response['X-Accel-Buffering'] = 'no'
+    return response
@@ -1,17 +1,81 @@
 from rest_framework.decorators import api_view
 from rest_framework.response import Response
 from rest_framework import status
-from rest_framework.pagination import PageNumberPagination
-from .models import Event
-from .serializers import EventSerializer
+from rest_framework.utils.urls import replace_query_param
+from .cache import conditional_response, get_cached, request_key
+from .metrics import source_trends, trend_days
+from .models import ArchivedEvent, Event, ScrapeRun
+from .pagination import keyset_paginate
+from .queries import listed_events
+from .serializers import ScrapeRunSerializer, serialize_events
+
+
+PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
 
 
 @api_view(['GET'])
 def list_events(request):
-    """Return a paginated list of events as JSON."""
-    qs = Event.objects.order_by('-id')
-    paginator = PageNumberPagination()
-    paginator.page_size = 20
-    result_page = paginator.paginate_queryset(qs, request)
-    serializer = EventSerializer(result_page, many=True)
-    return paginator.get_paginated_response(serializer.data)
+    """Return a keyset-paginated list of events as JSON.
+
+    Supports ?status=open|closing_soon|upcoming, ?tag= (repeatable), ?ordering= and ?cursor=
+    (taken from the previous page's ``next`` link). Events whose registration
+    closed are archived and only listed with ?include=archived. Responses
+    are cached per events version and carry an ETag for conditional GETs.
+    """
+    entry = get_cached(request_key('list', request), lambda: _list_events_payload(request))
+    return conditional_response(request, entry, Response)
+
+
+def _list_events_payload(request):
+    try:
+        qs, ordering = listed_events(Event.objects.prefetch_related('sources', 'event_tags__tag'), request.query_params)
+        page_size = max(1, min(int(request.query_params.get('page_size', PAGE_SIZE)), MAX_PAGE_SIZE))
+        rows, next_cursor = keyset_paginate(qs, ordering, request.query_params.get('cursor'), page_size)
+    except ValueError as e:
+        return {'error': str(e)}, status.HTTP_400_BAD_REQUEST
+
+    next_url = None
+    if next_cursor:
+        next_url = replace_query_param(request.build_absolute_uri(), 'cursor', next_cursor)
+    results = serialize_events(rows, context={'request': request})
+    return {'next': next_url, 'ordering': ordering, 'results': results}, status.HTTP_200_OK
+
+
+@api_view(['GET'])
+def event_detail(request, event_id):
+    """Return a single event, cached and ETagged like the list.
+
+    Falls back to the archive so links to closed events keep working.
+    """
+    entry = get_cached(request_key('detail', request), lambda: _event_detail_payload(request, event_id))
+    return conditional_response(request, entry, Response)
+
+
+def _event_detail_payload(request, event_id):
+    event = (Event.objects.prefetch_related('sources', 'event_tags__tag').filter(pk=event_id).first()
+             or ArchivedEvent.objects.filter(pk=event_id).first())
+    if event is None:
+        return {'error': 'Event not found.'}, status.HTTP_404_NOT_FOUND
+    return serialize_events([event], context={'request': request})[0], status.HTTP_200_OK
+
+
+@api_view(['GET'])
+def scrape_runs(request):
+    """Return the most recent scrape runs with their per-source metrics."""
+    try:
+        limit = max(1, min(int(request.query_params.get('limit', 20)), 200))
+    except ValueError:
+        return Response({'error': 'limit must be an integer'}, status=status.HTTP_400_BAD_REQUEST)
+    runs = ScrapeRun.objects.prefetch_related('source_runs')[:limit]
+    return Response(ScrapeRunSerializer(runs, many=True).data)
+
+
+@api_view(['GET'])
+def scrape_stats(request):
+    """Per-source trends: this window's averages against the previous window's."""
+    try:
+        days = trend_days(int(request.query_params.get('days', 7)))
+    except ValueError:
+        return Response({'error': 'days must be an integer'}, status=status.HTTP_400_BAD_REQUEST)
+    return Response({'days': days, 'sources': source_trends(days=days)})
@@ -0,0 +1,204 @@
+"""Generate one letter template for many data records.
+
+Records come as JSON Lines (one object per line) or CSV (one row per
+letter, header row naming the fields). They are read twice, both times as
+a stream: first every record is validated with the template's cached
+validator, so a bad row fails the batch before anything is rendered; then
+the letters are rendered on the render pool, a few at a time.
+
+Output is either
+
+* a ZIP with one PDF per record, written and sent entry by entry, so memory
+  stays flat however many records the batch has, or
+* one merged PDF, built as a single document with a page break between
+  letters; it is held in memory, so it is capped at
+  ``LETTERS_BATCH_MERGE_MAX`` records (default 200).
+"""
+import csv
+import io
+import json
+import zipfile
+from collections import deque
+from concurrent.futures import Future
+from itertools import islice
+
+from django.conf import settings
+
+from . import render_pool
+from .render_plan import plan_for, render_merged_in_worker
+from .validation import validation_errors
+
+FORMATS = ("zip", "pdf")
+DEFAULT_MERGE_MAX = 200
+# Validation errors reported before the rest are summarized
+MAX_REPORTED_ERRORS = 50
+
+
+class BatchError(ValueError):
+    pass
+
+
+def record_format(name="", content_type=""):
+    """Guess 'csv' or 'jsonl' from an upload's file name or content type."""
+    if name.lower().endswith(".csv") or "csv" in (content_type or ""):
+        return "csv"
+    return "jsonl"
+
+
+def iter_records(stream, fmt):
+    """Yield data dicts from a binary JSON Lines or CSV stream. Raises BatchError for bad input."""
+    text = io.TextIOWrapper(stream, encoding="utf-8-sig", newline="")
+    try:
+        if fmt == "csv":
+            yield from csv.DictReader(text)
+            return
+        for number, line in enumerate(text, start=1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError as e:
+                raise BatchError(f"Line {number} is not valid JSON: {e}")
+            if not isinstance(record, dict):
+                raise BatchError(f"Line {number} is not a JSON object")
+            yield record
+    except UnicodeDecodeError:
+        raise BatchError("Records must be UTF-8 text.")
+    except csv.Error as e:
+        raise BatchError(f"Records are not valid CSV: {e}")
+    finally:
+        # Leave the underlying stream open for the second pass
+        text.detach()
+
+
+def validate_records(template, records):
+    """Validate every record; returns ``(count, errors)`` with errors as "record N: message"."""
+    count = 0
+    errors = []
+    for count, record in enumerate(records, start=1):
+        if not template.validation_schema:
+            continue
+        for message in validation_errors(template, record, all_errors=True):
+            if len(errors) < MAX_REPORTED_ERRORS:
+                errors.append(f"record {count}: {message}")
+            elif len(errors) == MAX_REPORTED_ERRORS:
+                errors.append("... further errors not shown")
+    return count, errors
+
+
+def render_records(template, records):
+    """Yield ``(index, record, pdf)`` in input order, rendering in parallel on the pool.
+
+    ``pdf`` is the PDF bytes or the renderer's error dict; a letter the pool
+    could not take or finish in time gets an error dict too, so one slow
+    record does not cut the batch short. At most two renders per worker are
+    in flight, so finished PDFs do not pile up while the caller is still
+    sending earlier ones.
+    """
+    if render_pool.workers() <= 0:
+        for index, record in enumerate(records, start=1):
+            yield index, record, render_pool.render_pdf(template, record)
+        return
+
+    if not isinstance(template.pdf_structure, dict):
+        raise ValueError("Invalid pdf structure: expected a dict")
+    pool = render_pool.get_pool()
+    key = (template.pk, template.version)
+    window = deque()
+    for index, record in enumerate(records, start=1):
+        if len(window) >= 2 * pool.worker_count:
+            done_index, done_record, future = window.popleft()
+            yield done_index, done_record, _result(future, template)
+        try:
+            # Batches wait for a free slot instead of failing like single requests
+            future = pool.submit(key, template.pdf_structure, record, wait=render_pool.render_timeout())
+        except render_pool.RenderUnavailable as e:
+            future = Future()
+            future.set_result(_unavailable(e))
+        window.append((index, record, future))
+    while window:
+        done_index, done_record, future = window.popleft()
+        yield done_index, done_record, _result(future, template)
+
+
+def _unavailable(error):
+    return {'error': str(error), 'status': 503}
+
+
+def _result(future, template):
+    try:
+        return render_pool.wait_for(future, template)
+    except render_pool.RenderUnavailable as e:
+        return _unavailable(e)
+
+
+def entry_name(index, record, name_field=None):
+    name = f"letter_{index:04d}"
+    value = record.get(name_field) if name_field else None
+    if value:
+        safe = "".join(c if c.isalnum() else "_" for c in str(value))[:60]
+        name = f"{index:04d}_{safe}"
+    return f"{name}.pdf"
+
+
+class _Chunks:
+    """Write-only, unseekable sink that ZipFile writes into; drained after each entry."""
+
+    def __init__(self):
+        self._chunks = []
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def zip_stream(template, records, name_field=None):
+    """Yield the bytes of a ZIP holding one PDF per record.
+
+    Records that fail to render are listed in ERRORS.txt at the end of the
+    archive, since the response status is already sent by then.
+    """
+    sink = _Chunks()
+    failures = []
+    # PDFs are already compressed; storing them avoids burning CPU for nothing
+    with zipfile.ZipFile(sink, "w", compression=zipfile.ZIP_STORED) as archive:
+        for index, record, pdf in render_records(template, records):
+            if isinstance(pdf, dict):
+                failures.append(f"record {index}: {pdf.get('error')}")
+                continue
+            archive.writestr(entry_name(index, record, name_field), pdf)
+            yield sink.drain()
+        if failures:
+            archive.writestr("ERRORS.txt", "\n".join(failures) + "\n")
+    yield sink.drain()
+
+
+def merged_pdf(template, records):
+    """Return one PDF with a letter per record. Raises BatchError over the merge cap."""
+    limit = getattr(settings, "LETTERS_BATCH_MERGE_MAX", DEFAULT_MERGE_MAX)
+    # Read one past the cap, never the whole input
+    records = list(islice(records, limit + 1))
+    if len(records) > limit:
+        raise BatchError(f"A merged PDF holds at most {limit} letters; ask for a ZIP instead.")
+
+    if render_pool.workers() <= 0:
+        pdf = plan_for(template).render_many(records).getvalue()
+    else:
+        if not isinstance(template.pdf_structure, dict):
+            raise ValueError("Invalid pdf structure: expected a dict")
+        future = render_pool.get_pool().submit(
+            (template.pk, template.version), template.pdf_structure, records,
+            wait=render_pool.render_timeout(), func=render_merged_in_worker,
+        )
+        pdf = render_pool.wait_for(future, template)
+    if isinstance(pdf, dict):
+        raise BatchError(f"PDF generation failed: {pdf.get('error')}")
+    return pdf
@@ -0,0 +1,131 @@
+import io
+import statistics
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from reportlab import rl_config
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import letter
+from reportlab.lib.styles import getSampleStyleSheet
+from reportlab.platypus import Paragraph, SimpleDocTemplate, Spacer, Table, TableStyle
+
+from letters.models import LetterTemplate
+from letters.render_plan import compile_structure
+
+
+def interpret_structure(structure, data):
+    """The section interpreter that render plans replaced, kept as the benchmark baseline.
+
+    Re-reads pdf_structure, rebuilds the style sheet and redefines its helpers on every call.
+    """
+    buffer = io.BytesIO()
+    doc = SimpleDocTemplate(buffer, pagesize=letter, rightMargin=72, leftMargin=72, topMargin=72, bottomMargin=72)
+    styles = getSampleStyleSheet()
+    elements = []
+    for section in structure.get('sections') or structure.get('elements') or []:
+        t = section.get('type')
+
+        def _resolve_text(sec):
+            if 'text' in sec and sec.get('text') is not None:
+                return str(sec.get('text'))
+            if 'template' in sec and sec.get('template') is not None:
+                tmpl = sec.get('template')
+
+                class SafeDict(dict):
+                    def __missing__(self, key):
+                        return ''
+                try:
+                    return tmpl.format_map(SafeDict(data or {}))
+                except Exception:
+                    return str(tmpl)
+            field = sec.get('field')
+            if field:
+                return str(data.get(field, ''))
+            return ''
+
+        if t == 'title':
+            elements.append(Paragraph(_resolve_text(section), styles['Title']))
+            elements.append(Spacer(1, 12))
+        elif t == 'heading':
+            elements.append(Paragraph(_resolve_text(section), styles.get('Heading2', styles.get('Heading1'))))
+            elements.append(Spacer(1, 8))
+        elif t == 'paragraph':
+            elements.append(Paragraph(_resolve_text(section), styles['BodyText']))
+            elements.append(Spacer(1, 6))
+        elif t == 'spacer':
+            height = section.get('height', section.get('size', 12))
+            try:
+                height = float(height)
+            except Exception:
+                height = 12
+            elements.append(Spacer(1, height))
+        elif t == 'table':
+            cols = section.get('columns', []) or []
+            rows = data.get(section.get('field'), []) if isinstance(data, dict) else []
+            if not isinstance(rows, list):
+                rows = []
+            tbl = Table([cols] + [[row.get(c, '') for c in cols] for row in rows], hAlign='LEFT')
+            tbl.setStyle(TableStyle([
+                ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+                ('BACKGROUND', (0, 0), (-1, 0), colors.lightgrey),
+            ]))
+            elements.append(tbl)
+            elements.append(Spacer(1, 12))
+    doc.build(elements)
+    buffer.seek(0)
+    return buffer
+
+
+def sample_data(template):
+    """Fill every form field of a template with a placeholder value."""
+    fields = (template.form_structure or {}).get('fields', [])
+    return {field['name']: f"Sample {field['name']}" for field in fields if isinstance(field, dict) and 'name' in field}
+
+
+class Command(BaseCommand):
+    help = "Benchmark compiled render plans against the section interpreter for each letter template"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--repeat", type=int, default=50, help="Timed renders per template and renderer")
+        parser.add_argument("--template", action="append", help="template_type to benchmark (repeatable, defaults to all)")
+
+    def handle(self, *args, **options):
+        repeat = max(1, options["repeat"])
+        templates = LetterTemplate.objects.order_by('template_type')
+        if options["template"]:
+            templates = templates.filter(template_type__in=options["template"])
+        if not templates:
+            raise CommandError("No letter templates to benchmark")
+
+        # Fixed timestamps and document ids so both renderers produce comparable bytes
+        invariant, rl_config.invariant = rl_config.invariant, 1
+        try:
+            self.stdout.write(f"{'template':<14} {'renderer':<12} {'median ms':>10} {'min ms':>8} {'speedup':>8}")
+            for template in templates:
+                data = sample_data(template)
+                structure = template.pdf_structure
+                renderers = {
+                    "interpreter": lambda: interpret_structure(structure, data),
+                    # Compiled once per template version in production; the compile is not timed
+                    "plan": (lambda plan: lambda: plan.render(data))(compile_structure(structure)),
+                }
+                outputs = {name: render().getvalue() for name, render in renderers.items()}
+                if outputs["plan"] != outputs["interpreter"]:
+                    self.stderr.write(self.style.WARNING(f"{template.template_type}: plan output differs"))
+
+                # Interleaved so both renderers see the same machine noise
+                timings = {name: [] for name in renderers}
+                for _ in range(repeat):
+                    for name, render in renderers.items():
+                        started = time.perf_counter()
+                        render()
+                        timings[name].append((time.perf_counter() - started) * 1000)
+                baseline = statistics.median(timings["interpreter"])
+                for name, samples in timings.items():
+                    median = statistics.median(samples)
+                    self.stdout.write(
+                        f"{template.template_type:<14} {name:<12} {median:>10.3f} {min(samples):>8.3f} "
+                        f"{baseline / median:>7.2f}x"
+                    )
+        finally:
+            rl_config.invariant = invariant
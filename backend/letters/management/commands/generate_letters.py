@@ -0,0 +1,55 @@
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from letters import batch
+from letters.models import LetterTemplate
+from letters.render_pool import RenderUnavailable
+
+
+class Command(BaseCommand):
+    help = "Generate one letter template for every record in a JSON Lines or CSV file, as a ZIP or one merged PDF"
+
+    def add_arguments(self, parser):
+        parser.add_argument("template_type", help="LetterTemplate.template_type to fill in")
+        parser.add_argument("records", help="JSON Lines (.jsonl) or CSV (.csv) file, one letter per record")
+        parser.add_argument("--output", "-o", required=True, help="File to write; .pdf gives a merged PDF, anything else a ZIP")
+        parser.add_argument("--format", choices=batch.FORMATS, help="Override the format implied by --output")
+        parser.add_argument("--name-field", help="Record field used to name the PDFs inside the ZIP")
+
+    def handle(self, *args, **options):
+        try:
+            template = LetterTemplate.objects.get(template_type=options["template_type"])
+        except LetterTemplate.DoesNotExist:
+            raise CommandError(f"No letter template '{options['template_type']}'")
+        source = Path(options["records"])
+        if not source.exists():
+            raise CommandError(f"{source} does not exist")
+        output = Path(options["output"])
+        output_format = options["format"] or ("pdf" if output.suffix.lower() == ".pdf" else "zip")
+        fmt = batch.record_format(source.name)
+
+        with source.open("rb") as stream:
+            def records():
+                stream.seek(0)
+                return batch.iter_records(stream, fmt)
+
+            try:
+                count, errors = batch.validate_records(template, records())
+                if errors:
+                    for error in errors:
+                        self.stderr.write(error)
+                    raise CommandError(f"{source} has invalid records; nothing was generated")
+                if not count:
+                    raise CommandError(f"{source} has no records")
+
+                with output.open("wb") as out:
+                    if output_format == "pdf":
+                        out.write(batch.merged_pdf(template, records()))
+                    else:
+                        for chunk in batch.zip_stream(template, records(), options["name_field"]):
+                            out.write(chunk)
+            except (batch.BatchError, RenderUnavailable) as e:
+                raise CommandError(str(e))
+
+        self.stdout.write(f"Wrote {count} letters to {output} ({output_format})")
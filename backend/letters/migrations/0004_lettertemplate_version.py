@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 13:54
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('letters', '0003_rename_elements_to_sections'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='lettertemplate',
+            name='version',
+            field=models.PositiveIntegerField(default=1, editable=False),
+        ),
+    ]
@@ -1,8 +1,8 @@
 # letters/models.py
 from django.db import models
+from django.db.models import F
 from django.contrib.auth.models import User
-import jsonschema
-from jsonschema import validate
+from .validation import validation_errors
 
 class LetterTemplate(models.Model):
     """
@@ -32,16 +32,35 @@ class LetterTemplate(models.Model):
         help_text="JSON Schema to validate the form_data against."
     )
 
+    # Bumped on every save; caches of anything derived from the template key on it
+    version = models.PositiveIntegerField(default=1, editable=False)
+
     # Timestamps
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
-    def validate_data(self, data):
+    def save(self, *args, **kwargs):
+        bump = not self._state.adding
+        if bump:
+            # Incremented in the UPDATE itself so concurrent saves each get their own version
+            self.version = F('version') + 1
+            update_fields = kwargs.get('update_fields')
+            if update_fields is not None:
+                kwargs['update_fields'] = {*update_fields, 'version'}
+        super().save(*args, **kwargs)
+        if bump:
+            self.refresh_from_db(fields=['version'])
+
+    def validate_data(self, data, all_errors=False):
         """
         Validates submitted data against the template's validation_schema.
 
+        The schema is compiled into a validator once per template version
+        (see letters.validation) instead of on every call.
+
         Args:
             data (dict): The data submitted from the frontend form.
+            all_errors (bool): Report every error, joined with "; ", instead of the most relevant one.
 
         Returns:
             tuple: (bool, str or None) - (is_valid, error_message)
@@ -50,19 +69,13 @@ class LetterTemplate(models.Model):
             return True, None  # No schema defined, assume data is valid
 
         try:
-            validate(instance=data, schema=self.validation_schema)
-            return True, None
-        except jsonschema.exceptions.ValidationError as e:
-            # Try to provide a user-friendly path and message
-            field_path = " -> ".join(map(str, e.path))
-            error_message = f"Validation Error for field '{field_path}': {e.message}" if e.path else f"Validation Error: {e.message}"
-            # Log the detailed error for server-side debugging
-            # logger.warning(f"JSON Schema validation failed for template '{self.template_type}': {e}")
-            return False, error_message
+            errors = validation_errors(self, data, all_errors=all_errors)
         except Exception as e:
             # Catch other potential errors during validation
-            # logger.error(f"Unexpected error during validation for template '{self.template_type}': {e}")
             return False, f"An unexpected validation error occurred: {str(e)}"
+        if errors:
+            return False, "; ".join(errors)
+        return True, None
 
     def __str__(self):
         return f"{self.name} ({self.template_type})"
@@ -0,0 +1,88 @@
+"""Process-local registry of LetterTemplates.
+
+There are only a handful of templates, and they change a few times a year,
+yet every generate and draft request looked its template up in the
+database. Each process instead keeps every template in memory, keyed by
+template_type, together with the templates *version* it loaded them at.
+
+The version is a single key in the "versions" cache, which settings
+point at its own shared database table, so web workers, the admin and
+management commands all see the same value. Saving or deleting a template
+bumps it (see signals.py), and every lookup compares it with the loaded
+one: one small cache read per lookup instead of loading the template rows.
+When they differ, the process reloads all templates in one query, so
+edits reach every worker on their next request.
+"""
+import threading
+
+from django.core.cache import caches
+from django.db import transaction
+from django.utils import timezone
+
+VERSION_KEY = "letters:templates:version"
+
+_lock = threading.Lock()
+_loaded_version = None
+_templates = {}
+
+
+def get_templates_version():
+    version = caches["versions"].get(VERSION_KEY)
+    if version is None:
+        # Cold cache: any fresh value works, it only has to differ from older ones
+        caches["versions"].add(VERSION_KEY, str(timezone.now().timestamp()), None)
+        version = caches["versions"].get(VERSION_KEY)
+    return version
+
+
+def bump_templates_version():
+    caches["versions"].set(VERSION_KEY, str(timezone.now().timestamp()), None)
+
+
+def templates_changed():
+    """Invalidate every process's registry after a template is saved or deleted.
+
+    Bumped straight away for this process and again once the transaction
+    commits, so a worker that reloaded between the two cannot keep
+    pre-commit rows.
+    """
+    global _loaded_version
+    with _lock:
+        _loaded_version = None
+    bump_templates_version()
+    transaction.on_commit(bump_templates_version)
+
+
+def _current():
+    """Return the template_type -> LetterTemplate map, reloading it if the version moved on."""
+    global _loaded_version, _templates
+    from .models import LetterTemplate
+
+    version = get_templates_version()
+    with _lock:
+        if version == _loaded_version:
+            return _templates
+    templates = {template.template_type: template for template in LetterTemplate.objects.all()}
+    with _lock:
+        _templates, _loaded_version = templates, version
+    return templates
+
+
+def find_template(template_type):
+    """The LetterTemplate for ``template_type``, or None. Treat it as read-only: it is shared."""
+    return _current().get(template_type)
+
+
+def get_template(template_type):
+    """Like find_template, but raises LetterTemplate.DoesNotExist like ``objects.get``."""
+    from .models import LetterTemplate
+
+    template = find_template(template_type)
+    if template is None:
+        raise LetterTemplate.DoesNotExist(f"No letter template '{template_type}'")
+    return template
+
+
+def all_templates():
+    """Every template, ordered by name."""
+    return sorted(_current().values(), key=lambda template: template.name)
@@ -0,0 +1,260 @@
+"""Content-addressed cache of rendered letter PDFs.
+
+A rendered letter depends only on the template (identity and version) and
+on the form fields its pdf_structure reads, so the key is a hash of exactly
+those. Downloading the same filled form again, or submitting extra fields
+the template ignores, is served from the cache without running ReportLab.
+
+Two tiers:
+
+* a per-process LRU in memory, bounded by ``LETTERS_RENDER_CACHE_MEMORY_BYTES``
+* files under ``LETTERS_RENDER_CACHE_DIR/<key[:2]>/<key>.pdf``, shared by
+  every worker on the host and bounded by ``LETTERS_RENDER_CACHE_MAX_BYTES``;
+  reads touch the file and eviction drops least recently used files first
+
+Saving a template bumps its version, so stale renders are never served;
+they simply age out of both tiers.
+"""
+import hashlib
+import json
+import logging
+import os
+import re
+import tempfile
+import threading
+from collections import OrderedDict, namedtuple
+from pathlib import Path
+from string import Formatter
+
+from django.conf import settings
+
+from .render_pool import render_pdf
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MEMORY_BYTES = 16 * 1024 * 1024
+DEFAULT_MAX_BYTES = 100 * 1024 * 1024
+# Disk writes between eviction passes in one process
+EVICT_EVERY = 50
+KEY_RE = re.compile(r"[0-9a-f]{64}")
+
+
+def cache_dir():
+    return Path(getattr(settings, "LETTERS_RENDER_CACHE_DIR", settings.BASE_DIR / "media" / "letter_cache"))
+
+
+def max_bytes():
+    return getattr(settings, "LETTERS_RENDER_CACHE_MAX_BYTES", DEFAULT_MAX_BYTES)
+
+
+def used_fields(structure):
+    """Return the set of form fields a pdf_structure reads, or None if that cannot be told."""
+    if not isinstance(structure, dict):
+        return None
+    fields = set()
+    for section in structure.get("sections") or structure.get("elements") or []:
+        if not isinstance(section, dict):
+            return None
+        if section.get("text") is not None:
+            continue
+        template = section.get("template")
+        if template is not None:
+            try:
+                fields.update(name.split(".")[0].split("[")[0]
+                              for _, name, _, _ in Formatter().parse(str(template)) if name)
+            except ValueError:
+                # Malformed format string; rendering falls back to the raw text
+                pass
+        elif section.get("field"):
+            fields.add(section["field"])
+    return fields
+
+
+def render_key(template, data):
+    """Hash of the template identity, its version and the data fields it uses."""
+    fields = used_fields(template.pdf_structure)
+    if isinstance(data, dict) and fields is not None:
+        data = {name: data[name] for name in sorted(fields) if name in data}
+    payload = json.dumps(
+        [template.pk, template.template_type, template.version, data],
+        sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str,
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class MemoryLRU:
+    """Thread-safe LRU of PDF bytes bounded by their total size."""
+
+    def __init__(self, limit):
+        self.limit = limit
+        self.size = 0
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            pdf = self._items.get(key)
+            if pdf is not None:
+                self._items.move_to_end(key)
+            return pdf
+
+    def put(self, key, pdf):
+        if len(pdf) > self.limit:
+            return
+        with self._lock:
+            old = self._items.pop(key, None)
+            if old is not None:
+                self.size -= len(old)
+            self._items[key] = pdf
+            self.size += len(pdf)
+            while self.size > self.limit:
+                _, dropped = self._items.popitem(last=False)
+                self.size -= len(dropped)
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+            self.size = 0
+
+
+memory = MemoryLRU(getattr(settings, "LETTERS_RENDER_CACHE_MEMORY_BYTES", DEFAULT_MEMORY_BYTES))
+_writes = 0
+_writes_lock = threading.Lock()
+
+
+def _path(key):
+    return cache_dir() / key[:2] / f"{key}.pdf"
+
+
+def open_disk(key):
+    """Open the disk-tier copy of ``key`` for streaming, or return None."""
+    path = _path(key)
+    try:
+        handle = path.open("rb")
+    except FileNotFoundError:
+        return None
+    try:
+        # Mark as recently used for eviction
+        os.utime(path)
+    except OSError:
+        pass
+    return handle
+
+
+def read_disk(key):
+    handle = open_disk(key)
+    if handle is None:
+        return None
+    with handle:
+        return handle.read()
+
+
+def write_disk(key, pdf):
+    global _writes
+    path = _path(key)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # Write to a scratch file and move it into place so readers never see a partial PDF
+    fd, scratch = tempfile.mkstemp(dir=path.parent, prefix=".tmp-")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(pdf)
+        os.replace(scratch, path)
+    except OSError:
+        Path(scratch).unlink(missing_ok=True)
+        raise
+    with _writes_lock:
+        _writes += 1
+        due = _writes % EVICT_EVERY == 0
+    if due:
+        evict()
+
+
+def evict(limit=None):
+    """Delete least recently used PDFs until the disk tier fits in ``limit`` bytes.
+
+    Returns the number of files removed.
+    """
+    limit = max_bytes() if limit is None else limit
+    root = cache_dir()
+    if not root.exists():
+        return 0
+    entries = []
+    total = 0
+    for shard in os.scandir(root):
+        if not shard.is_dir():
+            continue
+        for entry in os.scandir(shard.path):
+            if entry.name.startswith(".") or not entry.is_file():
+                continue
+            stat = entry.stat()
+            entries.append((stat.st_mtime, entry.path, stat.st_size))
+            total += stat.st_size
+    removed = 0
+    for _, path, size in sorted(entries):
+        if total <= limit:
+            break
+        Path(path).unlink(missing_ok=True)
+        total -= size
+        removed += 1
+    if removed:
+        logger.info(f"Evicted {removed} cached letter PDFs")
+    return removed
+
+
+class CachedPDF(namedtuple("CachedPDF", "key data file")):
+    """A rendered letter: ``data`` holds its bytes, or ``file`` is the open disk-tier copy."""
+
+    def read(self):
+        if self.data is not None:
+            return self.data
+        with self.file:
+            return self.file.read()
+
+
+def cached_pdf(key):
+    """Return the CachedPDF stored under ``key`` in either tier, or None if it is not cached."""
+    if not KEY_RE.fullmatch(key):
+        return None
+    pdf = memory.get(key)
+    if pdf is not None:
+        return CachedPDF(key, pdf, None)
+    handle = open_disk(key)
+    if handle is not None:
+        return CachedPDF(key, None, handle)
+    return None
+
+
+def letter_pdf(template, data):
+    """Return a CachedPDF for ``data`` filled into ``template``, rendering only on a miss.
+
+    A disk-tier hit is returned as an open file so it can be streamed to the
+    client without being read into memory. Returns the error dict from the
+    renderer on failure (errors are not cached). Raises ValueError for an
+    invalid pdf_structure and RenderUnavailable when the render pool cannot
+    take the letter, like render_pool.render_pdf.
+    """
+    key = render_key(template, data)
+    cached = cached_pdf(key)
+    if cached is not None:
+        return cached
+    pdf = render_pdf(template, data)
+    if isinstance(pdf, dict):
+        return pdf
+    try:
+        write_disk(key, pdf)
+    except OSError as e:
+        logger.warning(f"Could not store rendered letter {key}: {e}")
+    memory.put(key, pdf)
+    return CachedPDF(key, pdf, None)
+
+
+def render_letter(template, data):
+    """Like letter_pdf, but returns the PDF bytes (or the error dict)."""
+    pdf = letter_pdf(template, data)
+    if isinstance(pdf, dict):
+        return pdf
+    data = pdf.read()
+    if pdf.data is None:
+        # Disk hit: keep it in memory for the next request
+        memory.put(pdf.key, data)
+    return data
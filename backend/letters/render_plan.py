@@ -0,0 +1,245 @@
+"""Compiled form of a LetterTemplate's pdf_structure.
+
+``compile_structure`` walks the sections once and turns each into a small
+step that only has to bind form data: paragraph styles and table styles
+are looked up ahead of time, ``template`` strings are split into literal
+text and field names, and ``field`` sections become direct lookups.
+Rendering a plan builds the same flowables the section interpreter used
+to build, so the PDFs are identical.
+
+Plans are cached per (template id, version); saving a template bumps its
+version, so an edited template is recompiled on its next render.
+"""
+import io
+import threading
+from collections import OrderedDict
+from string import Formatter
+
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import letter
+from reportlab.lib.styles import getSampleStyleSheet
+from reportlab.platypus import PageBreak, Paragraph, SimpleDocTemplate, Spacer, Table, TableStyle
+
+PLAN_CACHE_SIZE = 64
+
+_styles = None
+TABLE_STYLE = TableStyle([
+    ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+    ('BACKGROUND', (0, 0), (-1, 0), colors.lightgrey),
+])
+
+
+def styles():
+    """The sample style sheet, built once per process."""
+    global _styles
+    if _styles is None:
+        _styles = getSampleStyleSheet()
+    return _styles
+
+
+class SafeDict(dict):
+    """Mapping for str.format_map where missing keys format as empty strings."""
+
+    def __missing__(self, key):
+        return ''
+
+
+def _constant(text):
+    return lambda data: text
+
+
+def _field(name):
+    return lambda data: str(data.get(name, ''))
+
+
+def _format(template):
+    """Pre-parse a str.format template into a function of the form data."""
+    try:
+        parts = list(Formatter().parse(template))
+    except ValueError:
+        # Malformed template: format_map would fail the same way every time
+        return _constant(template)
+
+    if all(name is None or (name.isidentifier() and not spec and not conversion)
+           for _, name, spec, conversion in parts):
+        # Plain {name} placeholders: join literals and str() of the values directly
+        pieces = [(literal, name) for literal, name, _, _ in parts]
+
+        def render(data):
+            out = []
+            for literal, name in pieces:
+                out.append(literal)
+                if name is not None:
+                    value = data.get(name, '')
+                    out.append(value if isinstance(value, str) else format(value))
+            return ''.join(out)
+        return render
+
+    # Attribute/index lookups, conversions or format specs: let str.format handle them
+    def render_with_format(data):
+        try:
+            return template.format_map(SafeDict(data))
+        except Exception:
+            return template
+    return render_with_format
+
+
+def _text(section):
+    """Resolve text from 'text', then 'template', then 'field', like the interpreter did."""
+    if section.get('text') is not None:
+        return _constant(str(section['text']))
+    if section.get('template') is not None:
+        template = section['template']
+        return _format(template) if isinstance(template, str) else _constant(str(template))
+    field = section.get('field')
+    if field:
+        return _field(field)
+    return _constant('')
+
+
+def _compile_section(section):
+    """Return ``step(data, elements)`` for one section, or None for unknown types."""
+    kind = section.get('type')
+    sheet = styles()
+
+    if kind in ('title', 'heading', 'paragraph'):
+        text = _text(section)
+        if kind == 'title':
+            style, gap = sheet['Title'], 12
+        elif kind == 'heading':
+            # Heading2 may not exist in all style sheets; fall back gracefully
+            style, gap = sheet.get('Heading2', sheet.get('Heading1')), 8
+        else:
+            style, gap = sheet['BodyText'], 6
+
+        def step(data, elements):
+            elements.append(Paragraph(text(data), style))
+            elements.append(Spacer(1, gap))
+        return step
+
+    if kind == 'spacer':
+        # support either 'height' or 'size' keys
+        height = section.get('height', section.get('size', 12))
+        try:
+            height = float(height)
+        except Exception:
+            height = 12
+
+        def step(data, elements):
+            elements.append(Spacer(1, height))
+        return step
+
+    if kind == 'table':
+        columns = section.get('columns', []) or []
+        field = section.get('field')
+
+        def step(data, elements):
+            rows = data.get(field, []) if isinstance(data, dict) else []
+            if not isinstance(rows, list):
+                rows = []
+            table = Table([columns] + [[row.get(c, '') for c in columns] for row in rows], hAlign='LEFT')
+            table.setStyle(TABLE_STYLE)
+            elements.append(table)
+            elements.append(Spacer(1, 12))
+        return step
+
+    # add other section types here…
+    return None
+
+
+class RenderPlan:
+    def __init__(self, steps):
+        self.steps = steps
+
+    def render(self, data):
+        """Build the PDF for ``data``; returns a BytesIO positioned at the start."""
+        return self.render_many([data])
+
+    def render_many(self, records):
+        """Build one PDF holding a letter per record, each starting on a new page."""
+        buffer = io.BytesIO()
+        doc = SimpleDocTemplate(
+            buffer,
+            pagesize=letter,
+            rightMargin=72, leftMargin=72,
+            topMargin=72, bottomMargin=72
+        )
+        elements = []
+        for index, data in enumerate(records):
+            # The old renderer accepted form_data=None; steps assume a mapping
+            data = data or {}
+            if index:
+                elements.append(PageBreak())
+            for step in self.steps:
+                step(data, elements)
+        doc.build(elements)
+        buffer.seek(0)
+        return buffer
+
+
+def compile_structure(structure):
+    """Compile a pdf_structure dict into a RenderPlan. Raises ValueError if it is not a dict."""
+    if not isinstance(structure, dict):
+        raise ValueError("Invalid pdf structure: expected a dict")
+    # First, look under “sections”, fall back to “elements”
+    sections = structure.get('sections') or structure.get('elements') or []
+    steps = [_compile_section(section) for section in sections]
+    return RenderPlan([step for step in steps if step is not None])
+
+
+_plans = OrderedDict()
+_plans_lock = threading.Lock()
+
+
+def plan_for(template):
+    """Return the compiled plan of a LetterTemplate, compiling it once per version."""
+    key = (template.pk, template.version)
+    with _plans_lock:
+        plan = _plans.get(key)
+        if plan is not None:
+            _plans.move_to_end(key)
+            return plan
+    plan = compile_structure(template.pdf_structure)
+    with _plans_lock:
+        _plans[key] = plan
+        while len(_plans) > PLAN_CACHE_SIZE:
+            _plans.popitem(last=False)
+    return plan
+
+
+# Plans compiled inside a render pool worker process, keyed like _plans
+_worker_plans = OrderedDict()
+
+
+def warm_worker():
+    """Process pool initializer: build the style sheet before the first letter arrives."""
+    styles()
+
+
+def _worker_plan(key, structure):
+    plan = _worker_plans.get(key)
+    if plan is None:
+        plan = _worker_plans[key] = compile_structure(structure)
+        while len(_worker_plans) > PLAN_CACHE_SIZE:
+            _worker_plans.popitem(last=False)
+    return plan
+
+
+def render_in_worker(key, structure, data):
+    """Render in a pool worker; returns the PDF bytes or an error dict.
+
+    Runs without Django: the parent sends the pdf_structure with its
+    (template id, version) key, and the worker compiles it once per key.
+    """
+    try:
+        return _worker_plan(key, structure).render(data).getvalue()
+    except Exception as e:
+        return {'error': str(e), 'status': 500}
+
+
+def render_merged_in_worker(key, structure, records):
+    """Like render_in_worker, for one PDF holding a letter per record."""
+    try:
+        return _worker_plan(key, structure).render_many(records).getvalue()
+    except Exception as e:
+        return {'error': str(e), 'status': 500}
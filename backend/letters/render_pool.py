@@ -0,0 +1,190 @@
+"""Render letter PDFs in a warm, bounded pool of worker processes.
+
+ReportLab layout is pure-Python and CPU-bound; run in the request thread it
+holds the GIL and stalls every other request on that worker. Renders are
+sent to a process pool instead:
+
+* ``LETTERS_RENDER_WORKERS`` processes (default 2) started with ``spawn``
+  and warmed up front; 0 renders inline in the request thread
+* at most ``LETTERS_RENDER_MAX_QUEUE`` renders (default 8) wait behind the
+  running ones; beyond that ``RenderBusy`` is raised straight away so the
+  view can answer 503 with Retry-After instead of piling requests up
+* a caller waits at most ``LETTERS_RENDER_TIMEOUT`` seconds (default 20)
+  before ``RenderTimeout``; the render keeps its slot until it finishes
+"""
+import atexit
+import logging
+import multiprocessing
+import threading
+from concurrent.futures import CancelledError, ProcessPoolExecutor, TimeoutError
+from concurrent.futures.process import BrokenProcessPool
+
+from django.conf import settings
+
+from .render_plan import render_in_worker, warm_worker
+from .utils import generate_pdf_for_template
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WORKERS = 2
+DEFAULT_MAX_QUEUE = 8
+DEFAULT_TIMEOUT = 20
+DEFAULT_RETRY_AFTER = 5
+
+
+class RenderUnavailable(Exception):
+    """The pool cannot take the render right now; the client should retry later."""
+
+    def __init__(self, message, retry_after=None):
+        super().__init__(message)
+        self.retry_after = retry_after if retry_after is not None else retry_after_seconds()
+
+
+class RenderBusy(RenderUnavailable):
+    pass
+
+
+class RenderTimeout(RenderUnavailable):
+    pass
+
+
+def workers():
+    return getattr(settings, "LETTERS_RENDER_WORKERS", DEFAULT_WORKERS)
+
+
+def retry_after_seconds():
+    return getattr(settings, "LETTERS_RENDER_RETRY_AFTER", DEFAULT_RETRY_AFTER)
+
+
+class RenderPool:
+    def __init__(self, worker_count, max_queue):
+        self.worker_count = worker_count
+        # Slots for running plus waiting renders
+        self._slots = threading.BoundedSemaphore(worker_count + max_queue)
+        self._lock = threading.Lock()
+        self._executor = None
+
+    def _get_executor(self):
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.worker_count,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=warm_worker,
+                )
+            return self._executor
+
+    def warm(self):
+        """Start every worker process now rather than on the first letters."""
+        executor = self._get_executor()
+        for future in [executor.submit(warm_worker) for _ in range(self.worker_count)]:
+            future.result()
+
+    def submit(self, key, structure, data, wait=None, func=render_in_worker):
+        """Queue ``func(key, structure, data)`` on the pool and return its future.
+
+        Raises RenderBusy when no slot is free, after waiting up to ``wait``
+        seconds for one (batch jobs wait; single requests fail fast).
+        """
+        acquired = self._slots.acquire(timeout=wait) if wait else self._slots.acquire(blocking=False)
+        if not acquired:
+            raise RenderBusy("Too many letters are being generated right now.")
+        executor = self._get_executor()
+        try:
+            future = executor.submit(func, key, structure, data)
+        except BrokenProcessPool:
+            # A worker died (e.g. killed for memory); start a fresh pool once
+            self.reset(executor)
+            executor = self._get_executor()
+            try:
+                future = executor.submit(func, key, structure, data)
+            except Exception:
+                self._slots.release()
+                raise
+        except Exception:
+            self._slots.release()
+            raise
+        # Remembered so wait_for can tell which pool a broken future came from
+        future.executor = executor
+        future.add_done_callback(lambda _: self._slots.release())
+        return future
+
+    def reset(self, broken=None):
+        """Drop the executor and start a fresh one on the next submit.
+
+        With ``broken``, only if that is still the current executor: callers
+        holding futures of the same dead pool must not shut down the fresh
+        one another request already started.
+        """
+        with self._lock:
+            if broken is not None and self._executor is not broken:
+                return
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def shutdown(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = RenderPool(workers(), getattr(settings, "LETTERS_RENDER_MAX_QUEUE", DEFAULT_MAX_QUEUE))
+        return _pool
+
+
+def shutdown():
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown()
+
+
+atexit.register(shutdown)
+
+
+def render_timeout():
+    return getattr(settings, "LETTERS_RENDER_TIMEOUT", DEFAULT_TIMEOUT)
+
+
+def wait_for(future, template):
+    """Wait for a pool render, turning timeouts and dead workers into RenderUnavailable."""
+    timeout = render_timeout()
+    try:
+        return future.result(timeout=timeout)
+    except TimeoutError:
+        future.cancel()
+        logger.warning(f"Rendering letter '{template.template_type}' took longer than {timeout}s")
+        raise RenderTimeout("Letter generation timed out.")
+    except BrokenProcessPool as e:
+        logger.error(f"Letter render worker died: {e}")
+        get_pool().reset(getattr(future, "executor", None))
+        raise RenderUnavailable("Letter generation is restarting.")
+    except CancelledError:
+        # The pool was reset while this render was still queued
+        raise RenderUnavailable("Letter generation is restarting.")
+
+
+def render_pdf(template, data):
+    """Render ``template`` filled with ``data``; returns PDF bytes or an error dict.
+
+    Raises ValueError for an invalid pdf_structure and RenderUnavailable when
+    the pool is saturated or the render takes too long.
+    """
+    if workers() <= 0:
+        pdf = generate_pdf_for_template(template, data)
+        return pdf if isinstance(pdf, dict) else pdf.getvalue()
+
+    if not isinstance(template.pdf_structure, dict):
+        raise ValueError("Invalid pdf structure: expected a dict")
+    return wait_for(get_pool().submit((template.pk, template.version), template.pdf_structure, data), template)
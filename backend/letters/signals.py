@@ -0,0 +1,20 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import LetterTemplate
+from .registry import templates_changed
+from .validation import invalidate
+
+
+@receiver(post_save, sender=LetterTemplate)
+@receiver(post_delete, sender=LetterTemplate)
+def invalidate_template_validator(sender, instance, **kwargs):
+    """Drop the compiled validator so the next submission uses the edited schema."""
+    invalidate(instance.pk)
+
+
+@receiver(post_save, sender=LetterTemplate)
+@receiver(post_delete, sender=LetterTemplate)
+def invalidate_template_registry(sender, **kwargs):
+    """Move the templates version on so every process reloads its registry."""
+    templates_changed()
@@ -0,0 +1,104 @@
+"""Send cached letter PDFs without copying them into the response.
+
+A PDF held in memory is sent as a series of memoryview slices over the
+cached bytes; one on disk is handed to FileResponse, which lets the WSGI
+server use sendfile. Either way the response never builds another full copy.
+
+Single byte ranges (``Range: bytes=start-end``, ``bytes=start-`` and
+``bytes=-suffix``) are answered with 206 Partial Content. ``If-Range`` is
+honoured against the ETag, which is the render cache key. Multiple ranges
+are not supported and get the whole PDF.
+
+Clients only send Range on GET, so the generate endpoints answer with a
+``Content-Location`` naming ``generate/<key>/``, a GET download of the
+cached PDF where interrupted downloads can be resumed.
+"""
+import os
+import re
+
+from django.http import FileResponse, HttpResponse, StreamingHttpResponse
+
+CHUNK_SIZE = 64 * 1024
+
+_RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+class RangeNotSatisfiable(Exception):
+    pass
+
+
+def parse_range(header, size):
+    """Return the inclusive ``(start, end)`` asked for by a Range header, or None for the whole body.
+
+    Raises RangeNotSatisfiable when the range lies outside the body.
+    """
+    match = _RANGE_RE.match((header or "").strip())
+    if not match or match.groups() == ("", ""):
+        return None
+    first, last = match.groups()
+    if first:
+        start = int(first)
+        end = min(int(last), size - 1) if last else size - 1
+        if start >= size or (last and int(last) < start):
+            raise RangeNotSatisfiable()
+    else:
+        suffix = int(last)
+        if suffix == 0:
+            raise RangeNotSatisfiable()
+        start, end = max(0, size - suffix), size - 1
+    return start, end
+
+
+def _memory_chunks(data, start, end):
+    view = memoryview(data)
+    for offset in range(start, end + 1, CHUNK_SIZE):
+        yield view[offset:min(offset + CHUNK_SIZE, end + 1)]
+
+
+def _file_chunks(handle, start, end):
+    with handle:
+        handle.seek(start)
+        remaining = end - start + 1
+        while remaining > 0:
+            chunk = handle.read(min(CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+
+
+def pdf_response(request, pdf, filename, disposition="inline"):
+    """Build the response for a render_cache.CachedPDF, honouring Range requests."""
+    size = len(pdf.data) if pdf.data is not None else os.fstat(pdf.file.fileno()).st_size
+    etag = f'"{pdf.key}"'
+
+    byte_range = None
+    if_range = request.headers.get("If-Range")
+    if if_range is None or if_range == etag:
+        try:
+            byte_range = parse_range(request.headers.get("Range"), size)
+        except RangeNotSatisfiable:
+            if pdf.file is not None:
+                pdf.file.close()
+            response = HttpResponse(status=416)
+            response["Content-Range"] = f"bytes */{size}"
+            return response
+
+    if byte_range is None:
+        if pdf.file is not None:
+            response = FileResponse(pdf.file, content_type="application/pdf")
+        else:
+            response = StreamingHttpResponse(_memory_chunks(pdf.data, 0, size - 1), content_type="application/pdf")
+            response["Content-Length"] = str(size)
+    else:
+        start, end = byte_range
+        chunks = (_file_chunks(pdf.file, start, end) if pdf.file is not None
+                  else _memory_chunks(pdf.data, start, end))
+        response = StreamingHttpResponse(chunks, status=206, content_type="application/pdf")
+        response["Content-Length"] = str(end - start + 1)
+        response["Content-Range"] = f"bytes {start}-{end}/{size}"
+
+    response["Accept-Ranges"] = "bytes"
+    response["ETag"] = etag
+    response["Content-Disposition"] = f'{disposition}; filename="{filename}"'
+    return response
@@ -6,8 +6,8 @@ from rest_framework import status
 import json
 from io import BytesIO
 
-from .models import LetterTemplate, LetterDraft
-from .utils import generate_pdf_from_template_structure
+from ..models import LetterTemplate, LetterDraft
+from ..render_plan import compile_structure
 
 
 class LetterTemplateModelTests(TestCase):
@@ -157,7 +157,7 @@ class LetterUtilsTests(TestCase):
         form_data = {"name": "John Doe"}
         
         # Generate PDF
-        buffer = generate_pdf_from_template_structure(pdf_structure, form_data)
+        buffer = compile_structure(pdf_structure).render(form_data)
         
         # Basic check - did we get a buffer with content?
         self.assertIsInstance(buffer, BytesIO)
@@ -176,7 +176,7 @@ class LetterUtilsTests(TestCase):
         form_data = {"some_other_field": "value"}
         
         # Should not raise an exception, missing field should be an empty string
-        buffer = generate_pdf_from_template_structure(pdf_structure, form_data)
+        buffer = compile_structure(pdf_structure).render(form_data)
         self.assertIsInstance(buffer, BytesIO)
     
     def test_generate_pdf_with_template_syntax(self):
@@ -189,7 +189,7 @@ class LetterUtilsTests(TestCase):
         form_data = {"name": "John", "id": "12345"}
         
         # Should format the text correctly
-        buffer = generate_pdf_from_template_structure(pdf_structure, form_data)
+        buffer = compile_structure(pdf_structure).render(form_data)
         self.assertIsInstance(buffer, BytesIO)
     
     def test_generate_pdf_with_invalid_structure(self):
@@ -199,7 +199,7 @@ class LetterUtilsTests(TestCase):
         form_data = {}
         
         with self.assertRaises(ValueError):
-            generate_pdf_from_template_structure(pdf_structure, form_data)
+            compile_structure(pdf_structure).render(form_data)
 
 
 class LetterAPITests(APITestCase):
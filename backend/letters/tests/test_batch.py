@@ -0,0 +1,122 @@
+import io
+import json
+import re
+import tempfile
+import zipfile
+from concurrent.futures import Future
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+from django.contrib.auth.models import User
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from .. import render_pool
+from ..models import LetterTemplate
+
+RECORDS = [
+    {"name": "Asha", "roll": "CS01"},
+    {"name": "Ravi", "roll": "CS02"},
+    {"name": "Meera", "roll": "CS03"},
+]
+
+
+def page_count(pdf):
+    return len(re.findall(rb"/Type /Page\b", pdf))
+
+
+@override_settings(LETTERS_RENDER_WORKERS=0)
+class BatchGenerationTest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_user("staff", password="p"))
+        self.template = LetterTemplate.objects.create(
+            name="Duty Leave", template_type="leave",
+            pdf_structure={"sections": [{"type": "paragraph", "template": "{name} ({roll}) requests duty leave."}]},
+            validation_schema={
+                "type": "object", "required": ["name", "roll"],
+                "properties": {"roll": {"type": "string", "pattern": "^CS[0-9]+$"}},
+            },
+        )
+        self.addCleanup(render_pool.shutdown)
+
+    def post(self, body, **kwargs):
+        return self.client.post(reverse("generate_letters_batch"), body, **kwargs)
+
+    def zip_entries(self, response):
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], "application/zip")
+        archive = zipfile.ZipFile(io.BytesIO(b"".join(response.streaming_content)))
+        return {name: archive.read(name) for name in archive.namelist()}
+
+    def test_json_records_to_zip(self):
+        response = self.post({"template_type": "leave", "records": RECORDS, "name_field": "roll"}, format="json")
+        entries = self.zip_entries(response)
+        self.assertEqual(list(entries), ["0001_CS01.pdf", "0002_CS02.pdf", "0003_CS03.pdf"])
+        self.assertTrue(all(pdf.startswith(b"%PDF") for pdf in entries.values()))
+
+    def test_csv_upload_to_zip(self):
+        csv = "name,roll\n" + "".join(f"{r['name']},{r['roll']}\n" for r in RECORDS)
+        upload = SimpleUploadedFile("class.csv", csv.encode(), content_type="text/csv")
+        entries = self.zip_entries(self.post({"template_type": "leave", "records": upload}, format="multipart"))
+        self.assertEqual(len(entries), 3)
+
+    def test_invalid_record_fails_the_batch_before_rendering(self):
+        lines = "\n".join(json.dumps(r) for r in RECORDS + [{"name": "X", "roll": "bad"}])
+        upload = SimpleUploadedFile("class.jsonl", lines.encode())
+        response = self.post({"template_type": "leave", "records": upload}, format="multipart")
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(len(response.data["details"]), 1)
+        self.assertTrue(response.data["details"][0].startswith("record 4:"))
+
+    def test_undecodable_or_malformed_uploads_are_rejected(self):
+        uploads = [
+            SimpleUploadedFile("class.jsonl", b'{"name": "\xff\xfe"}\n'),
+            SimpleUploadedFile("class.csv", b"name,roll\n" + b"x" * 200_000 + b",CS01\n", content_type="text/csv"),
+        ]
+        for upload in uploads:
+            response = self.post({"template_type": "leave", "records": upload}, format="multipart")
+            self.assertEqual(response.status_code, 400, upload.name)
+
+    def test_merged_pdf(self):
+        response = self.post({"template_type": "leave", "records": RECORDS, "format": "pdf"}, format="json")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(page_count(response.content), 3)
+
+    @override_settings(LETTERS_BATCH_MERGE_MAX=2)
+    def test_merged_pdf_is_capped(self):
+        response = self.post({"template_type": "leave", "records": RECORDS, "format": "pdf"}, format="json")
+        self.assertEqual(response.status_code, 400)
+
+    @override_settings(LETTERS_RENDER_WORKERS=1)
+    def test_unavailable_renders_are_listed_not_truncated(self):
+        done = Future()
+        done.set_result(b"%PDF-1.4 letter")
+        pool = MagicMock(worker_count=1)
+        pool.submit.side_effect = [done, render_pool.RenderBusy("busy"), Future()]
+        with patch.object(render_pool, "get_pool", return_value=pool), \
+                override_settings(LETTERS_RENDER_TIMEOUT=0.01):
+            entries = self.zip_entries(self.post({"template_type": "leave", "records": RECORDS}, format="json"))
+        self.assertEqual(list(entries), ["letter_0001.pdf", "ERRORS.txt"])
+        self.assertEqual(entries["ERRORS.txt"].decode().splitlines(),
+                         ["record 2: busy", "record 3: Letter generation timed out."])
+
+    @override_settings(LETTERS_RENDER_WORKERS=2)
+    def test_zip_rendered_on_the_pool(self):
+        render_pool.shutdown()
+        response = self.post({"template_type": "leave", "records": RECORDS * 3}, format="json")
+        self.assertEqual(len(self.zip_entries(response)), 9)
+
+    def test_command_writes_zip_and_pdf(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            source = Path(tmp) / "class.jsonl"
+            source.write_text("\n".join(json.dumps(r) for r in RECORDS))
+            call_command("generate_letters", "leave", str(source), output=str(Path(tmp) / "out.zip"),
+                         stdout=io.StringIO())
+            self.assertEqual(len(zipfile.ZipFile(Path(tmp) / "out.zip").namelist()), 3)
+            call_command("generate_letters", "leave", str(source), output=str(Path(tmp) / "out.pdf"),
+                         stdout=io.StringIO())
+            self.assertEqual(page_count((Path(tmp) / "out.pdf").read_bytes()), 3)
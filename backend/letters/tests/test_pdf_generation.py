@@ -1,10 +1,10 @@
 from django.test import SimpleTestCase
-from ..utils import generate_pdf_from_template_structure
+from ..render_plan import compile_structure
 import io
 
 
 class PDFGenerationTest(SimpleTestCase):
-    def test_generate_pdf_from_template_structure_basic(self):
+    def test_compiled_structure_renders_pdf(self):
         """Basic smoke test: generated buffer should start with PDF header"""
         structure = {
             "sections": [
@@ -14,11 +14,7 @@ class PDFGenerationTest(SimpleTestCase):
         }
         data = {"title": "Test Title", "body": "This is a test paragraph."}
 
-        result = generate_pdf_from_template_structure(structure, data)
-
-        # util returns dict on error
-        if isinstance(result, dict):
-            self.fail(f"PDF util returned error: {result}")
+        result = compile_structure(structure).render(data)
 
         # result should be a file-like buffer
         self.assertTrue(hasattr(result, "read"))
@@ -0,0 +1,45 @@
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from .. import registry
+from ..models import LetterTemplate
+
+
+class TemplateRegistryTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.template = LetterTemplate.objects.create(name="Leave", template_type="leave")
+
+    def test_lookups_do_not_load_templates(self):
+        self.assertEqual(registry.get_template("leave").pk, self.template.pk)
+        with CaptureQueriesContext(connection) as queries:
+            registry.get_template("leave")
+            self.assertIsNone(registry.find_template("missing"))
+            self.assertIn("leave", [t.template_type for t in registry.all_templates()])
+        # Only the shared version is read, never the templates table
+        self.assertFalse([q for q in queries.captured_queries if LetterTemplate._meta.db_table in q["sql"]])
+
+    def test_missing_template_raises_does_not_exist(self):
+        with self.assertRaises(LetterTemplate.DoesNotExist):
+            registry.get_template("missing")
+
+    def test_save_in_this_process_reloads(self):
+        registry.get_template("leave")
+        self.template.name = "Duty Leave"
+        self.template.save()
+        self.assertEqual(registry.get_template("leave").name, "Duty Leave")
+
+    def test_version_bump_from_another_worker_reloads(self):
+        registry.get_template("leave")
+        # Another worker saved the template: the row changed and the shared version moved on
+        LetterTemplate.objects.filter(pk=self.template.pk).update(name="Edited elsewhere")
+        self.assertEqual(registry.get_template("leave").name, "Leave")
+        registry.bump_templates_version()
+        self.assertEqual(registry.get_template("leave").name, "Edited elsewhere")
+
+    def test_delete_removes_the_template(self):
+        registry.get_template("leave")
+        self.template.delete()
+        self.assertIsNone(registry.find_template("leave"))
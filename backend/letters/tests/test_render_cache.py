@@ -0,0 +1,102 @@
+import os
+import tempfile
+from pathlib import Path
+from unittest.mock import patch
+
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from .. import render_cache
+from ..models import LetterTemplate
+
+
+class RenderCacheTest(TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        override = override_settings(LETTERS_RENDER_CACHE_DIR=Path(self.tmp.name))
+        override.enable()
+        self.addCleanup(override.disable)
+        render_cache.memory.clear()
+        self.template = LetterTemplate.objects.create(
+            name="Leave", template_type="leave",
+            pdf_structure={"sections": [
+                {"type": "title", "text": "Duty Leave"},
+                {"type": "paragraph", "template": "{student_name} of {department} requests leave."},
+                {"type": "paragraph", "field": "reason"},
+            ]},
+        )
+        self.data = {"student_name": "Asha", "department": "CSE", "reason": "Hackathon"}
+        renderer = patch.object(render_cache, "render_pdf", wraps=render_cache.render_pdf)
+        self.render = renderer.start()
+        self.addCleanup(renderer.stop)
+
+    def test_used_fields(self):
+        self.assertEqual(render_cache.used_fields(self.template.pdf_structure),
+                         {"student_name", "department", "reason"})
+
+    def test_repeat_render_is_served_from_memory(self):
+        first = render_cache.render_letter(self.template, self.data)
+        second = render_cache.render_letter(self.template, dict(self.data))
+        self.assertTrue(first.startswith(b"%PDF"))
+        self.assertEqual(first, second)
+        self.assertEqual(self.render.call_count, 1)
+
+    def test_unused_fields_do_not_change_the_key(self):
+        key = render_cache.render_key(self.template, self.data)
+        self.assertEqual(render_cache.render_key(self.template, {**self.data, "csrf": "x"}), key)
+        self.assertNotEqual(render_cache.render_key(self.template, {**self.data, "reason": "Fest"}), key)
+
+    def test_disk_tier_survives_memory_loss(self):
+        pdf = render_cache.render_letter(self.template, self.data)
+        render_cache.memory.clear()
+        self.assertEqual(render_cache.render_letter(self.template, self.data), pdf)
+        self.assertEqual(self.render.call_count, 1)
+
+    def test_saving_the_template_changes_the_key(self):
+        key = render_cache.render_key(self.template, self.data)
+        self.template.description = "Edited"
+        self.template.save()
+        self.assertEqual(LetterTemplate.objects.get(pk=self.template.pk).version, 2)
+        self.assertNotEqual(render_cache.render_key(self.template, self.data), key)
+
+    def test_concurrent_saves_get_distinct_versions(self):
+        # Two workers edit copies loaded at the same version
+        first = LetterTemplate.objects.get(pk=self.template.pk)
+        second = LetterTemplate.objects.get(pk=self.template.pk)
+        first.save()
+        second.save(update_fields=["description"])
+        self.assertEqual((first.version, second.version), (2, 3))
+        self.assertEqual(LetterTemplate.objects.get(pk=self.template.pk).version, 3)
+
+    def test_memory_tier_is_bounded(self):
+        lru = render_cache.MemoryLRU(limit=10)
+        lru.put("a", b"12345")
+        lru.put("b", b"12345")
+        lru.get("a")
+        lru.put("c", b"12345")
+        self.assertIsNone(lru.get("b"))
+        self.assertEqual(lru.get("a"), b"12345")
+        self.assertEqual(lru.size, 10)
+
+    def test_evict_drops_least_recently_used(self):
+        for key in ("aa" + "0" * 62, "bb" + "0" * 62):
+            render_cache.write_disk(key, b"x" * 100)
+        render_cache.read_disk("bb" + "0" * 62)
+        old = Path(self.tmp.name) / "aa" / ("aa" + "0" * 62 + ".pdf")
+        os.utime(old, (0, 0))
+        self.assertEqual(render_cache.evict(limit=150), 1)
+        self.assertFalse(old.exists())
+        self.assertIsNotNone(render_cache.read_disk("bb" + "0" * 62))
+
+    def test_generate_endpoint_uses_the_cache(self):
+        client = APIClient()
+        client.force_authenticate(User.objects.create_user("u", password="p"))
+        body = {"template_type": "leave", "data": self.data}
+        for _ in range(2):
+            response = client.post(reverse("generate_pdf"), body, format="json", HTTP_ACCEPT="application/pdf")
+            self.assertEqual(response.status_code, 200)
+            self.assertTrue(b"".join(response.streaming_content).startswith(b"%PDF"))
+        self.assertEqual(self.render.call_count, 1)
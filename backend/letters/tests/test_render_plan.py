@@ -0,0 +1,54 @@
+from django.test import SimpleTestCase, TestCase
+from reportlab import rl_config
+
+from ..management.commands.bench_letter_render import interpret_structure
+from ..models import LetterTemplate
+from ..render_plan import compile_structure, plan_for
+
+STRUCTURE = {
+    "sections": [
+        {"type": "title", "text": "Duty Leave"},
+        {"type": "heading", "template": "Dear {recipient},"},
+        {"type": "paragraph", "template": "I, {name} ({roll}), request leave for {days:>3} days. {missing}"},
+        {"type": "paragraph", "template": "Broken {name"},
+        {"type": "paragraph", "field": "reason"},
+        {"type": "spacer", "height": "oops"},
+        {"type": "table", "field": "rows", "columns": ["date", "hours"]},
+        {"type": "unknown"},
+    ]
+}
+DATA = {"recipient": "HOD", "name": "Asha", "roll": 42, "days": 2, "reason": "Hackathon",
+        "rows": [{"date": "1 Nov", "hours": 6}, {"date": "2 Nov"}]}
+
+
+class RenderPlanTest(SimpleTestCase):
+    def setUp(self):
+        invariant, rl_config.invariant = rl_config.invariant, 1
+        self.addCleanup(setattr, rl_config, "invariant", invariant)
+
+    def test_plan_output_matches_the_interpreter(self):
+        plan = compile_structure(STRUCTURE)
+        self.assertEqual(plan.render(DATA).getvalue(), interpret_structure(STRUCTURE, DATA).getvalue())
+
+    def test_plan_is_reusable_across_data(self):
+        plan = compile_structure(STRUCTURE)
+        other = {**DATA, "name": "Ravi", "rows": "not a list"}
+        plan.render(DATA)
+        self.assertEqual(plan.render(other).getvalue(), interpret_structure(STRUCTURE, other).getvalue())
+
+    def test_missing_form_data_renders_like_empty_data(self):
+        plan = compile_structure(STRUCTURE)
+        self.assertEqual(plan.render(None).getvalue(), plan.render({}).getvalue())
+
+    def test_invalid_structure(self):
+        with self.assertRaises(ValueError):
+            compile_structure(["not", "a", "dict"])
+
+
+class PlanCacheTest(TestCase):
+    def test_plan_is_compiled_once_per_version(self):
+        template = LetterTemplate.objects.create(name="Leave", template_type="leave", pdf_structure=STRUCTURE)
+        plan = plan_for(template)
+        self.assertIs(plan_for(LetterTemplate.objects.get(pk=template.pk)), plan)
+        template.save()
+        self.assertIsNot(plan_for(template), plan)
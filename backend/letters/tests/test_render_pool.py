@@ -0,0 +1,95 @@
+from concurrent.futures import Future
+from concurrent.futures.process import BrokenProcessPool
+from unittest.mock import MagicMock, patch
+
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from .. import render_pool
+from ..models import LetterTemplate
+
+
+class RenderPoolTest(TestCase):
+    def setUp(self):
+        self.template = LetterTemplate.objects.create(
+            name="Leave", template_type="leave",
+            pdf_structure={"sections": [{"type": "paragraph", "template": "{name} requests leave."}]},
+        )
+        self.addCleanup(render_pool.shutdown)
+
+    @override_settings(LETTERS_RENDER_WORKERS=0)
+    def test_inline_rendering(self):
+        self.assertTrue(render_pool.render_pdf(self.template, {"name": "Asha"}).startswith(b"%PDF"))
+
+    @override_settings(LETTERS_RENDER_WORKERS=1)
+    def test_renders_in_a_worker_process(self):
+        render_pool.shutdown()
+        render_pool.get_pool().warm()
+        pdf = render_pool.render_pdf(self.template, {"name": "Asha"})
+        self.assertTrue(pdf.startswith(b"%PDF"))
+
+    @override_settings(LETTERS_RENDER_WORKERS=1)
+    def test_invalid_structure_is_rejected_before_queueing(self):
+        self.template.pdf_structure = ["not", "a", "dict"]
+        with self.assertRaises(ValueError):
+            render_pool.render_pdf(self.template, {})
+
+    def test_full_queue_raises_busy_until_a_slot_frees(self):
+        pool = render_pool.RenderPool(worker_count=1, max_queue=1)
+        pending = [Future(), Future()]
+        executor = MagicMock()
+        executor.submit.side_effect = pending + [Future()]
+        with patch.object(pool, "_get_executor", return_value=executor):
+            pool.submit(("k", 1), {}, {})
+            pool.submit(("k", 1), {}, {})
+            with self.assertRaises(render_pool.RenderBusy):
+                pool.submit(("k", 1), {}, {})
+            pending[0].set_result(b"%PDF")
+            pool.submit(("k", 1), {}, {})
+
+    @override_settings(LETTERS_RENDER_WORKERS=1, LETTERS_RENDER_TIMEOUT=0.01, LETTERS_RENDER_RETRY_AFTER=7)
+    def test_slow_render_times_out(self):
+        pool = MagicMock()
+        pool.submit.return_value = Future()
+        with patch.object(render_pool, "get_pool", return_value=pool):
+            with self.assertRaises(render_pool.RenderTimeout) as raised:
+                render_pool.render_pdf(self.template, {"name": "Asha"})
+        self.assertEqual(raised.exception.retry_after, 7)
+
+    def test_broken_pool_is_reset_once(self):
+        pool = render_pool.RenderPool(worker_count=1, max_queue=4)
+        broken, fresh = MagicMock(), MagicMock()
+        pool._executor = broken
+        futures = []
+        for _ in range(2):
+            future = Future()
+            future.executor = broken
+            future.set_exception(BrokenProcessPool("worker died"))
+            futures.append(future)
+        with patch.object(render_pool, "get_pool", return_value=pool):
+            with self.assertRaises(render_pool.RenderUnavailable):
+                render_pool.wait_for(futures[0], self.template)
+            # Another request has started a fresh pool meanwhile
+            pool._executor = fresh
+            with self.assertRaises(render_pool.RenderUnavailable):
+                render_pool.wait_for(futures[1], self.template)
+        broken.shutdown.assert_called_once()
+        fresh.shutdown.assert_not_called()
+        self.assertIs(pool._executor, fresh)
+
+    def test_cancelled_render_is_unavailable(self):
+        future = Future()
+        future.cancel()
+        with self.assertRaises(render_pool.RenderUnavailable):
+            render_pool.wait_for(future, self.template)
+
+    def test_view_answers_503_with_retry_after(self):
+        client = APIClient()
+        client.force_authenticate(User.objects.create_user("u", password="p"))
+        with patch("letters.views.letter_pdf", side_effect=render_pool.RenderBusy("busy", retry_after=3)):
+            response = client.post(reverse("generate_pdf"), {"template_type": "leave", "data": {"name": "A"}},
+                                    format="json", HTTP_ACCEPT="application/pdf")
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response["Retry-After"], "3")
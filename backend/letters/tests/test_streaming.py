@@ -0,0 +1,108 @@
+import tempfile
+from pathlib import Path
+
+from django.contrib.auth.models import User
+from django.http import FileResponse
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from .. import render_cache
+from ..models import LetterTemplate
+from ..streaming import RangeNotSatisfiable, parse_range
+
+
+class ParseRangeTest(SimpleTestCase):
+    def test_ranges(self):
+        self.assertEqual(parse_range("bytes=0-99", 1000), (0, 99))
+        self.assertEqual(parse_range("bytes=900-", 1000), (900, 999))
+        self.assertEqual(parse_range("bytes=-100", 1000), (900, 999))
+        self.assertEqual(parse_range("bytes=990-2000", 1000), (990, 999))
+
+    def test_whole_body(self):
+        for header in (None, "", "bytes=-", "bytes=0-1,5-6", "items=0-1"):
+            self.assertIsNone(parse_range(header, 1000))
+
+    def test_unsatisfiable(self):
+        for header in ("bytes=1000-", "bytes=5-2", "bytes=-0"):
+            with self.assertRaises(RangeNotSatisfiable):
+                parse_range(header, 1000)
+
+
+@override_settings(LETTERS_RENDER_WORKERS=0)
+class PDFStreamingTest(TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        override = override_settings(LETTERS_RENDER_CACHE_DIR=Path(tmp.name))
+        override.enable()
+        self.addCleanup(override.disable)
+        render_cache.memory.clear()
+        self.template = LetterTemplate.objects.create(
+            name="Leave", template_type="leave",
+            pdf_structure={"sections": [{"type": "paragraph", "field": "name"}]},
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_user("u", password="p"))
+        self.body = {"template_type": "leave", "data": {"name": "Asha"}}
+        self.pdf = render_cache.render_letter(self.template, self.body["data"])
+
+    def post(self, **headers):
+        return self.client.post(reverse("generate_pdf"), self.body, format="json",
+                                HTTP_ACCEPT="application/pdf", headers=headers)
+
+    def test_full_response_from_memory(self):
+        response = self.post()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Accept-Ranges"], "bytes")
+        self.assertEqual(int(response["Content-Length"]), len(self.pdf))
+        self.assertEqual(b"".join(response.streaming_content), self.pdf)
+
+    def test_range_from_memory(self):
+        response = self.post(Range="bytes=0-3")
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response["Content-Range"], f"bytes 0-3/{len(self.pdf)}")
+        self.assertEqual(b"".join(response.streaming_content), b"%PDF")
+
+    def test_disk_hit_is_streamed_from_the_file(self):
+        render_cache.memory.clear()
+        response = self.post()
+        self.assertIsInstance(response, FileResponse)
+        self.assertEqual(b"".join(response.streaming_content), self.pdf)
+        response.close()
+
+        render_cache.memory.clear()
+        response = self.post(Range="bytes=-5")
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(b"".join(response.streaming_content), self.pdf[-5:])
+
+    def test_if_range_mismatch_sends_everything(self):
+        response = self.post(Range="bytes=0-3", **{"If-Range": '"stale"'})
+        self.assertEqual(response.status_code, 200)
+        etag = response["ETag"]
+        response = self.post(Range="bytes=0-3", **{"If-Range": etag})
+        self.assertEqual(response.status_code, 206)
+
+    def test_unsatisfiable_range(self):
+        response = self.post(Range=f"bytes={len(self.pdf)}-")
+        self.assertEqual(response.status_code, 416)
+        self.assertEqual(response["Content-Range"], f"bytes */{len(self.pdf)}")
+
+    def test_download_url_serves_ranges_over_get(self):
+        location = self.post()["Content-Location"]
+        self.assertTrue(location.startswith(reverse("download_letter", args=[render_cache.render_key(
+            self.template, self.body["data"])])))
+        client = APIClient()
+        response = client.get(location, headers={"Range": "bytes=4-"})
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(b"".join(response.streaming_content), self.pdf[4:])
+        self.assertIn('attachment; filename="Leave_letter.pdf"', response["Content-Disposition"])
+
+        render_cache.memory.clear()
+        response = client.get(location)
+        self.assertEqual(b"".join(response.streaming_content), self.pdf)
+        response.close()
+
+    def test_download_of_unknown_key_is_404(self):
+        response = APIClient().get(reverse("download_letter", args=["0" * 64]))
+        self.assertEqual(response.status_code, 404)
@@ -0,0 +1,61 @@
+from django.test import TestCase
+
+from .. import validation
+from ..models import LetterTemplate
+
+SCHEMA = {
+    "type": "object",
+    "required": ["student_name", "student_id"],
+    "properties": {
+        "student_name": {"type": "string", "minLength": 3},
+        "student_id": {"type": "string", "pattern": "^[A-Z0-9]+$"},
+    },
+}
+
+
+class ValidatorCacheTest(TestCase):
+    def setUp(self):
+        self.template = LetterTemplate.objects.create(name="Leave", template_type="leave", validation_schema=SCHEMA)
+
+    def test_validator_is_compiled_once(self):
+        validator = validation.validator_for_template(self.template)
+        self.assertEqual(self.template.validate_data({"student_name": "Asha", "student_id": "A1"}), (True, None))
+        self.assertIs(validation.validator_for_template(LetterTemplate.objects.get(pk=self.template.pk)), validator)
+
+    def test_saving_the_template_recompiles(self):
+        self.assertTrue(self.template.validate_data({"student_name": "Asha", "student_id": "A1"})[0])
+        self.template.validation_schema = {**SCHEMA, "required": ["student_name", "student_id", "reason"]}
+        self.template.save()
+        is_valid, error = self.template.validate_data({"student_name": "Asha", "student_id": "A1"})
+        self.assertFalse(is_valid)
+        self.assertIn("reason", error)
+
+    def test_stale_instance_sees_the_edit(self):
+        stale = LetterTemplate.objects.get(pk=self.template.pk)
+        stale.validate_data({})
+        fresh = LetterTemplate.objects.get(pk=self.template.pk)
+        fresh.validation_schema = {"type": "object"}
+        fresh.save()
+        # The stale row still carries its own (older) schema and version
+        self.assertFalse(stale.validate_data({})[0])
+        self.assertTrue(LetterTemplate.objects.get(pk=self.template.pk).validate_data({})[0])
+
+    def test_single_error_mode_reports_the_best_match(self):
+        is_valid, error = self.template.validate_data({"student_name": "Jo", "student_id": "bad-id"})
+        self.assertFalse(is_valid)
+        self.assertEqual(error.count("Validation Error"), 1)
+
+    def test_all_errors_mode_collects_every_error(self):
+        is_valid, error = self.template.validate_data({"student_name": "Jo", "student_id": "bad-id"}, all_errors=True)
+        self.assertFalse(is_valid)
+        self.assertEqual(error.split("; "), [
+            "Validation Error for field 'student_id': 'bad-id' does not match '^[A-Z0-9]+$'",
+            "Validation Error for field 'student_name': 'Jo' is too short",
+        ])
+
+    def test_invalid_schema_is_reported(self):
+        self.template.validation_schema = {"type": "not-a-type"}
+        self.template.save()
+        is_valid, error = self.template.validate_data({})
+        self.assertFalse(is_valid)
+        self.assertIn("unexpected validation error", error)
@@ -1,10 +1,13 @@
-from django.urls import path
+from django.urls import path, re_path
 from . import views
 
 urlpatterns = [
     path('templates/', views.get_templates, name='get_templates'),
     # route 'generate/' to the DRF-backed PDF endpoint which supports application/pdf
     path('generate/', views.generate_pdf, name='generate_pdf'),
+    path('generate/batch/', views.generate_letters_batch, name='generate_letters_batch'),
+    # GET a rendered PDF by its render cache key; supports Range for resumed downloads
+    re_path(r'^generate/(?P<key>[0-9a-f]{64})/$', views.download_letter, name='download_letter'),
     path('drafts/', views.list_letter_drafts, name='list_letter_drafts'),
     path('drafts/save/', views.save_letter_draft, name='save_letter_draft'),
     path('drafts/<int:draft_id>/', views.manage_letter_draft, name='manage_letter_draft'),
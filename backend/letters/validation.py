@@ -0,0 +1,62 @@
+"""Compiled JSON Schema validators for LetterTemplate.validation_schema.
+
+``jsonschema.validate`` checks the schema and builds a new validator on
+every call. Here each template's schema is checked and compiled once per
+template version and the validator is reused for every submission. Entries
+are dropped when their template is saved or deleted (see signals.py), and
+the version check covers template rows loaded before an edit.
+"""
+import threading
+
+from jsonschema import exceptions, validators
+
+_validators = {}
+_lock = threading.Lock()
+
+
+def validator_for_template(template):
+    """Return the compiled validator for ``template``, or the SchemaError its schema raised."""
+    with _lock:
+        entry = _validators.get(template.pk)
+    if entry is not None and entry[0] == template.version:
+        return entry[1]
+
+    schema = template.validation_schema
+    cls = validators.validator_for(schema)
+    try:
+        cls.check_schema(schema)
+        validator = cls(schema)
+    except exceptions.SchemaError as e:
+        validator = e
+    if template.pk is not None:
+        with _lock:
+            _validators[template.pk] = (template.version, validator)
+    return validator
+
+
+def invalidate(template_pk):
+    with _lock:
+        _validators.pop(template_pk, None)
+
+
+def error_message(error):
+    """A user-friendly message naming the failing field, if any."""
+    field_path = " -> ".join(map(str, error.path))
+    return f"Validation Error for field '{field_path}': {error.message}" if error.path else f"Validation Error: {error.message}"
+
+
+def validation_errors(template, data, all_errors=False):
+    """Return the error messages for ``data``; empty when it is valid.
+
+    By default only the most relevant error is reported, as jsonschema.validate
+    would raise it. With ``all_errors`` every error is collected in one pass
+    over the data, ordered by field path.
+    """
+    validator = validator_for_template(template)
+    if isinstance(validator, exceptions.SchemaError):
+        return [f"An unexpected validation error occurred: {validator}"]
+    if all_errors:
+        errors = sorted(validator.iter_errors(data), key=lambda e: [str(p) for p in e.absolute_path])
+        return [error_message(error) for error in errors]
+    error = exceptions.best_match(validator.iter_errors(data))
+    return [] if error is None else [error_message(error)]
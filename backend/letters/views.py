@@ -1,5 +1,6 @@
-from django.http import JsonResponse, HttpResponse
+from django.http import JsonResponse, HttpResponse, StreamingHttpResponse
 from django.shortcuts import get_object_or_404
+from django.urls import reverse
 from rest_framework.decorators import api_view, permission_classes, renderer_classes
 from rest_framework.permissions import IsAuthenticated, AllowAny
 from rest_framework.response import Response
@@ -8,7 +9,11 @@ from rest_framework.renderers import JSONRenderer
 from .renderers import PDFRenderer
 import logging
 import json
-from .utils import generate_pdf_from_template, generate_pdf_from_template_structure
+from .registry import all_templates, find_template, get_template
+from .render_cache import cached_pdf, letter_pdf
+from .streaming import pdf_response
+from .render_pool import RenderUnavailable
+from . import batch
 from django.contrib.auth.decorators import login_required
 from .models import LetterDraft, LetterTemplate
 from .serializers import LetterTemplateSerializer, LetterDraftSerializer
@@ -16,12 +21,6 @@ import io
 from django.conf import settings
 from django.templatetags.static import static
 import os
-from reportlab.pdfgen import canvas
-from reportlab.lib.pagesizes import letter
-from reportlab.lib import colors
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.units import inch
 
 logger = logging.getLogger(__name__)
 
@@ -33,7 +32,7 @@ def get_templates(request):
     Returns structure needed for the frontend form rendering.
     """
     try:
-        templates = LetterTemplate.objects.all().order_by('name')
+        templates = all_templates()
         serializer = LetterTemplateSerializer(templates, many=True)
         return Response(serializer.data)
     except Exception as e:
@@ -54,21 +53,24 @@ def generate_letter(request):
         return Response({'error': 'Missing template_type or data'}, status=status.HTTP_400_BAD_REQUEST)
 
     try:
-        template = LetterTemplate.objects.get(template_type=template_type)
+        template = get_template(template_type)
         is_valid, error_message = template.validate_data(form_data)
         if not is_valid:
             logger.warning(f"Validation failed for template '{template_type}': {error_message}")
             return Response({'error': f'Invalid form data: {error_message}'}, status=status.HTTP_400_BAD_REQUEST)
 
-        pdf_buffer = generate_pdf_from_template_structure(template.pdf_structure, form_data)
-        response = HttpResponse(pdf_buffer.getvalue(), content_type='application/pdf')
+        pdf = letter_pdf(template, form_data)
+        if isinstance(pdf, dict):
+            raise ValueError(pdf.get('error'))
         safe_filename = "".join(c if c.isalnum() else "_" for c in template.name)
-        response['Content-Disposition'] = f'inline; filename="{safe_filename}_letter.pdf"'
-        return response
+        # Streamed from the cached bytes or file; resumable through the download URL
+        return _letter_response(request, pdf, f"{safe_filename}_letter.pdf")
 
     except LetterTemplate.DoesNotExist:
         logger.warning(f"Attempt to generate letter with non-existent template type: {template_type}")
         return Response({'error': f'Template "{template_type}" not found.'}, status=status.HTTP_404_NOT_FOUND)
+    except RenderUnavailable as e:
+        return _render_unavailable(e)
     except ValueError as ve:
         logger.error(f"PDF generation failed for template '{template_type}': {ve}", exc_info=True)
         return Response({'error': f'PDF generation failed: {ve}'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
@@ -84,7 +86,7 @@ def save_letter_draft(request):
     if serializer.is_valid():
         try:
             template_type = serializer.validated_data.get('letter_type')
-            template = LetterTemplate.objects.filter(template_type=template_type).first()
+            template = find_template(template_type)
             draft = serializer.save(user=request.user, template=template)
             return Response(LetterDraftSerializer(draft).data, status=status.HTTP_201_CREATED)
         except Exception as e:
@@ -123,7 +125,7 @@ def manage_letter_draft(request, draft_id):
             serializer = LetterDraftSerializer(draft, data=request.data, partial=True, context={'request': request})
             if serializer.is_valid():
                 template_type = serializer.validated_data.get('letter_type', draft.letter_type)
-                template = LetterTemplate.objects.filter(template_type=template_type).first()
+                template = find_template(template_type)
                 serializer.save(template=template)
                 return Response(serializer.data)
             else:
@@ -152,21 +154,115 @@ def generate_pdf(request):
         return Response({'error': 'Missing template_type or form data.'}, status=status.HTTP_400_BAD_REQUEST)
 
     try:
-        template = LetterTemplate.objects.get(template_type=template_type)
+        template = get_template(template_type)
     except LetterTemplate.DoesNotExist:
         return Response({'error': f'Template "{template_type}" not found.'}, status=status.HTTP_404_NOT_FOUND)
 
-    pdf_buffer = generate_pdf_from_template_structure(template.pdf_structure, form_data)
-    if isinstance(pdf_buffer, dict):
+    # Repeat downloads of the same filled form are served from the render cache
+    try:
+        pdf = letter_pdf(template, form_data)
+    except RenderUnavailable as e:
+        return _render_unavailable(e)
+    if isinstance(pdf, dict):
         # util returns an error dict
-        return Response(pdf_buffer, status=pdf_buffer.get('status', 500))
+        return Response(pdf, status=pdf.get('status', 500))
+
+    # Streamed from the cached bytes or file instead of through PDFRenderer
+    safe_filename = "".join(c if c.isalnum() else "_" for c in template.name)
+    return _letter_response(request, pdf, f"{safe_filename}_letter.pdf")
+
+
+@api_view(['GET'])
+@permission_classes([AllowAny])
+def download_letter(request, key):
+    """
+    Download a letter rendered by generate_pdf or generate_letter, by the key in
+    their Content-Location header. Honours Range and If-Range so interrupted
+    downloads can resume; 404 once the PDF has been evicted from the render cache.
+    """
+    pdf = cached_pdf(key)
+    if pdf is None:
+        return Response({'error': 'Letter not found; generate it again.'}, status=status.HTTP_404_NOT_FOUND)
+    filename = request.query_params.get('filename') or "letter.pdf"
+    safe_filename = "".join(c if c.isalnum() or c in "._" else "_" for c in filename)
+    return pdf_response(request, pdf, safe_filename, disposition="attachment")
+
+
+def _letter_response(request, pdf, filename):
+    response = pdf_response(request, pdf, filename)
+    response['Content-Location'] = f"{reverse('download_letter', args=[pdf.key])}?filename={filename}"
+    return response
+
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def generate_letters_batch(request):
+    """
+    Generate one template for many data records.
+    Takes template_type, format ("zip", default, or "pdf"), an optional name_field
+    for ZIP entry names, and the records either as a JSON list under 'records' or
+    as an uploaded 'records' file in JSON Lines or CSV. Every record is validated
+    before any letter is rendered.
+    """
+    template_type = request.data.get('template_type')
+    output = request.data.get('format') or 'zip'
+    name_field = request.data.get('name_field') or None
+    if not template_type:
+        return Response({'error': 'Missing template_type.'}, status=status.HTTP_400_BAD_REQUEST)
+    if output not in batch.FORMATS:
+        return Response({'error': f"format must be one of: {', '.join(batch.FORMATS)}"}, status=status.HTTP_400_BAD_REQUEST)
+
+    upload = request.FILES.get('records')
+    if upload is not None:
+        fmt = batch.record_format(upload.name, upload.content_type)
+
+        def records():
+            # Large uploads are spooled to disk by Django; each pass streams them again
+            upload.seek(0)
+            return batch.iter_records(upload, fmt)
+    else:
+        data = request.data.get('records')
+        if not isinstance(data, list) or not all(isinstance(r, dict) for r in data):
+            return Response({'error': 'records must be a list of objects or an uploaded file.'},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        def records():
+            return iter(data)
 
-    # Return raw bytes — PDFRenderer will handle streaming
     try:
-        pdf_buffer.seek(0)
-    except Exception:
-        pass
+        template = get_template(template_type)
+    except LetterTemplate.DoesNotExist:
+        return Response({'error': f'Template "{template_type}" not found.'}, status=status.HTTP_404_NOT_FOUND)
+
+    try:
+        count, errors = batch.validate_records(template, records())
+    except batch.BatchError as e:
+        return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    if errors:
+        return Response({'error': 'Invalid records.', 'details': errors}, status=status.HTTP_400_BAD_REQUEST)
+    if not count:
+        return Response({'error': 'No records given.'}, status=status.HTTP_400_BAD_REQUEST)
 
-    return Response(pdf_buffer, content_type='application/pdf')
+    safe_filename = "".join(c if c.isalnum() else "_" for c in template.name)
+    if output == 'zip':
+        response = StreamingHttpResponse(batch.zip_stream(template, records(), name_field),
+                                         content_type='application/zip')
+        response['Content-Disposition'] = f'attachment; filename="{safe_filename}_letters.zip"'
+        return response
+
+    try:
+        pdf = batch.merged_pdf(template, records())
+    except RenderUnavailable as e:
+        return _render_unavailable(e)
+    except batch.BatchError as e:
+        return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    response = HttpResponse(pdf, content_type='application/pdf')
+    response['Content-Disposition'] = f'attachment; filename="{safe_filename}_letters.pdf"'
+    return response
 
 
+def _render_unavailable(error):
+    """503 telling the client when to retry, while the render pool is saturated."""
+    logger.warning(f"Letter render rejected: {error}")
+    return Response({'error': str(error)}, status=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    headers={'Retry-After': str(error.retry_after)})
@@ -1,7 +1,10 @@
-import React, { useState } from "react";
+import React, { useEffect, useState } from "react";
 import axios from "axios";
 import LoadingScreen from "../components/LoadingScreen";
 
+// How often to reload the list when the server cannot stream changes
+const POLL_INTERVAL_MS = 60000;
+
 const EventsPage = () => {
   const [events, setEvents] = useState([]);
   const [loading, setLoading] = useState(false); // Changed to false initially
@@ -20,30 +23,31 @@ const EventsPage = () => {
       // Clear any previous success messages
       setSuccessMessage("");
 
-      // Use the scraper endpoint if requested, otherwise use the regular events endpoint
-      const endpoint = useScraper
-        ? "http://localhost:8000/api/events/scrape/"
-        : "http://localhost:8000/api/events/events/";
-
-      const response = await axios.get(endpoint);
-
-      // Handle different response formats from the two endpoints
-      let eventsData;
-      if (useScraper && response.data.events) {
-        eventsData = response.data.events;
-
-
-        // Mark that we've scraped events
-        setHasScraped(true);
-      } else {
-        eventsData = response.data.results || response.data;
-
-        // If we're loading from regular endpoint, still mark as scraped
-        if (!useScraper) {
-          setHasScraped(true);
+      // The scraper endpoint only enqueues a job; poll it until the scrape
+      // finishes, then load the stored events from the regular endpoint.
+      if (useScraper) {
+        const { data: job } = await axios.get(
+          "http://localhost:8000/api/events/scrape/"
+        );
+        let status = job;
+        while (status.status === "queued" || status.status === "running") {
+          await new Promise((resolve) => setTimeout(resolve, 2000));
+          status = (await axios.get(job.status_url)).data;
+        }
+        if (status.status === "failed") {
+          throw new Error(status.error || "Scrape job failed");
+        }
+        if (status.result && status.result.message) {
+          setSuccessMessage(status.result.message);
         }
       }
 
+      const response = await axios.get(
+        "http://localhost:8000/api/events/api/events/"
+      );
+      const eventsData = response.data.results;
+      setHasScraped(true);
+
       // Filter events to only include those with registration_end dates in or after 2024
       const currentDate = new Date();
       const filteredEvents = eventsData.filter((event) => {
@@ -72,6 +76,36 @@ const EventsPage = () => {
     }
   };
 
+  // Once events are on screen, let the server push new and changed ones
+  // instead of polling the list again.
+  useEffect(() => {
+    if (!hasScraped) return undefined;
+    const stream = new EventSource("http://localhost:8000/api/events/stream/");
+    const upsert = (newlyCreated) => (message) => {
+      const event = JSON.parse(message.data);
+      setEvents((current) => [
+        { ...event, newly_created: newlyCreated },
+        ...current.filter((existing) => existing.id !== event.id),
+      ]);
+    };
+    stream.addEventListener("created", upsert(true));
+    stream.addEventListener("updated", upsert(false));
+    // Fell too far behind the stream: reload the list
+    stream.addEventListener("resync", () => fetchEvents(false));
+    // The server answers 204 when it is not running under ASGI; EventSource
+    // then gives up for good, so poll the list instead
+    let poller;
+    stream.onerror = () => {
+      if (stream.readyState === EventSource.CLOSED && !poller) {
+        poller = setInterval(() => fetchEvents(false), POLL_INTERVAL_MS);
+      }
+    };
+    return () => {
+      stream.close();
+      clearInterval(poller);
+    };
+  }, [hasScraped]);
+
   return (
     <div className="flex-grow p-8 bg-gray-100">
       <div className="max-w-6xl mx-auto">